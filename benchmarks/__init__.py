@@ -0,0 +1,7 @@
+"""
+Pakiet benchmarks
+-----------------
+Pomiary wydajności głównych ścieżek obliczeniowych CVision na syntetycznych
+woltamogramach. Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.run_benchmarks --output wyniki.json
+"""
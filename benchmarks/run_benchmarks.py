@@ -0,0 +1,275 @@
+"""
+Moduł benchmarks/run_benchmarks.py
+----------------------------------
+Mierzy czas głównych ścieżek obliczeniowych na syntetycznych woltamogramach
+o rozmiarach od 10^3 do 10^7 punktów i zapisuje wyniki w formacie JSON,
+który można porównać z wynikami innej wersji programu.
+
+Mierzone ścieżki:
+    load           - wczytanie pliku tekstowego (np.loadtxt + sortowanie, cvcore.load_cv)
+    savgol         - wygładzanie obu gałęzi filtrem Savitzky'ego-Golaya (pojedyncze wywołania savgol_filter)
+    savgol_parallel - to samo fragmentami w puli wątków (smooth_many) dla każdej liczby wątków
+                     z --workers; wynik zawiera przyspieszenie względem savgol
+    gradient       - pierwsze i drugie pochodne obu gałęzi (np.gradient)
+    zero_crossings - miejsca zerowe pierwszej pochodnej (compute_zero_crossings)
+    intersections  - punkty przecięcia gałęzi (compute_intersections)
+    peaks          - parametry pików i E1/2 (compute_peak_parameters)
+    excel_export   - zapis skoroszytu Excela (export_workbook - ścieżka eksportu okna głównego)
+
+Przykłady:
+    python -m benchmarks.run_benchmarks --output przed.json
+    python -m benchmarks.run_benchmarks --output po.json --compare przed.json
+    python -m benchmarks.run_benchmarks --sizes 1000 10000000 --only savgol gradient
+    python -m benchmarks.run_benchmarks --sizes 100000000 --only savgol savgol_parallel --workers 1 2 4 8
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_cv, write_cv_file
+
+DEFAULT_SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+# Domyślne limity rozmiaru najwolniejszych ścieżek (znoszone opcją --full)
+SIZE_LIMITS = {'load': 10 ** 6, 'excel_export': 10 ** 5}
+# Łączny czas powtórzeń, po którego przekroczeniu pomiar kończy się wcześniej [s]
+TIME_BUDGET_S = 1.0
+
+
+def bench_context(n_points: int, workdir: str, args) -> dict:
+    """Przygotowuje dane wejściowe pomiarów danego rozmiaru (poza mierzonym czasem)."""
+    from cvcore import default_baseline_settings, first_derivative, smooth
+    x, y1, y2 = synthetic_cv(n_points, noise=args.noise, n_peaks=args.peaks, n_cycles=args.cycles)
+    order = np.argsort(x, kind='stable')
+    x, y1, y2 = x[order], y1[order], y2[order]
+    s1 = smooth(y1, args.window, args.polyorder)
+    s2 = smooth(y2, args.window, args.polyorder)
+    return {
+        'x': x, 'y1': y1, 'y2': y2, 's1': s1, 's2': s2,
+        'd1': first_derivative(x, s1),
+        'baseline_settings': default_baseline_settings(x, s1, s2),
+        'file': os.path.join(workdir, f"cv_{n_points}.txt"),
+        'xlsx': os.path.join(workdir, f"cv_{n_points}.xlsx"),
+    }
+
+
+def bench_load(ctx, args):
+    from cvcore import load_cv
+    load_cv(ctx['file'])
+
+
+def bench_savgol(ctx, args):
+    from scipy.signal import savgol_filter
+    from cvcore import effective_window
+    window = effective_window(args.window, len(ctx['y1']))
+    savgol_filter(ctx['y1'], window, args.polyorder)
+    savgol_filter(ctx['y2'], window, args.polyorder)
+
+
+def bench_savgol_parallel(ctx, args):
+    from cvcore import smooth_many
+    smooth_many([ctx['y1'], ctx['y2']], args.window, args.polyorder, executor=ctx['executor'])
+
+
+def bench_gradient(ctx, args):
+    from cvcore import first_derivative, second_derivative
+    for y in (ctx['s1'], ctx['s2']):
+        second_derivative(ctx['x'], y, first_derivative(ctx['x'], y))
+
+
+def bench_zero_crossings(ctx, args):
+    from utils import compute_zero_crossings
+    compute_zero_crossings(ctx['x'], ctx['d1'], ctx['x'][0], ctx['x'][-1])
+
+
+def bench_intersections(ctx, args):
+    from utils import compute_intersections
+    compute_intersections(ctx['x'], ctx['s1'], ctx['s2'], ctx['x'][0], ctx['x'][-1])
+
+
+def bench_peaks(ctx, args):
+    from cvcore import compute_peak_parameters
+    compute_peak_parameters(ctx['x'], ctx['s1'], ctx['s2'], ctx['baseline_settings'])
+
+
+def bench_excel_export(ctx, args):
+    from excel_export import export_workbook
+    columns = {"x": ctx['x'], "y_ox": ctx['y1'], "y_red": ctx['y2'],
+               "smoothed_y_ox": ctx['s1'], "smoothed_y_red": ctx['s2'], "deriv_ox": ctx['d1']}
+    header = ["Typ", "x_peak", "y_peak", "Baseline", "H/D"]
+    rows = [["Utlenienie", 1.0, 2.0, 0.0, 2.0], ["Redukcja", 1.0, -2.0, 0.0, 2.0], ["E1/2", 1.0, "", "", ""]]
+    export_workbook(ctx['xlsx'], columns, header, rows, [], [], 1.0, 0)
+
+
+BENCHMARKS = {
+    'load': bench_load,
+    'savgol': bench_savgol,
+    'savgol_parallel': bench_savgol_parallel,
+    'gradient': bench_gradient,
+    'zero_crossings': bench_zero_crossings,
+    'intersections': bench_intersections,
+    'peaks': bench_peaks,
+    'excel_export': bench_excel_export,
+}
+
+
+def time_call(func, ctx, args) -> list[float]:
+    """
+    Wykonuje pomiar: co najmniej jedno wywołanie, najwyżej args.repeat,
+    z przerwaniem po przekroczeniu TIME_BUDGET_S.
+
+    Returns:
+        list: Czasy kolejnych wywołań [s].
+    """
+    times = []
+    while len(times) < args.repeat:
+        start = time.perf_counter()
+        func(ctx, args)
+        times.append(time.perf_counter() - start)
+        if sum(times) > TIME_BUDGET_S:
+            break
+    return times
+
+
+def environment() -> dict:
+    """Zwraca opis środowiska pomiaru (wersje, sprzęt, wersja kodu)."""
+    import scipy
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def run(args) -> dict:
+    """Wykonuje wszystkie wybrane pomiary i zwraca wyniki."""
+    results = []
+    names = args.only or list(BENCHMARKS)
+    with tempfile.TemporaryDirectory(prefix="cvision-bench-") as workdir:
+        for n_points in sorted(args.sizes):
+            selected = [name for name in names
+                        if args.full or n_points <= SIZE_LIMITS.get(name, n_points)]
+            if not selected:
+                continue
+            ctx = bench_context(n_points, workdir, args)
+            if 'load' in selected:
+                write_cv_file(ctx['file'], n_points, noise=args.noise, n_peaks=args.peaks, n_cycles=args.cycles)
+            sequential = None
+            for name in selected:
+                for workers in (args.workers if name == 'savgol_parallel' else [None]):
+                    if workers is not None:
+                        ctx['executor'] = ThreadPoolExecutor(max_workers=workers)
+                    times = time_call(BENCHMARKS[name], ctx, args)
+                    entry = {
+                        'name': name,
+                        'n_points': n_points,
+                        'min_s': min(times),
+                        'median_s': statistics.median(times),
+                        'repeats': len(times),
+                    }
+                    label = name
+                    if name == 'savgol':
+                        sequential = entry['min_s']
+                    if workers is not None:
+                        ctx.pop('executor').shutdown()
+                        entry['workers'] = workers
+                        if sequential:
+                            entry['speedup'] = sequential / entry['min_s']
+                        label = f"{name}[{workers}]"
+                    results.append(entry)
+                    speedup = f"  x{entry['speedup']:.2f}" if 'speedup' in entry else ""
+                    print(f"{label:>15} {n_points:>10d}  min {entry['min_s'] * 1000:10.3f} ms  "
+                          f"mediana {entry['median_s'] * 1000:10.3f} ms  ({len(times)}x){speedup}", file=sys.stderr)
+            del ctx
+    return {
+        'environment': environment(),
+        'parameters': {'noise': args.noise, 'peaks': args.peaks, 'cycles': args.cycles,
+                       'window_length': args.window, 'polyorder': args.polyorder, 'repeat': args.repeat,
+                       'workers': args.workers},
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict) -> list[dict]:
+    """
+    Porównuje wyniki z wynikami bazowymi (ten sam pomiar i rozmiar).
+
+    Returns:
+        list: Wpisy z czasami minimalnymi obu wersji i ich stosunkiem (po/przed).
+    """
+    before = {(r['name'], r['n_points'], r.get('workers')): r for r in baseline.get('results', [])}
+    rows = []
+    for r in current['results']:
+        old = before.get((r['name'], r['n_points'], r.get('workers')))
+        if old is not None:
+            rows.append({'name': r['name'], 'n_points': r['n_points'], 'baseline_min_s': old['min_s'],
+                         'min_s': r['min_s'], 'ratio': r['min_s'] / old['min_s'] if old['min_s'] else None})
+    return rows
+
+
+def _default_workers() -> list[int]:
+    """Domyślne liczby wątków pomiaru savgol_parallel: 1, 2, 4, ... do liczby rdzeni."""
+    cores = os.cpu_count() or 1
+    workers = [1]
+    while workers[-1] * 2 <= cores:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != cores:
+        workers.append(cores)
+    return workers
+
+
+def main():
+    """Punkt wejścia uruchamiania pomiarów z wiersza poleceń."""
+    parser = argparse.ArgumentParser(description="Pomiary wydajności ścieżek obliczeniowych CVision.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Liczby punktów.")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="Wybrane pomiary.")
+    parser.add_argument("--full", action="store_true",
+                        help="Bez domyślnych limitów rozmiaru dla wczytywania i eksportu do Excela.")
+    parser.add_argument("--repeat", type=int, default=5, help="Maksymalna liczba powtórzeń pomiaru.")
+    parser.add_argument("--noise", type=float, default=0.01, help="Poziom szumu danych syntetycznych.")
+    parser.add_argument("--peaks", type=int, default=1, help="Liczba par pików.")
+    parser.add_argument("--cycles", type=int, default=1, help="Liczba cykli.")
+    parser.add_argument("--window", type=int, default=15, help="Długość okna filtru Savitzky'ego-Golaya.")
+    parser.add_argument("--polyorder", type=int, default=3, help="Stopień wielomianu filtru.")
+    parser.add_argument("--workers", type=int, nargs="+", default=_default_workers(),
+                        help="Liczby wątków pomiaru savgol_parallel.")
+    parser.add_argument("--output", default=None, help="Plik JSON z wynikami (domyślnie standardowe wyjście).")
+    parser.add_argument("--compare", default=None, help="Plik JSON z wynikami bazowymi do porównania.")
+    args = parser.parse_args()
+
+    report = run(args)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            report['comparison'] = compare(report, json.load(f))
+        for row in report['comparison']:
+            print(f"{row['name']:>15} {row['n_points']:>10d}  x{row['ratio']:.2f}", file=sys.stderr)
+    text = json.dumps(report, indent=1)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
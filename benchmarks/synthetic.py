@@ -0,0 +1,57 @@
+"""
+Moduł benchmarks/synthetic.py
+-----------------------------
+Generator syntetycznych woltamogramów cyklicznych w formacie plików
+pomiarowych programu (kolumny: E, I_utlenianie, I_redukcja).
+"""
+
+import numpy as np
+
+
+def synthetic_cv(n_points: int, noise: float = 0.01, n_peaks: int = 1, n_cycles: int = 1,
+                 e_range: tuple = (-200.0, 800.0), seed: int = 0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Generuje syntetyczny woltamogram: prąd pojemnościowy, piki gaussowskie
+    (utlenianie dodatnie, redukcja ujemna i przesunięta o 60 mV) oraz szum.
+
+    Parameters:
+        n_points (int): Łączna liczba wierszy (wszystkich cykli).
+        noise (float): Odchylenie standardowe szumu względem wysokości piku.
+        n_peaks (int): Liczba par pików rozmieszczonych równomiernie w zakresie E.
+        n_cycles (int): Liczba cykli; kolejne cykle mają malejące piki, a ich
+            wiersze następują po sobie (oś E nie jest wtedy monotoniczna).
+        e_range (tuple): Zakres potencjału [mV].
+        seed (int): Ziarno generatora liczb losowych.
+
+    Returns:
+        tuple: (E, I_ox, I_red).
+    """
+    rng = np.random.default_rng(seed)
+    per_cycle = -(-n_points // n_cycles)
+    e_min, e_max = e_range
+    width = (e_max - e_min) / (8 * n_peaks)
+    centers = e_min + (e_max - e_min) * (np.arange(n_peaks) + 0.5) / n_peaks
+    x_cycle = np.linspace(e_min, e_max, per_cycle)
+    x_parts, ox_parts, red_parts = [], [], []
+    for cycle in range(n_cycles):
+        decay = 0.97 ** cycle
+        ox = 0.002 * (x_cycle - e_min)
+        red = -0.002 * (x_cycle - e_min)
+        for center in centers:
+            ox += decay * np.exp(-((x_cycle - center) / width) ** 2)
+            red -= 0.8 * decay * np.exp(-((x_cycle - center + 60.0) / width) ** 2)
+        x_parts.append(x_cycle)
+        ox_parts.append(ox)
+        red_parts.append(red)
+    x = np.concatenate(x_parts)[:n_points]
+    y_ox = np.concatenate(ox_parts)[:n_points]
+    y_red = np.concatenate(red_parts)[:n_points]
+    if noise > 0:
+        y_ox += rng.normal(0.0, noise, n_points)
+        y_red += rng.normal(0.0, noise, n_points)
+    return x, y_ox, y_red
+
+
+def write_cv_file(filename: str, n_points: int, **kwargs):
+    """Zapisuje syntetyczny woltamogram do pliku tekstowego (jak plik z potencjostatu)."""
+    np.savetxt(filename, np.column_stack(synthetic_cv(n_points, **kwargs)), fmt='%.8g')
@@ -0,0 +1,192 @@
+"""
+Moduł blank_library.py
+----------------------
+Zawiera bibliotekę ślepych prób (woltamogramów samego elektrolitu) do
+odejmowania prądu tła od danych surowych przed wygładzaniem.
+
+Ślepe próby zapisywane są w katalogu biblioteki (zmienna środowiskowa
+CVISION_BLANK_LIBRARY, domyślnie ~/.cvision/blanks) w formacie pliku sesji
+(moduł session) z rozszerzeniem .cvblank, więc przy odczycie są mapowane
+w pamięć.
+
+Ślepa próba interpolowana jest na siatkę potencjału próbki tylko raz:
+indeksy i wagi interpolacji liniowej oraz krzywe tła na siatce próbki są
+przechowywane w pamięci podręcznej dla pary (ślepa próba, siatka). Siatka
+rozpoznawana jest po tożsamości tablicy (dane surowe okna głównego są tylko
+do odczytu), więc ponowne odjęcie - także po zmianie współczynnika skali -
+to jedno zwektoryzowane mnożenie z dodawaniem na każdą gałąź.
+"""
+
+import os
+import re
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+from cvcore.memory import readonly
+from cvcore.profiling import profiler
+from session import load_session, save_session
+
+BLANK_LIBRARY_ENV = "CVISION_BLANK_LIBRARY"
+BLANK_EXTENSION = ".cvblank"
+# Liczba par (ślepa próba, siatka) przechowywanych w pamięci podręcznej
+BLANK_CACHE_SIZE = 8
+
+
+def default_library_directory() -> str:
+    """Zwraca katalog biblioteki ślepych prób."""
+    return os.environ.get(BLANK_LIBRARY_ENV) or os.path.join(os.path.expanduser("~"), ".cvision", "blanks")
+
+
+def interpolation_plan(x_blank: np.ndarray, grid: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Wyznacza indeksy i wagi interpolacji liniowej krzywej o osi x_blank na
+    siatkę grid. Poza zakresem ślepej próby przyjmowana jest wartość skrajna
+    (jak w np.interp).
+
+    Parameters:
+        x_blank (ndarray): Oś potencjału ślepej próby (posortowana rosnąco, co najmniej 2 punkty).
+        grid (ndarray): Siatka potencjału próbki.
+
+    Returns:
+        tuple: (indeksy lewych węzłów, wagi prawych węzłów 0..1).
+    """
+    index = np.searchsorted(x_blank, grid, side='right') - 1
+    np.clip(index, 0, len(x_blank) - 2, out=index)
+    index = index.astype(np.int32 if len(x_blank) < 2 ** 31 else np.int64)
+    left = x_blank[index]
+    span = x_blank[index + 1] - left
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weight = np.where(span > 0, (grid - left) / span, 0.0)
+    np.clip(weight, 0.0, 1.0, out=weight)
+    return index, weight
+
+
+def apply_plan(plan: tuple[np.ndarray, np.ndarray], y_blank: np.ndarray) -> np.ndarray:
+    """Interpoluje wartości ślepej próby według planu z interpolation_plan."""
+    index, weight = plan
+    left = y_blank[index]
+    return left + weight * (y_blank[index + 1] - left)
+
+
+class BlankCurve:
+    """Jedna ślepa próba: nazwa oraz posortowane dane (potencjał, prąd obu gałęzi)."""
+
+    def __init__(self, name: str, x: np.ndarray, y1: np.ndarray, y2: np.ndarray, source_file: str = None):
+        if len(x) < 2:
+            raise ValueError("Ślepa próba musi zawierać co najmniej dwa punkty.")
+        self.name = name
+        self.x, self.y1, self.y2 = x, y1, y2
+        self.source_file = source_file
+
+
+class BlankLibrary:
+    """
+    Katalog ślepych prób z pamięcią podręczną krzywych tła przeinterpolowanych
+    na siatki próbek (LRU po parach ślepa próba - siatka).
+    """
+
+    def __init__(self, directory: str = None, cache_size: int = BLANK_CACHE_SIZE):
+        self.directory = directory or default_library_directory()
+        self.cache_size = cache_size
+        self._blanks = {}
+        # (nazwa, id siatki) -> (słaba referencja do siatki, krzywe tła na siatce)
+        self._cache = OrderedDict()
+
+    def path(self, name: str) -> str:
+        """Ścieżka pliku ślepej próby w katalogu biblioteki."""
+        safe = re.sub(r'[^\w\-. ]', '_', name).strip() or "blank"
+        return os.path.join(self.directory, safe + BLANK_EXTENSION)
+
+    def names(self) -> list[str]:
+        """Zwraca nazwy ślepych prób zapisanych w bibliotece."""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(file[:-len(BLANK_EXTENSION)] for file in os.listdir(self.directory)
+                      if file.endswith(BLANK_EXTENSION))
+
+    def get(self, name: str) -> BlankCurve:
+        """Zwraca ślepą próbę (wczytaną z biblioteki przy pierwszym użyciu)."""
+        blank = self._blanks.get(name)
+        if blank is None:
+            manifest, arrays = load_session(self.path(name))
+            blank = BlankCurve(name, arrays['x'], arrays['y1'], arrays['y2'], manifest.get('source_file'))
+            self._blanks[name] = blank
+        return blank
+
+    def add(self, name: str, x: np.ndarray, y1: np.ndarray, y2: np.ndarray, source_file: str = None) -> BlankCurve:
+        """
+        Zapisuje ślepą próbę w bibliotece (zastępuje próbę o tej samej nazwie).
+
+        Parameters:
+            x (ndarray): Potencjał (posortowany rosnąco, jak z load_cv).
+            y1, y2 (ndarray): Prąd gałęzi utleniania i redukcji.
+        """
+        blank = BlankCurve(name, *readonly(np.asarray(x, dtype=float), np.asarray(y1, dtype=float),
+                                            np.asarray(y2, dtype=float)), source_file)
+        os.makedirs(self.directory, exist_ok=True)
+        save_session(self.path(name), {'x': blank.x, 'y1': blank.y1, 'y2': blank.y2},
+                     {'blank': name, 'source_file': source_file})
+        self.forget(name)
+        self._blanks[name] = blank
+        return blank
+
+    def remove(self, name: str):
+        """Usuwa ślepą próbę z biblioteki."""
+        self.forget(name)
+        path = self.path(name)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def forget(self, name: str):
+        """Usuwa ślepą próbę i jej krzywe na siatkach z pamięci (plik pozostaje)."""
+        self._blanks.pop(name, None)
+        for key in [key for key in self._cache if key[0] == name]:
+            del self._cache[key]
+
+    def resampled(self, name: str, grid: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Zwraca krzywe tła ślepej próby na siatce próbki (z pamięci podręcznej,
+        jeśli ta sama siatka była już użyta).
+
+        Returns:
+            tuple: (tło gałęzi utleniania, tło gałęzi redukcji) na siatce grid.
+        """
+        key = (name, id(grid))
+        entry = self._cache.get(key)
+        if entry is not None and entry[0]() is grid:
+            self._cache.move_to_end(key)
+            profiler.count("blank_cache_hit")
+            return entry[1]
+        profiler.count("blank_cache_miss")
+        blank = self.get(name)
+        with profiler.stage("blank_resample", n_points=len(grid), n_blank=len(blank.x)):
+            plan = interpolation_plan(blank.x, grid)
+            curves = readonly(apply_plan(plan, blank.y1), apply_plan(plan, blank.y2))
+        self._cache[key] = (weakref.ref(grid, lambda _, key=key: self._cache.pop(key, None)), curves)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return curves
+
+    def subtract(self, name: str, x: np.ndarray, y1: np.ndarray, y2: np.ndarray,
+                 scale: float = 1.0) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Odejmuje ślepą próbę (pomnożoną przez scale) od obu gałęzi próbki.
+
+        Parameters:
+            name (str): Nazwa ślepej próby.
+            x (ndarray): Siatka potencjału próbki (traktowana jako niezmienna).
+            y1, y2 (ndarray): Prąd gałęzi próbki.
+            scale (float): Współczynnik skali ślepej próby.
+
+        Returns:
+            tuple: (y1 - scale * tło1, y2 - scale * tło2) - nowe tablice.
+        """
+        background1, background2 = self.resampled(name, x)
+        with profiler.stage("blank_subtract", n_points=len(x)):
+            out1 = np.multiply(background1, -scale)
+            out1 += y1
+            out2 = np.multiply(background2, -scale)
+            out2 += y2
+        return out1, out2
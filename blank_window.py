@@ -0,0 +1,152 @@
+"""
+Moduł blank_window.py
+---------------------
+Zawiera okno biblioteki ślepych prób: dodawanie ślepej próby z pliku lub
+z bieżących danych, usuwanie oraz wybór ślepej próby (i współczynnika skali)
+odejmowanej od danych surowych okna głównego przed wygładzaniem.
+"""
+
+import os
+
+from PyQt6 import QtWidgets, QtCore
+
+from cvcore import load_cv
+
+
+class BlankLibraryDialog(QtWidgets.QDialog):
+    """
+    Okno biblioteki ślepych prób (blank_library.BlankLibrary okna głównego).
+    """
+
+    def __init__(self, main_window):
+        """
+        Parameters:
+            main_window (MainWindow): Okno główne (biblioteka, dane i ustawienia odejmowania).
+        """
+        super().__init__(main_window)
+        self.setWindowTitle("Ślepe próby (odejmowanie tła)")
+        self.main_window = main_window
+        self.library = main_window.blank_library
+        self.init_ui()
+        self.refresh()
+
+    def init_ui(self):
+        """Tworzy interfejs okna: lista ślepych prób, skala i przyciski."""
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(QtWidgets.QLabel(f"Biblioteka: {self.library.directory}"))
+        self.list_widget = QtWidgets.QListWidget()
+        layout.addWidget(self.list_widget)
+        form = QtWidgets.QFormLayout()
+        self.scale_spin = QtWidgets.QDoubleSpinBox()
+        self.scale_spin.setRange(-100.0, 100.0)
+        self.scale_spin.setDecimals(4)
+        self.scale_spin.setSingleStep(0.05)
+        self.scale_spin.setValue((self.main_window.blank_settings or {}).get('scale', 1.0))
+        self.scale_spin.valueChanged.connect(self.update_scale)
+        form.addRow("Współczynnik skali:", self.scale_spin)
+        layout.addLayout(form)
+
+        buttons = QtWidgets.QGridLayout()
+        btn_add_file = QtWidgets.QPushButton("Dodaj z pliku")
+        btn_add_file.clicked.connect(self.add_from_file)
+        buttons.addWidget(btn_add_file, 0, 0)
+        btn_add_current = QtWidgets.QPushButton("Dodaj bieżące dane")
+        btn_add_current.clicked.connect(self.add_current)
+        buttons.addWidget(btn_add_current, 0, 1)
+        btn_remove = QtWidgets.QPushButton("Usuń z biblioteki")
+        btn_remove.clicked.connect(self.remove_selected)
+        buttons.addWidget(btn_remove, 0, 2)
+        btn_apply = QtWidgets.QPushButton("Odejmij wybraną")
+        btn_apply.clicked.connect(self.apply_selected)
+        buttons.addWidget(btn_apply, 1, 0)
+        btn_disable = QtWidgets.QPushButton("Bez odejmowania")
+        btn_disable.clicked.connect(lambda: self.main_window.set_blank(None))
+        buttons.addWidget(btn_disable, 1, 1)
+        layout.addLayout(buttons)
+        self.status_label = QtWidgets.QLabel("")
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+
+    def refresh(self):
+        """Odświeża listę ślepych prób i opis bieżącego odejmowania."""
+        self.list_widget.clear()
+        self.list_widget.addItems(self.library.names())
+        settings = self.main_window.blank_settings
+        if settings:
+            matches = self.list_widget.findItems(settings['name'], QtCore.Qt.MatchFlag.MatchExactly)
+            if matches:
+                self.list_widget.setCurrentItem(matches[0])
+            self.status_label.setText(f"Odejmowana ślepa próba: {settings['name']} (skala {settings['scale']:g})")
+        else:
+            self.status_label.setText("Ślepa próba nie jest odejmowana.")
+
+    def selected_name(self):
+        """Nazwa zaznaczonej ślepej próby lub None."""
+        item = self.list_widget.currentItem()
+        return item.text() if item is not None else None
+
+    def ask_name(self, default: str):
+        """Pyta o nazwę nowej ślepej próby."""
+        name, ok = QtWidgets.QInputDialog.getText(self, "Nazwa ślepej próby", "Nazwa:", text=default)
+        return name.strip() if ok and name.strip() else None
+
+    def add_from_file(self):
+        """Dodaje do biblioteki ślepą próbę wczytaną z pliku tekstowego."""
+        file_name, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Wybierz plik ślepej próby", "",
+                                                             "Text Files (*.txt);;All Files (*)")
+        if not file_name:
+            return
+        name = self.ask_name(os.path.splitext(os.path.basename(file_name))[0])
+        if name is None:
+            return
+        try:
+            x, y1, y2 = load_cv(file_name, self.main_window.measurement_type_combo.currentIndex())
+            self.library.add(name, x, y1, y2, source_file=file_name)
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Błąd", f"Nie udało się dodać ślepej próby.\n{str(e)}")
+            return
+        self.refresh()
+
+    def add_current(self):
+        """Dodaje do biblioteki dane surowe okna głównego jako ślepą próbę."""
+        mw = self.main_window
+        if mw.x is None:
+            QtWidgets.QMessageBox.warning(self, "Brak danych", "Najpierw zaimportuj dane.")
+            return
+        default = os.path.splitext(os.path.basename(mw.file_name))[0] if mw.file_name else "blank"
+        name = self.ask_name(default)
+        if name is None:
+            return
+        try:
+            self.library.add(name, mw.x, mw.raw_y1, mw.raw_y2, source_file=mw.file_name)
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Błąd", f"Nie udało się dodać ślepej próby.\n{str(e)}")
+            return
+        self.refresh()
+
+    def remove_selected(self):
+        """Usuwa zaznaczoną ślepą próbę z biblioteki."""
+        name = self.selected_name()
+        if name is None:
+            return
+        if (self.main_window.blank_settings or {}).get('name') == name:
+            self.main_window.set_blank(None)
+        try:
+            self.library.remove(name)
+        except OSError as e:
+            QtWidgets.QMessageBox.critical(self, "Błąd", f"Nie udało się usunąć ślepej próby.\n{str(e)}")
+        self.refresh()
+
+    def apply_selected(self):
+        """Włącza odejmowanie zaznaczonej ślepej próby w oknie głównym."""
+        name = self.selected_name()
+        if name is None:
+            QtWidgets.QMessageBox.warning(self, "Ślepa próba", "Zaznacz ślepą próbę na liście.")
+            return
+        self.main_window.set_blank({'name': name, 'scale': self.scale_spin.value()})
+
+    def update_scale(self, value: float):
+        """Zmienia współczynnik skali odejmowanej ślepej próby (bez ponownej interpolacji)."""
+        settings = self.main_window.blank_settings
+        if settings:
+            self.main_window.set_blank({'name': settings['name'], 'scale': value})
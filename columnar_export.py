@@ -0,0 +1,191 @@
+"""
+Moduł columnar_export.py
+------------------------
+Zawiera eksport wyników do formatów kolumnowych: Parquet (pyarrow),
+HDF5 (h5py) oraz skompresowanego CSV (gzip). Dane zapisywane są blokami,
+z kompresją i zachowaniem typów, a ustawienia analizy, tabela wyników
+i miejsca zerowe dołączane są jako metadane.
+
+Pakiety pyarrow i h5py są opcjonalne - importowane dopiero przy eksporcie.
+"""
+
+import gzip
+import json
+
+import numpy as np
+
+# Liczba wierszy zapisywanych jednym blokiem (grupa wierszy / fragment)
+COLUMNAR_CHUNK_ROWS = 1 << 18
+
+# Rozszerzenia plików obsługiwanych formatów
+COLUMNAR_FORMATS = {
+    '.parquet': 'Parquet',
+    '.h5': 'HDF5',
+    '.csv.gz': 'CSV (gzip)',
+}
+
+
+def typed_params(params_header: list, params_rows: list) -> dict:
+    """
+    Zamienia wiersze tabeli wyników na kolumny z typami: pierwsza kolumna
+    (typ wyniku) pozostaje tekstem, pozostałe są liczbami (NaN dla pustych pól).
+
+    Returns:
+        dict: Słownik nazwa kolumny -> lista wartości.
+    """
+    table = {name: [] for name in params_header}
+    for row in params_rows:
+        for col, name in enumerate(params_header):
+            value = row[col] if col < len(row) else ""
+            if col == 0:
+                table[name].append(str(value))
+                continue
+            try:
+                table[name].append(float(value))
+            except (TypeError, ValueError):
+                table[name].append(float('nan'))
+    return table
+
+
+def build_metadata(settings: dict, params_header: list, params_rows: list,
+                   deriv_intersections: list, second_deriv_intersections: list) -> dict:
+    """
+    Buduje słownik metadanych (ustawienia, wyniki, miejsca zerowe) zapisywany
+    obok danych. Wartości NaN zamieniane są na None, aby JSON był poprawny.
+    """
+    params = typed_params(params_header, params_rows)
+    for name, values in params.items():
+        params[name] = [None if isinstance(v, float) and np.isnan(v) else v for v in values]
+    return {
+        'settings': settings,
+        'parametry': params,
+        'przeciecia_pochodnej': [[float(x), float(y)] for x, y in (deriv_intersections or [])],
+        'przeciecia_drugiej_pochodnej': [[float(x), float(y)] for x, y in (second_deriv_intersections or [])],
+    }
+
+
+def export_parquet(filename: str, columns: dict, metadata: dict, progress=None):
+    """
+    Zapisuje kolumny danych do pliku Parquet (kompresja zstd, grupy wierszy
+    po COLUMNAR_CHUNK_ROWS); metadane trafiają do schematu jako JSON.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Eksport do formatu Parquet wymaga pakietu pyarrow (pip install pyarrow).") from e
+    names = list(columns)
+    arrays = [np.asarray(columns[name], dtype=np.float64) for name in names]
+    schema = pa.schema([(name, pa.float64()) for name in names],
+                       metadata={f"cvision.{key}": json.dumps(value) for key, value in metadata.items()})
+    n_rows = len(arrays[0]) if arrays else 0
+    with pq.ParquetWriter(filename, schema, compression='zstd') as writer:
+        for start in range(0, n_rows, COLUMNAR_CHUNK_ROWS):
+            stop = min(start + COLUMNAR_CHUNK_ROWS, n_rows)
+            batch = pa.record_batch([pa.array(a[start:stop]) for a in arrays], schema=schema)
+            writer.write_batch(batch)
+            if progress is not None:
+                progress(stop, n_rows, "Parquet")
+
+
+def export_hdf5(filename: str, columns: dict, metadata: dict, progress=None):
+    """
+    Zapisuje dane do pliku HDF5: kolumny danych w grupie /dane (fragmenty,
+    gzip + shuffle), tabelę wyników w grupie /parametry, miejsca zerowe jako
+    tablice (k, 2), a ustawienia jako atrybut JSON pliku.
+    """
+    try:
+        import h5py
+    except ImportError as e:
+        raise ImportError("Eksport do formatu HDF5 wymaga pakietu h5py (pip install h5py).") from e
+    with h5py.File(filename, 'w') as f:
+        f.attrs['cvision.settings'] = json.dumps(metadata['settings'])
+        data_group = f.create_group('dane')
+        n_columns = len(columns)
+        for col, (name, values) in enumerate(columns.items()):
+            values = np.asarray(values, dtype=np.float64)
+            n_rows = len(values)
+            dataset = data_group.create_dataset(name, shape=(n_rows,), dtype=np.float64,
+                                                chunks=(max(min(n_rows, COLUMNAR_CHUNK_ROWS), 1),),
+                                                compression='gzip', compression_opts=4, shuffle=True)
+            for start in range(0, n_rows, COLUMNAR_CHUNK_ROWS):
+                stop = min(start + COLUMNAR_CHUNK_ROWS, n_rows)
+                dataset[start:stop] = values[start:stop]
+                if progress is not None:
+                    progress(col * n_rows + stop, n_columns * n_rows, f"HDF5: kolumna {name}")
+        params_group = f.create_group('parametry')
+        for col, (name, values) in enumerate(metadata['parametry'].items()):
+            if col == 0:
+                params_group.create_dataset(name, data=np.array(values, dtype=object),
+                                            dtype=h5py.string_dtype())
+            else:
+                params_group.create_dataset(name, data=np.array(
+                    [np.nan if v is None else v for v in values], dtype=np.float64))
+        for key in ('przeciecia_pochodnej', 'przeciecia_drugiej_pochodnej'):
+            f.create_dataset(key, data=np.array(metadata[key], dtype=np.float64).reshape(-1, 2))
+
+
+def export_csv_gz(filename: str, columns: dict, metadata: dict, progress=None):
+    """
+    Zapisuje dane do skompresowanego pliku CSV. Metadane zapisywane są
+    w nagłówku jako wiersze komentarza '# cvision.<klucz>: <JSON>', co pozwala
+    wczytać plik np. przez np.loadtxt(..., delimiter=',', skiprows=...)
+    lub pandas.read_csv(..., comment='#'). Wartości zapisywane są z 17 cyframi
+    znaczącymi, więc po wczytaniu są identyczne z zapisanymi (float64).
+    """
+    names = list(columns)
+    arrays = [np.asarray(columns[name], dtype=np.float64) for name in names]
+    n_rows = len(arrays[0]) if arrays else 0
+    with gzip.open(filename, 'wt', compresslevel=6, encoding='utf-8', newline='') as f:
+        for key, value in metadata.items():
+            f.write(f"# cvision.{key}: {json.dumps(value)}\n")
+        f.write(",".join(names) + "\n")
+        for start in range(0, n_rows, COLUMNAR_CHUNK_ROWS):
+            stop = min(start + COLUMNAR_CHUNK_ROWS, n_rows)
+            block = np.column_stack([a[start:stop] for a in arrays])
+            np.savetxt(f, block, delimiter=',', fmt='%.17g')
+            if progress is not None:
+                progress(stop, n_rows, "CSV")
+
+
+def columnar_format(filename: str):
+    """Zwraca rozszerzenie obsługiwanego formatu dla nazwy pliku lub None."""
+    lower = filename.lower()
+    if lower.endswith('.hdf5'):
+        return '.h5'
+    for extension in COLUMNAR_FORMATS:
+        if lower.endswith(extension):
+            return extension
+    return None
+
+
+def export_columnar(filename: str,
+                    columns: dict,
+                    params_header: list,
+                    params_rows: list,
+                    deriv_intersections: list,
+                    second_deriv_intersections: list,
+                    settings: dict,
+                    progress=None):
+    """
+    Eksportuje dane i wyniki do formatu kolumnowego wybranego na podstawie
+    rozszerzenia pliku (.parquet, .h5/.hdf5, .csv.gz).
+
+    Parameters:
+        filename (str): Ścieżka pliku wynikowego.
+        columns (dict): Kolumny danych (jak w arkuszu "Dane" eksportu do Excela).
+        params_header (list): Nagłówek tabeli wyników.
+        params_rows (list): Wiersze tabeli wyników.
+        deriv_intersections (list): Miejsca zerowe pierwszej pochodnej (x, y).
+        second_deriv_intersections (list): Miejsca zerowe drugiej pochodnej (x, y).
+        settings (dict): Ustawienia analizy zapisywane jako metadane.
+        progress (callable): Opcjonalna funkcja progress(zapisane wiersze, wszystkie wiersze, etap)
+            wywoływana po każdym bloku; może przerwać zapis, zgłaszając wyjątek.
+    """
+    extension = columnar_format(filename)
+    if extension is None:
+        raise ValueError(f"Nieobsługiwany format pliku: {filename}")
+    metadata = build_metadata(settings, params_header, params_rows,
+                              deriv_intersections, second_deriv_intersections)
+    writer = {'.parquet': export_parquet, '.h5': export_hdf5, '.csv.gz': export_csv_gz}[extension]
+    writer(filename, columns, metadata, progress)
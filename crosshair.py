@@ -0,0 +1,107 @@
+"""
+Moduł crosshair.py
+------------------
+Zawiera krzyż celowniczy przyciągany do najbliższego punktu danych.
+Ruchy myszy są ograniczane przez pg.SignalProxy, a punkt wyszukiwany
+binarnie na posortowanej osi potencjału, więc koszt odczytu nie zależy
+od rozmiaru danych.
+"""
+
+import numpy as np
+from PyQt6 import QtCore
+import pyqtgraph as pg
+
+from utils import nearest_index
+
+
+class DataCrosshair(QtCore.QObject):
+    """
+    Krzyż celowniczy przyciągany do najbliższej próbki wybranej krzywej.
+
+    Po każdym przesunięciu na nową próbkę wywoływana jest funkcja
+    on_snap(index, curve_index, view_point); gdy brak danych lub kursor
+    opuszcza wykres, wywoływana jest z index = None.
+    """
+
+    def __init__(self, plot_widget, on_snap, rate_limit=30):
+        """
+        Inicjalizacja krzyża celowniczego.
+
+        Parameters:
+            plot_widget (pg.PlotWidget): Wykres, na którym rysowany jest krzyż.
+            on_snap (callable): Funkcja wywoływana po przyciągnięciu do próbki.
+            rate_limit (int): Maksymalna liczba aktualizacji na sekundę.
+        """
+        super().__init__(plot_widget)
+        self.plot_widget = plot_widget
+        self.on_snap = on_snap
+        self.x = None
+        self.curves = []
+        self.selected = None
+        self._last = None
+        pen = pg.mkPen(color=(200, 200, 200), width=1, style=QtCore.Qt.PenStyle.DotLine)
+        self.v_line = pg.InfiniteLine(angle=90, movable=False, pen=pen)
+        self.h_line = pg.InfiniteLine(angle=0, movable=False, pen=pen)
+        self.marker = pg.ScatterPlotItem(size=9, symbol='o', pen=pg.mkPen('y'), brush=None)
+        for item in (self.v_line, self.h_line, self.marker):
+            item.setZValue(20)
+            item.setVisible(False)
+        self.proxy = pg.SignalProxy(plot_widget.scene().sigMouseMoved, rateLimit=rate_limit, slot=self.mouseMoved)
+        self.attach()
+
+    def attach(self):
+        """Dodaje elementy krzyża do wykresu (np. po wywołaniu plot_widget.clear())."""
+        for item in (self.v_line, self.h_line, self.marker):
+            if item.scene() is None:
+                self.plot_widget.addItem(item, ignoreBounds=True)
+
+    def set_data(self, x, curves):
+        """
+        Ustawia dane, do których przyciągany jest krzyż.
+
+        Parameters:
+            x (ndarray): Posortowane rosnąco wartości osi x (lub None).
+            curves (list): Lista krzywych (ndarray) o długości równej x.
+        """
+        self.x = x
+        self.curves = list(curves) if curves is not None else []
+        self._last = None
+        if x is None:
+            self.hide()
+
+    def set_selected(self, curve_index):
+        """Wybiera krzywą, do której przyciągany jest krzyż (None - najbliższa w osi y)."""
+        self.selected = curve_index
+        self._last = None
+
+    def hide(self):
+        """Ukrywa krzyż."""
+        for item in (self.v_line, self.h_line, self.marker):
+            item.setVisible(False)
+
+    def mouseMoved(self, evt):
+        """Przyciąga krzyż do najbliższej próbki danych i zgłasza ją przez on_snap."""
+        pos = evt[0]
+        if not self.plot_widget.sceneBoundingRect().contains(pos):
+            return
+        view_point = self.plot_widget.getViewBox().mapSceneToView(pos)
+        if self.x is None or len(self.x) == 0 or not self.curves:
+            self.on_snap(None, None, view_point)
+            return
+        index = nearest_index(self.x, view_point.x())
+        if self.selected is None:
+            distances = np.abs(np.array([curve[index] for curve in self.curves]) - view_point.y())
+            curve_index = int(np.argmin(np.where(np.isnan(distances), np.inf, distances)))
+        else:
+            curve_index = self.selected
+        if (index, curve_index) == self._last:
+            return
+        self._last = (index, curve_index)
+        x_val = float(self.x[index])
+        y_val = float(self.curves[curve_index][index])
+        self.v_line.setPos(x_val)
+        self.h_line.setPos(y_val)
+        self.marker.setData([x_val], [y_val])
+        for item in (self.v_line, self.h_line, self.marker):
+            item.setVisible(True)
+        self.on_snap(index, curve_index, view_point)
@@ -0,0 +1,50 @@
+"""
+Pakiet cvcore
+-------------
+Rdzeń obliczeniowy CVision niezależny od Qt: wczytywanie danych, wygładzanie,
+linie bazowe, parametry pików i E1/2, pochodne, miejsca zerowe, widmo szumu
+z filtrowaniem w dziedzinie częstotliwości, trendy pików w pomiarach
+wielocyklowych, nagrania FSCV z odejmowaniem kroczącego tła, wrażliwość
+wyników pików na parametry wygładzania oraz symulacja teoretycznych
+woltamogramów.
+
+Pakiet korzysta wyłącznie z NumPy (SciPy importowane jest dopiero przy
+wygładzaniu i symulacji), więc tę samą analizę co w oknie głównym można wykonać
+w skryptach, notatnikach czy na serwerze, bez tworzenia QApplication.
+
+Przykład:
+    from cvcore import analyze_file
+    result = analyze_file("pomiar.txt", smoothing={'enabled': True, 'window_length': 15, 'polyorder': 3})
+    print(result.peaks.e_half)
+"""
+
+from cvcore.io import load_cv
+from cvcore.smoothing import (SMOOTHING_METHODS, apply_smoothing, apply_smoothing_pair, effective_window, smooth,
+                              smooth_many)
+from cvcore.spectrum import power_spectrum, fourier_filter, dominant_frequencies
+from cvcore.baseline import baseline_at, default_baseline_settings
+from cvcore.peaks import PeakResult, PeakAnalysis, find_peak, compute_peak_parameters
+from cvcore.derivatives import first_derivative, second_derivative, derivatives_at, nearest_index
+from cvcore.crossings import compute_intersections, compute_zero_crossings
+from cvcore.cycles import CycleTrends, load_cycles, cycle_starts, track_cycles
+from cvcore.fscv import FSCVData, load_fscv, rolling_background
+from cvcore.ir_compensation import CorrectedBranch, IRCompensation
+from cvcore.sensitivity import SensitivityGrid, sensitivity_sweep, smooth_bank, stable_mask
+from cvcore.pipeline import AnalysisResult, analyze, analyze_file
+from cvcore.simulation import SimulationParameters, simulate_cv, simulate_cv_batch, simulate_on, fit_kinetics
+
+__all__ = [
+    "load_cv",
+    "SMOOTHING_METHODS", "apply_smoothing", "apply_smoothing_pair", "effective_window", "smooth", "smooth_many",
+    "power_spectrum", "fourier_filter", "dominant_frequencies",
+    "baseline_at", "default_baseline_settings",
+    "PeakResult", "PeakAnalysis", "find_peak", "compute_peak_parameters",
+    "first_derivative", "second_derivative", "derivatives_at", "nearest_index",
+    "compute_intersections", "compute_zero_crossings",
+    "CycleTrends", "load_cycles", "cycle_starts", "track_cycles",
+    "FSCVData", "load_fscv", "rolling_background",
+    "CorrectedBranch", "IRCompensation",
+    "SensitivityGrid", "sensitivity_sweep", "smooth_bank", "stable_mask",
+    "AnalysisResult", "analyze", "analyze_file",
+    "SimulationParameters", "simulate_cv", "simulate_cv_batch", "simulate_on", "fit_kinetics",
+]
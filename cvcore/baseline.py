@@ -0,0 +1,42 @@
+"""
+Moduł cvcore/baseline.py
+------------------------
+Zawiera obsługę liniowych linii bazowych gałęzi utleniania i redukcji.
+Linia bazowa opisana jest słownikiem {'x1', 'y1', 'x2', 'y2'}.
+"""
+
+import numpy as np
+
+
+def baseline_at(settings: dict, x):
+    """
+    Oblicza wartość liniowej linii bazowej w punkcie (lub tablicy punktów) x.
+
+    Parameters:
+        settings (dict): Linia bazowa {'x1', 'y1', 'x2', 'y2'}.
+        x (float | ndarray): Punkt lub punkty osi x.
+
+    Returns:
+        float | ndarray: Wartości linii bazowej; dla x1 == x2 linia jest stała (y1).
+    """
+    x1, y1, x2, y2 = settings['x1'], settings['y1'], settings['x2'], settings['y2']
+    if x2 == x1:
+        return np.full_like(x, y1, dtype=float) if isinstance(x, np.ndarray) else y1
+    return y1 + (y2 - y1) * (x - x1) / (x2 - x1)
+
+
+def default_baseline_settings(x: np.ndarray, y1: np.ndarray, y2: np.ndarray) -> dict:
+    """
+    Zwraca domyślne linie bazowe: utlenianie na lewej, a redukcja na prawej
+    połowie zakresu potencjału, obie na poziomie minimum prądu.
+
+    Returns:
+        dict: {'oxidation': {...}, 'reduction': {...}}.
+    """
+    x_min, x_max = float(np.min(x)), float(np.max(x))
+    y_min = float(min(np.min(y1), np.min(y2)))
+    mid_x = (x_min + x_max) / 2
+    return {
+        'oxidation': {'x1': x_min, 'y1': y_min, 'x2': mid_x, 'y2': y_min},
+        'reduction': {'x1': mid_x, 'y1': y_min, 'x2': x_max, 'y2': y_min},
+    }
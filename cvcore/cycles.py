@@ -0,0 +1,211 @@
+"""
+Moduł cvcore/cycles.py
+----------------------
+Zawiera śledzenie degradacji elektrody w długich pomiarach wielocyklowych:
+położenie i prąd pików, ΔEp oraz E1/2 w każdym cyklu jako szeregi czasowe.
+
+Dane wczytywane są w kolejności pomiaru (bez sortowania, które niszczy
+podział na cykle). Granice cykli wyznaczane są z kolumny numeru cyklu lub
+z powrotu potencjału na początek skanu. Ekstrema i linie bazowe liczone są
+jednocześnie dla wszystkich cykli redukcjami segmentowymi
+(np.maximum.reduceat / np.minimum.reduceat po granicach cykli), blokami
+cykli, aby pamięć tymczasowa nie zależała od długości pomiaru.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from cvcore.baseline import baseline_at
+from cvcore.profiling import profiler
+
+# Maksymalna liczba wierszy przetwarzanych jednym blokiem cykli
+CYCLE_BLOCK_ROWS = 1 << 20
+# Tryby linii bazowej: wspólna linia z ustawień lub linia przez końce zakresu w każdym cyklu
+BASELINE_MODES = ('fixed', 'cycle')
+
+
+def load_cycles(file_name: str, measurement_type: int = 0):
+    """
+    Wczytuje plik wielocyklowy w kolejności pomiaru (bez sortowania).
+
+    Plik ma kolumny E, I_utlenianie, I_redukcja i opcjonalnie czwartą
+    kolumnę z numerem cyklu.
+
+    Parameters:
+        file_name (str): Ścieżka do pliku tekstowego.
+        measurement_type (int): Typ pomiaru (0 - utlenianie, 1 - redukcja; jak w load_cv).
+
+    Returns:
+        tuple: (x, y1, y2, cycle) - cycle to numery cykli lub None, gdy plik ich nie zawiera.
+    """
+    with profiler.stage("load_cycles") as stage:
+        data = np.loadtxt(file_name, ndmin=2)
+        stage.set(n_points=len(data))
+    if data.shape[1] < 3:
+        raise ValueError("Plik musi zawierać co najmniej trzy kolumny: E, I_utlenianie, I_redukcja.")
+    x = data[:, 0]
+    y1, y2 = (data[:, 1], data[:, 2]) if measurement_type == 0 else (data[:, 2], data[:, 1])
+    cycle = data[:, 3] if data.shape[1] > 3 else None
+    return x, y1, y2, cycle
+
+
+def cycle_starts(x: np.ndarray, cycle: np.ndarray = None) -> np.ndarray:
+    """
+    Zwraca indeksy początków cykli.
+
+    Bez kolumny numeru cyklu nowy cykl zaczyna się tam, gdzie potencjał
+    wraca na początek skanu: skok przeciwny do kierunku skanu większy niż
+    połowa zakresu potencjału (drobne wahania potencjału nie dzielą cyklu).
+
+    Parameters:
+        x (ndarray): Potencjał w kolejności pomiaru.
+        cycle (ndarray): Opcjonalne numery cykli.
+    """
+    if len(x) == 0:
+        return np.zeros(0, dtype=np.intp)
+    if cycle is not None:
+        return np.concatenate(([0], np.flatnonzero(cycle[1:] != cycle[:-1]) + 1))
+    dx = np.diff(x)
+    direction = 1.0 if np.median(dx) >= 0 else -1.0
+    threshold = 0.5 * (np.max(x) - np.min(x))
+    return np.concatenate(([0], np.flatnonzero(direction * dx < -threshold) + 1))
+
+
+@dataclass(frozen=True)
+class CycleTrends:
+    """
+    Parametry pików w kolejnych cyklach (NaN, gdy w zakresie cyklu nie ma danych).
+
+    Atrybuty:
+        cycle: Numer cyklu (od 1).
+        ox_x, ox_y, ox_baseline, ox_height: Pik utleniania: potencjał, prąd, linia bazowa, wysokość.
+        red_x, red_y, red_baseline, red_height: Pik redukcji: potencjał, prąd, linia bazowa, głębokość.
+    """
+    cycle: np.ndarray
+    ox_x: np.ndarray
+    ox_y: np.ndarray
+    ox_baseline: np.ndarray
+    ox_height: np.ndarray
+    red_x: np.ndarray
+    red_y: np.ndarray
+    red_baseline: np.ndarray
+    red_height: np.ndarray
+
+    @property
+    def delta_ep(self) -> np.ndarray:
+        """Separacja pików ΔEp = Ep,ox - Ep,red."""
+        return self.ox_x - self.red_x
+
+    @property
+    def e_half(self) -> np.ndarray:
+        """Potencjał półfali E1/2 w każdym cyklu."""
+        return (self.ox_x + self.red_x) / 2.0
+
+    def columns(self) -> dict:
+        """Zwraca kolumny szeregów czasowych do eksportu (columnar_export)."""
+        return {
+            'cycle': self.cycle,
+            'Ep_ox': self.ox_x, 'Ip_ox': self.ox_y, 'baseline_ox': self.ox_baseline, 'H_ox': self.ox_height,
+            'Ep_red': self.red_x, 'Ip_red': self.red_y, 'baseline_red': self.red_baseline, 'D_red': self.red_height,
+            'delta_Ep': self.delta_ep, 'E_half': self.e_half,
+        }
+
+
+def _segment_peaks(x: np.ndarray, y: np.ndarray, starts: np.ndarray, baseline: dict,
+                   oxidation: bool, baseline_mode: str) -> tuple:
+    """
+    Wyznacza pik w zakresie linii bazowej w każdym segmencie (cyklu) bloku.
+
+    Parameters:
+        x, y (ndarray): Dane bloku cykli w kolejności pomiaru.
+        starts (ndarray): Początki cykli w bloku (pierwszy równy 0).
+        baseline (dict): Linia bazowa {'x1', 'y1', 'x2', 'y2'}; jej końce wyznaczają zakres.
+        oxidation (bool): True - maksimum, False - minimum.
+        baseline_mode (str): 'fixed' lub 'cycle' (patrz track_cycles).
+
+    Returns:
+        tuple: (x_peak, y_peak, baseline, height) - tablice o długości liczby cykli.
+    """
+    n = len(y)
+    lengths = np.diff(np.append(starts, n))
+    lo, hi = sorted((baseline['x1'], baseline['x2']))
+    in_region = (x >= lo) & (x <= hi)
+    rows = np.arange(n)
+    # Pierwszy i ostatni wiersz zakresu w każdym cyklu (brak wierszy: first > last)
+    first = np.minimum.reduceat(np.where(in_region, rows, n), starts)
+    last = np.maximum.reduceat(np.where(in_region, rows, -1), starts)
+    valid = first <= last
+
+    reduce, fill = (np.maximum, -np.inf) if oxidation else (np.minimum, np.inf)
+    masked = np.where(in_region, y, fill)
+    y_peak = reduce.reduceat(masked, starts)
+    # Położenie piku: pierwszy wiersz cyklu, w którym osiągnięto ekstremum
+    hit = masked == np.repeat(y_peak, lengths)
+    peak_row = np.minimum.reduceat(np.where(hit, rows, n), starts)
+    del masked, hit, rows, in_region
+
+    x_peak = np.full(len(starts), np.nan)
+    y_out = np.full(len(starts), np.nan)
+    base = np.full(len(starts), np.nan)
+    x_peak[valid] = x[peak_row[valid]]
+    y_out[valid] = y_peak[valid]
+    if baseline_mode == 'cycle':
+        # Linia przez wartości krzywej na końcach zakresu w danym cyklu
+        xa, xb = x[first[valid]], x[last[valid]]
+        ya, yb = y[first[valid]], y[last[valid]]
+        span = xb - xa
+        with np.errstate(invalid='ignore', divide='ignore'):
+            slope = np.where(span != 0, (yb - ya) / span, 0.0)
+        base[valid] = ya + slope * (x_peak[valid] - xa)
+    else:
+        base[valid] = baseline_at(baseline, x_peak[valid])
+    height = y_out - base if oxidation else base - y_out
+    return x_peak, y_out, base, height
+
+
+def track_cycles(x: np.ndarray, y1: np.ndarray, y2: np.ndarray, baseline_settings: dict,
+                 cycle: np.ndarray = None, baseline_mode: str = 'fixed',
+                 block_rows: int = CYCLE_BLOCK_ROWS) -> CycleTrends:
+    """
+    Oblicza parametry pików utleniania i redukcji w każdym cyklu pomiaru.
+
+    Parameters:
+        x, y1, y2 (ndarray): Dane w kolejności pomiaru (load_cycles).
+        baseline_settings (dict): Linie bazowe {'oxidation', 'reduction'} - zakresy pików
+            (jak w oknie głównym).
+        cycle (ndarray): Opcjonalne numery cykli (granice cykli); bez nich - powroty potencjału.
+        baseline_mode (str): 'fixed' - wspólna linia bazowa z ustawień;
+            'cycle' - linia przez wartości krzywej na końcach zakresu w każdym cyklu
+            (śledzi dryf prądu tła).
+        block_rows (int): Przybliżona liczba wierszy przetwarzanych jednym blokiem cykli.
+
+    Returns:
+        CycleTrends: Szeregi czasowe parametrów pików.
+    """
+    if baseline_mode not in BASELINE_MODES:
+        raise ValueError(f"Nieznany tryb linii bazowej: {baseline_mode}")
+    starts = cycle_starts(x, cycle)
+    n = len(x)
+    results = {key: [] for key in ('oxidation', 'reduction')}
+    with profiler.stage("track_cycles", n_points=n, n_cycles=len(starts)):
+        ends = np.append(starts[1:], n)
+        block_start = 0
+        while block_start < len(starts):
+            # Blok kolejnych całych cykli o łącznie ok. block_rows wierszach
+            limit = starts[block_start] + block_rows
+            block_end = max(int(np.searchsorted(ends, limit, side='right')), block_start + 1)
+            r0, r1 = starts[block_start], ends[block_end - 1]
+            local = starts[block_start:block_end] - r0
+            for key, y, oxidation in (('oxidation', y1, True), ('reduction', y2, False)):
+                results[key].append(_segment_peaks(x[r0:r1], y[r0:r1], local, baseline_settings[key],
+                                                   oxidation, baseline_mode))
+            block_start = block_end
+    return CycleTrends(np.arange(1, len(starts) + 1), *_join(results['oxidation']), *_join(results['reduction']))
+
+
+def _join(blocks: list) -> list:
+    """Łączy wyniki bloków (krotki tablic) w cztery tablice dla wszystkich cykli."""
+    if not blocks:
+        return [np.zeros(0)] * 4
+    return [np.concatenate(column) for column in zip(*blocks)]
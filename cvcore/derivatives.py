@@ -0,0 +1,77 @@
+"""
+Moduł cvcore/derivatives.py
+---------------------------
+Zawiera obliczanie pierwszych i drugich pochodnych krzywych (również
+w pojedynczym punkcie) oraz wyszukiwanie najbliższej próbki osi x.
+"""
+
+import numpy as np
+
+from cvcore.profiling import profiler
+
+
+def first_derivative(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Zwraca pierwszą pochodną dy/dx (różnice centralne, np.gradient)."""
+    with profiler.stage("gradient", n_points=len(y)):
+        return np.gradient(y, x)
+
+
+def second_derivative(x: np.ndarray, y: np.ndarray, first: np.ndarray = None) -> np.ndarray:
+    """
+    Zwraca drugą pochodną d2y/dx2 jako pochodną pierwszej pochodnej.
+
+    Parameters:
+        x (ndarray): Wartości osi x.
+        y (ndarray): Wartości krzywej.
+        first (ndarray): Opcjonalna, już obliczona pierwsza pochodna.
+    """
+    if first is None:
+        first = first_derivative(x, y)
+    with profiler.stage("gradient", n_points=len(first)):
+        return np.gradient(first, x)
+
+
+def nearest_index(x: np.ndarray, value: float) -> int:
+    """
+    Zwraca indeks próbki posortowanej rosnąco osi x najbliższej wartości value.
+    Wyszukiwanie binarne - koszt O(log n).
+
+    Parameters:
+        x (ndarray): Posortowane rosnąco wartości osi x.
+        value (float): Szukana wartość.
+
+    Returns:
+        int: Indeks najbliższej próbki.
+    """
+    i = int(np.searchsorted(x, value))
+    if i <= 0:
+        return 0
+    if i >= len(x):
+        return len(x) - 1
+    return i - 1 if value - x[i - 1] <= x[i] - value else i
+
+
+def derivatives_at(x: np.ndarray, y: np.ndarray, index: int) -> tuple[float, float]:
+    """
+    Oblicza pierwszą i drugą pochodną krzywej y w jednym punkcie.
+
+    Wynik jest identyczny z np.gradient(y, x)[index] oraz
+    np.gradient(np.gradient(y, x), x)[index], ale wymaga jedynie
+    lokalnego okna pięciu próbek zamiast całej tablicy.
+
+    Parameters:
+        x (ndarray): Wartości osi x.
+        y (ndarray): Wartości krzywej.
+        index (int): Indeks punktu.
+
+    Returns:
+        tuple: (pierwsza pochodna, druga pochodna); NaN, gdy próbek jest za mało.
+    """
+    lo = max(index - 2, 0)
+    hi = min(index + 3, len(x))
+    if hi - lo < 2:
+        return float('nan'), float('nan')
+    x_win = x[lo:hi]
+    d1 = np.gradient(y[lo:hi], x_win)
+    d2 = np.gradient(d1, x_win)
+    return float(d1[index - lo]), float(d2[index - lo])
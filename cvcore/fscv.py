@@ -0,0 +1,182 @@
+"""
+Moduł cvcore/fscv.py
+--------------------
+Zawiera obsługę szybkiej woltamperometrii cyklicznej (FSCV): nagrania jako
+macierz skany × próbki fali potencjału (np. 10 skanów/s przez kilka minut,
+czyli ok. 10^4 × 10^3), odejmowanie kroczącego tła oraz wyciąganie
+przebiegu prądu w czasie przy wybranym potencjale i woltamogramu
+z wybranej chwili.
+
+Macierz prądów nie jest kopiowana przy wczytaniu (.npy mapowane w pamięć).
+Tło (średnia poprzedzających skanów) liczone jest sumami skumulowanymi
+wzdłuż osi skanów, jednocześnie dla wszystkich próbek, blokami skanów, aby
+pamięć tymczasowa nie zależała od długości nagrania.
+"""
+
+import numpy as np
+
+from cvcore.profiling import profiler
+
+# Domyślna częstotliwość skanów [Hz]
+DEFAULT_SCAN_FREQUENCY = 10.0
+# Domyślna liczba poprzedzających skanów uśrednianych jako tło
+DEFAULT_BACKGROUND_SCANS = 10
+# Liczba skanów przetwarzanych jednym blokiem przy odejmowaniu tła
+FSCV_BLOCK_SCANS = 1024
+
+
+def load_fscv(file_name: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Wczytuje nagranie FSCV.
+
+    Obsługiwane formaty:
+        .npy - macierz skany × próbki, mapowana w pamięć (bez kopiowania);
+            oś potencjału to numery próbek fali;
+        plik tekstowy - pierwszy wiersz to potencjał kolejnych próbek fali,
+            każdy następny wiersz to jeden skan.
+
+    Parameters:
+        file_name (str): Ścieżka do pliku.
+
+    Returns:
+        tuple: (potencjał próbek fali, macierz prądów skany × próbki).
+    """
+    with profiler.stage("load_fscv") as stage:
+        if file_name.lower().endswith('.npy'):
+            currents = np.load(file_name, mmap_mode='r')
+            if currents.ndim != 2:
+                raise ValueError("Plik .npy musi zawierać macierz dwuwymiarową (skany × próbki).")
+            potential = np.arange(currents.shape[1], dtype=float)
+        else:
+            data = np.loadtxt(file_name, ndmin=2)
+            if len(data) < 2:
+                raise ValueError("Plik musi zawierać wiersz potencjału i co najmniej jeden skan.")
+            potential, currents = data[0], data[1:]
+        stage.set(n_points=currents.size)
+    return potential, currents
+
+
+def rolling_background(currents: np.ndarray, window: int = DEFAULT_BACKGROUND_SCANS,
+                       block_scans: int = FSCV_BLOCK_SCANS, dtype=np.float32) -> np.ndarray:
+    """
+    Odejmuje kroczące tło: od skanu i odejmowana jest średnia z `window`
+    poprzedzających skanów (pierwsze `window` skanów - średnia z początku
+    nagrania). Średnie wszystkich skanów bloku wyznaczane są jako różnice
+    sum skumulowanych wzdłuż osi skanów.
+
+    Parameters:
+        currents (ndarray): Macierz prądów skany × próbki (może być np.memmap).
+        window (int): Liczba skanów uśrednianych jako tło.
+        block_scans (int): Liczba skanów przetwarzanych jednym blokiem.
+        dtype: Typ wyniku (float32 wystarcza do wykresu barwnego i przebiegów).
+
+    Returns:
+        ndarray: Macierz prądów po odjęciu tła (skany × próbki).
+    """
+    n_scans, n_samples = currents.shape
+    window = int(min(max(window, 1), max(n_scans, 1)))
+    out = np.empty((n_scans, n_samples), dtype=dtype)
+    if n_scans == 0:
+        return out
+    with profiler.stage("fscv_background", n_points=currents.size, window=window):
+        initial = np.mean(currents[:window], axis=0, dtype=np.float64)
+        for start in range(0, n_scans, block_scans):
+            stop = min(start + block_scans, n_scans)
+            # Blok wraz z poprzedzającymi go skanami tła
+            first = max(start - window, 0)
+            chunk = np.asarray(currents[first:stop], dtype=np.float64)
+            cumulative = np.zeros((stop - first + 1, n_samples))
+            np.cumsum(chunk, axis=0, out=cumulative[1:])
+            rows = np.arange(start, stop)
+            late = rows[rows >= window]
+            background = np.empty((stop - start, n_samples))
+            background[:len(rows) - len(late)] = initial
+            background[len(rows) - len(late):] = cumulative[late - first] - cumulative[late - window - first]
+            background[len(rows) - len(late):] /= window
+            np.subtract(chunk[start - first:], background, out=out[start:stop], casting='same_kind')
+    return out
+
+
+class FSCVData:
+    """
+    Nagranie FSCV: potencjał próbek fali, macierz prądów skany × próbki
+    oraz macierz po odjęciu tła (liczona przy pierwszym użyciu dla danej
+    liczby skanów tła).
+    """
+
+    def __init__(self, potential: np.ndarray, currents: np.ndarray,
+                 scan_frequency: float = DEFAULT_SCAN_FREQUENCY):
+        """
+        Parameters:
+            potential (ndarray): Potencjał kolejnych próbek fali.
+            currents (ndarray): Macierz prądów skany × próbki.
+            scan_frequency (float): Częstotliwość skanów [Hz].
+        """
+        if currents.ndim != 2 or currents.shape[1] != len(potential):
+            raise ValueError("Liczba kolumn macierzy prądów musi odpowiadać liczbie próbek fali.")
+        self.potential = potential
+        self.currents = currents
+        self.scan_frequency = scan_frequency
+        self._subtracted = None
+        self._window = None
+
+    @property
+    def n_scans(self) -> int:
+        """Liczba skanów."""
+        return self.currents.shape[0]
+
+    @property
+    def n_samples(self) -> int:
+        """Liczba próbek fali potencjału w skanie."""
+        return self.currents.shape[1]
+
+    @property
+    def times(self) -> np.ndarray:
+        """Czas kolejnych skanów [s]."""
+        return np.arange(self.n_scans) / self.scan_frequency
+
+    def subtracted(self, window: int = DEFAULT_BACKGROUND_SCANS) -> np.ndarray:
+        """Zwraca macierz prądów po odjęciu kroczącego tła (z pamięci, jeśli okno się nie zmieniło)."""
+        if self._subtracted is None or self._window != window:
+            self._subtracted = rolling_background(self.currents, window)
+            self._window = window
+        return self._subtracted
+
+    def trace(self, sample: int, window: int = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Zwraca przebieg prądu w czasie przy wybranej próbce fali.
+
+        Parameters:
+            sample (int): Numer próbki fali (potencjał).
+            window (int): Liczba skanów tła; None - prąd bez odejmowania tła.
+        """
+        matrix = self.currents if window is None else self.subtracted(window)
+        return self.times, np.array(matrix[:, sample], dtype=float)
+
+    def voltammogram(self, scan: int, window: int = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Zwraca woltamogram (prąd w funkcji potencjału) wybranego skanu.
+
+        Parameters:
+            scan (int): Numer skanu (chwila nagrania).
+            window (int): Liczba skanów tła; None - prąd bez odejmowania tła.
+        """
+        matrix = self.currents if window is None else self.subtracted(window)
+        return self.potential, np.array(matrix[scan], dtype=float)
+
+    def scan_at(self, time: float) -> int:
+        """Numer skanu najbliższego podanej chwili [s]."""
+        return int(np.clip(round(time * self.scan_frequency), 0, self.n_scans - 1))
+
+    def color_levels(self, window: int = DEFAULT_BACKGROUND_SCANS, max_values: int = 1 << 20,
+                     percentile: float = 99.5) -> tuple[float, float]:
+        """
+        Wyznacza symetryczny zakres kolorów wykresu barwnego z próbki macierzy
+        (co k-ty skan), bez przeglądania całego nagrania.
+        """
+        matrix = self.subtracted(window)
+        step = max(1, matrix.size // max_values)
+        sample = np.abs(matrix[::step])
+        limit = float(np.percentile(sample, percentile)) if sample.size else 1.0
+        limit = limit or 1.0
+        return -limit, limit
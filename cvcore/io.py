@@ -0,0 +1,43 @@
+"""
+Moduł cvcore/io.py
+------------------
+Zawiera wczytywanie plików pomiarowych woltamogramu cyklicznego.
+"""
+
+import numpy as np
+
+from cvcore.profiling import profiler
+
+
+def load_cv(file_name: str, measurement_type: int = 0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Wczytuje plik tekstowy z trzema kolumnami (E, I_utlenianie, I_redukcja)
+    i zwraca dane posortowane rosnąco według E.
+
+    Zwracane tablice są widokami kolumn jednej wczytanej tablicy (bez kopii);
+    sortowanie odbywa się w miejscu, kolumna po kolumnie, więc szczyt pamięci
+    to dane plus jedna kolumna i indeksy sortowania.
+
+    Parameters:
+        file_name (str): Ścieżka do pliku tekstowego (lub obiekt plikowy, np. io.StringIO).
+        measurement_type (int): Typ pomiaru (0 - utlenianie, 1 - redukcja);
+            dla redukcji kolumny prądów są zamieniane miejscami.
+
+    Returns:
+        tuple: (x, y1, y2) - potencjał oraz prądy gałęzi utleniania i redukcji.
+    """
+    with profiler.stage("load_cv") as stage:
+        data = np.loadtxt(file_name)
+        stage.set(n_points=len(data))
+    x = data[:, 0]
+    if np.any(x[1:] < x[:-1]):
+        with profiler.stage("sort", n_points=len(x)):
+            idx_sort = np.argsort(x, kind='stable')
+            for k in range(data.shape[1]):
+                data[:, k] = data[idx_sort, k]
+            del idx_sort
+    if measurement_type == 0:
+        y1, y2 = data[:, 1], data[:, 2]
+    else:
+        y1, y2 = data[:, 2], data[:, 1]
+    return x, y1, y2
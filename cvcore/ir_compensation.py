@@ -0,0 +1,152 @@
+"""
+Moduł cvcore/ir_compensation.py
+-------------------------------
+Zawiera korekcję spadku omowego na nieskompensowanym oporze roztworu
+(E_corr = E - I·R_u) wykonywaną po pomiarze.
+
+Po korekcji każda gałąź ma własną oś potencjału, która nie musi być
+monotoniczna, więc wspólne, posortowane self.x nie wystarcza. Korekcja jest
+leniwym przekształceniem z pamięcią podręczną: dla danego R_u oś gałęzi
+liczona jest jednym mnożeniem z dodawaniem, a porządek sortowania osi
+(indeksy, przez które tworzone są posortowane widoki) dopiero wtedy, gdy
+jest potrzebny - do wyznaczenia piku sortowany jest tylko zakres linii
+bazowej. Zmiana R_u nie wymaga ponownego wczytania ani wygładzania danych.
+
+Jednostki jak w oknie głównym: E [mV], I [μA], R_u [Ω] (μA·Ω = μV).
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+from cvcore.peaks import PeakAnalysis, compute_peak_parameters, find_peak
+from cvcore.profiling import profiler
+
+# Przelicznik I·R_u [μA·Ω = μV] na jednostkę osi potencjału [mV]
+IR_UNIT = 1e-3
+# Liczba wartości R_u, dla których przechowywane są wyniki pików
+IR_CACHE_SIZE = 16
+# Liczba wartości R_u, dla których przechowywane są pełne osie gałęzi (2 tablice długości n każda)
+IR_AXES_CACHE_SIZE = 2
+
+
+class CorrectedBranch:
+    """
+    Gałąź woltamogramu na osi skorygowanej o spadek omowy.
+    Porządek sortowania i posortowane widoki liczone są przy pierwszym użyciu.
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, r_u: float):
+        """
+        Parameters:
+            x (ndarray): Zmierzony potencjał.
+            y (ndarray): Prąd gałęzi (zwykle wygładzony).
+            r_u (float): Nieskompensowany opór [Ω].
+        """
+        self.r_u = r_u
+        self.y = y
+        # E_corr = E - I·R_u
+        self.axis = np.multiply(y, -r_u * IR_UNIT)
+        self.axis += x
+        self._order = None
+        self._order_known = False
+
+    @property
+    def monotonic(self) -> bool:
+        """Czy skorygowana oś pozostała rosnąca (posortowane widoki nie wymagają wtedy kopii)."""
+        return bool(np.all(self.axis[1:] >= self.axis[:-1]))
+
+    @property
+    def order(self) -> np.ndarray:
+        """Indeksy sortujące skorygowaną oś (None, gdy oś jest już rosnąca)."""
+        if not self._order_known:
+            if not self.monotonic:
+                with profiler.stage("ir_sort", n_points=len(self.axis)):
+                    # Oś jest prawie posortowana - sortowanie stabilne wykorzystuje uporządkowane serie
+                    self._order = np.argsort(self.axis, kind='stable')
+            self._order_known = True
+        return self._order
+
+    def sorted_view(self) -> tuple[np.ndarray, np.ndarray]:
+        """Zwraca oś i prąd posortowane rosnąco według skorygowanego potencjału."""
+        order = self.order
+        if order is None:
+            return self.axis, self.y
+        return self.axis[order], self.y[order]
+
+    def find_peak(self, baseline: dict, oxidation: bool):
+        """
+        Wyszukuje pik w zakresie linii bazowej na skorygowanej osi. Sortowany
+        jest tylko zakres linii bazowej, a nie cała gałąź.
+        """
+        lo, hi = sorted((baseline['x1'], baseline['x2']))
+        rows = np.flatnonzero((self.axis >= lo) & (self.axis <= hi))
+        if len(rows) == 0:
+            return None
+        axis = self.axis[rows]
+        order = np.argsort(axis, kind='stable')
+        return find_peak(axis[order], self.y[rows[order]], baseline, oxidation=oxidation)
+
+
+class IRCompensation:
+    """
+    Leniwa korekcja iR dla jednego zestawu krzywych (x, y1, y2): osie gałęzi
+    i wyniki pików przechowywane są dla ostatnio używanych wartości R_u.
+    """
+
+    def __init__(self, x: np.ndarray, y1: np.ndarray, y2: np.ndarray, cache_size: int = IR_CACHE_SIZE,
+                 axes_cache_size: int = IR_AXES_CACHE_SIZE):
+        self.x, self.y1, self.y2 = x, y1, y2
+        self.cache_size = cache_size
+        self.axes_cache_size = axes_cache_size
+        self._branches = OrderedDict()
+        self._peaks = OrderedDict()
+
+    def matches(self, x: np.ndarray, y1: np.ndarray, y2: np.ndarray) -> bool:
+        """Czy korekcja dotyczy tych samych tablic (np. krzywe nie zostały przeliczone)."""
+        return self.x is x and self.y1 is y1 and self.y2 is y2
+
+    @staticmethod
+    def _remember(cache: OrderedDict, key, value, size: int):
+        """Dodaje wartość do pamięci podręcznej LRU o podanym rozmiarze."""
+        cache[key] = value
+        while len(cache) > size:
+            cache.popitem(last=False)
+        return value
+
+    def branches(self, r_u: float) -> tuple[CorrectedBranch, CorrectedBranch]:
+        """Zwraca gałęzie utleniania i redukcji na osiach skorygowanych o R_u."""
+        key = float(r_u)
+        branches = self._branches.get(key)
+        if branches is not None:
+            self._branches.move_to_end(key)
+            profiler.count("ir_cache_hit")
+            return branches
+        profiler.count("ir_cache_miss")
+        with profiler.stage("ir_axes", n_points=len(self.x)):
+            branches = (CorrectedBranch(self.x, self.y1, key), CorrectedBranch(self.x, self.y2, key))
+        return self._remember(self._branches, key, branches, self.axes_cache_size)
+
+    def peaks(self, r_u: float, baseline_settings: dict) -> PeakAnalysis:
+        """
+        Oblicza parametry pików na osiach skorygowanych o R_u (dla R_u = 0
+        wynik jest identyczny z compute_peak_parameters).
+
+        Parameters:
+            r_u (float): Nieskompensowany opór [Ω].
+            baseline_settings (dict): {'oxidation': {...}, 'reduction': {...}}; zakresy
+                linii bazowych odnoszą się do skorygowanego potencjału.
+        """
+        if not r_u:
+            return compute_peak_parameters(self.x, self.y1, self.y2, baseline_settings)
+        key = (float(r_u), tuple(tuple(sorted(baseline_settings[name].items()))
+                                 for name in ('oxidation', 'reduction')))
+        analysis = self._peaks.get(key)
+        if analysis is not None:
+            self._peaks.move_to_end(key)
+            return analysis
+        ox, red = self.branches(r_u)
+        with profiler.stage("ir_peaks", r_u=float(r_u)):
+            analysis = PeakAnalysis(oxidation=ox.find_peak(baseline_settings['oxidation'], oxidation=True),
+                                    reduction=red.find_peak(baseline_settings['reduction'], oxidation=False))
+        return self._remember(self._peaks, key, analysis, self.cache_size)
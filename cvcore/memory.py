@@ -0,0 +1,129 @@
+"""
+Moduł cvcore/memory.py
+----------------------
+Zawiera rozliczanie pamięci danych: raport tablic zbioru danych (rozmiar,
+widoki i współdzielone bufory liczone raz) oraz odczyt bieżącego i szczytowego
+RSS procesu. Widoki tej samej tablicy (np. kolumny wczytanego pliku) nie są
+sumowane wielokrotnie, a tablice odwzorowane z pliku (np.memmap, sesje
+otwarte z mmap) oznaczane są osobno, bo nie obciążają pamięci anonimowej.
+"""
+
+import mmap
+import os
+import sys
+
+import numpy as np
+
+
+def buffer_owner(array: np.ndarray):
+    """
+    Zwraca obiekt będący właścicielem bufora tablicy (koniec łańcucha .base):
+    tablicę NumPy, obiekt mmap lub inny obiekt udostępniający bufor.
+    """
+    owner = array
+    while isinstance(owner, np.ndarray) and owner.base is not None:
+        owner = owner.base
+    return owner
+
+
+def _owner_nbytes(owner) -> int:
+    """Rozmiar bufora właściciela w bajtach."""
+    if isinstance(owner, np.ndarray):
+        return owner.nbytes
+    try:
+        return memoryview(owner).nbytes
+    except TypeError:
+        return len(owner) if hasattr(owner, '__len__') else 0
+
+
+def _is_mapped(array: np.ndarray, owner) -> bool:
+    """Czy dane tablicy pochodzą z pliku odwzorowanego w pamięci."""
+    return isinstance(array, np.memmap) or isinstance(owner, mmap.mmap)
+
+
+def readonly(*arrays: np.ndarray) -> tuple:
+    """
+    Oznacza tablice jako tylko do odczytu (w miejscu, bez kopiowania), aby
+    można je było bezpiecznie współdzielić między krzywymi, wykresem i eksportem.
+
+    Returns:
+        tuple: Te same tablice.
+    """
+    for array in arrays:
+        if array is not None:
+            array.flags.writeable = False
+    return arrays
+
+
+def dataset_report(arrays: dict) -> list[dict]:
+    """
+    Opisuje zużycie pamięci przez tablice zbioru danych.
+
+    Parameters:
+        arrays (dict): Nazwa -> tablica (wartości None są pomijane).
+
+    Returns:
+        list: Dla każdej tablicy słownik z kluczami: name, shape, dtype, nbytes
+        (rozmiar widoku), owned_bytes (bajty bufora przypisane tej tablicy -
+        bufor współdzielony liczony jest przy pierwszej tablicy), shared_with
+        (nazwa tablicy, z którą bufor jest współdzielony), view (czy to widok),
+        mapped (czy dane są odwzorowane z pliku).
+    """
+    report = []
+    first_user = {}
+    for name, array in arrays.items():
+        if array is None:
+            continue
+        array = np.asarray(array)
+        owner = buffer_owner(array)
+        key = id(owner)
+        shared_with = first_user.get(key)
+        if shared_with is None:
+            first_user[key] = name
+        report.append({
+            'name': name,
+            'shape': array.shape,
+            'dtype': str(array.dtype),
+            'nbytes': array.nbytes,
+            'owned_bytes': _owner_nbytes(owner) if shared_with is None else 0,
+            'shared_with': shared_with or "",
+            'view': owner is not array,
+            'mapped': _is_mapped(array, owner),
+        })
+    return report
+
+
+def dataset_nbytes(arrays: dict, include_mapped: bool = False) -> int:
+    """Zwraca łączny rozmiar unikalnych buforów tablic (domyślnie bez odwzorowanych z pliku)."""
+    return sum(row['owned_bytes'] for row in dataset_report(arrays)
+               if include_mapped or not row['mapped'])
+
+
+def current_rss() -> int:
+    """Zwraca bieżący RSS procesu w bajtach (None, gdy nie da się go odczytać)."""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+def peak_rss() -> int:
+    """Zwraca szczytowy RSS procesu w bajtach (None, gdy nie da się go odczytać)."""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux podaje kilobajty, macOS bajty
+    return peak if sys.platform == 'darwin' else peak * 1024
@@ -0,0 +1,110 @@
+"""
+Moduł cvcore/peaks.py
+---------------------
+Zawiera wyznaczanie parametrów pików (położenie, wartość, linia bazowa,
+wysokość/głębokość) oraz potencjału półfali E1/2.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from cvcore.baseline import baseline_at
+from cvcore.profiling import profiled
+
+
+@dataclass(frozen=True)
+class PeakResult:
+    """
+    Parametry jednego piku.
+
+    Atrybuty:
+        x_peak, y_peak: Położenie i wartość piku.
+        baseline: Wartość linii bazowej w x_peak.
+        height: Wysokość (utlenianie) lub głębokość (redukcja) piku względem linii bazowej.
+        x_region: Wartości x w zakresie linii bazowej.
+        height_curve: Krzywa minus linia bazowa w zakresie linii bazowej.
+    """
+    x_peak: float
+    y_peak: float
+    baseline: float
+    height: float
+    x_region: np.ndarray
+    height_curve: np.ndarray
+
+
+@dataclass(frozen=True)
+class PeakAnalysis:
+    """Wyniki analizy pików obu gałęzi; brak piku w zakresie oznacza None."""
+    oxidation: Optional[PeakResult]
+    reduction: Optional[PeakResult]
+
+    @property
+    def e_half(self) -> Optional[float]:
+        """Potencjał półfali E1/2 (średnia położeń pików) lub None."""
+        if self.oxidation is None or self.reduction is None:
+            return None
+        return (self.oxidation.x_peak + self.reduction.x_peak) / 2.0
+
+
+def find_peak(x: np.ndarray, y: np.ndarray, baseline: dict, oxidation: bool = True) -> Optional[PeakResult]:
+    """
+    Wyszukuje pik krzywej w zakresie linii bazowej. Zakres wyznaczany jest
+    wyszukiwaniem binarnym w posortowanej osi x, więc x_region jest widokiem
+    (bez kopii danych).
+
+    Parameters:
+        x (ndarray): Wartości osi x (posortowane rosnąco).
+        y (ndarray): Wartości krzywej.
+        baseline (dict): Linia bazowa {'x1', 'y1', 'x2', 'y2'}; jej końce wyznaczają zakres.
+        oxidation (bool): True - szukane maksimum (utlenianie), False - minimum (redukcja).
+
+    Returns:
+        PeakResult | None: Parametry piku lub None, gdy w zakresie nie ma danych.
+    """
+    region_min = min(baseline['x1'], baseline['x2'])
+    region_max = max(baseline['x1'], baseline['x2'])
+    i0 = int(np.searchsorted(x, region_min, side='left'))
+    i1 = int(np.searchsorted(x, region_max, side='right'))
+    if i1 <= i0:
+        return None
+    x_region = x[i0:i1]
+    y_region = y[i0:i1]
+    idx_peak = np.argmax(y_region) if oxidation else np.argmin(y_region)
+    x_peak = x_region[idx_peak]
+    y_peak = y_region[idx_peak]
+    baseline_val = baseline_at(baseline, x_peak)
+    height = y_peak - baseline_val if oxidation else baseline_val - y_peak
+    # Krzywa wysokości liczona w miejscu na tablicy wartości linii bazowej
+    height_curve = baseline_at(baseline, x_region)
+    np.subtract(y_region, height_curve, out=height_curve)
+    return PeakResult(
+        x_peak=float(x_peak),
+        y_peak=float(y_peak),
+        baseline=float(baseline_val),
+        height=float(height),
+        x_region=x_region,
+        height_curve=height_curve,
+    )
+
+
+@profiled("peaks")
+def compute_peak_parameters(x: np.ndarray, y1: np.ndarray, y2: np.ndarray,
+                            baseline_settings: dict) -> PeakAnalysis:
+    """
+    Oblicza parametry pików utleniania (maksimum y1) i redukcji (minimum y2).
+
+    Parameters:
+        x (ndarray): Wartości osi x.
+        y1 (ndarray): Prąd gałęzi utleniania.
+        y2 (ndarray): Prąd gałęzi redukcji.
+        baseline_settings (dict): {'oxidation': {...}, 'reduction': {...}}.
+
+    Returns:
+        PeakAnalysis: Wyniki obu gałęzi oraz E1/2.
+    """
+    return PeakAnalysis(
+        oxidation=find_peak(x, y1, baseline_settings['oxidation'], oxidation=True),
+        reduction=find_peak(x, y2, baseline_settings['reduction'], oxidation=False),
+    )
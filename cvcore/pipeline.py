@@ -0,0 +1,119 @@
+"""
+Moduł cvcore/pipeline.py
+------------------------
+Zawiera pełną analizę woltamogramu w jednym wywołaniu: wygładzanie,
+linie bazowe, parametry pików, E1/2 i (opcjonalnie) pochodne - w tej samej
+kolejności i z tymi samymi ustawieniami co okno główne programu.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from cvcore.io import load_cv
+from cvcore.smoothing import apply_smoothing_pair
+from cvcore.baseline import default_baseline_settings
+from cvcore.peaks import PeakAnalysis, compute_peak_parameters
+from cvcore.derivatives import first_derivative, second_derivative
+from cvcore.ir_compensation import IRCompensation
+
+
+@dataclass(frozen=True)
+class AnalysisResult:
+    """Dane i wyniki analizy jednego woltamogramu."""
+    x: np.ndarray
+    raw_y1: np.ndarray
+    raw_y2: np.ndarray
+    y1: np.ndarray
+    y2: np.ndarray
+    baseline_settings: dict
+    peaks: PeakAnalysis
+    deriv_y1: Optional[np.ndarray] = None
+    deriv_y2: Optional[np.ndarray] = None
+    second_deriv_y1: Optional[np.ndarray] = None
+    second_deriv_y2: Optional[np.ndarray] = None
+
+    def result_rows(self) -> list[list]:
+        """
+        Zwraca wiersze wyników w układzie tabeli okna głównego
+        (Typ, x_peak, y_peak, Baseline, H/D); brak wartości to NaN.
+        """
+        rows = []
+        for name, peak in (("Utlenienie", self.peaks.oxidation), ("Redukcja", self.peaks.reduction)):
+            if peak is not None:
+                rows.append([name, peak.x_peak, peak.y_peak, peak.baseline, peak.height])
+        if self.peaks.e_half is not None:
+            rows.append(["E1/2", self.peaks.e_half, np.nan, np.nan, np.nan])
+        return rows
+
+    def summary(self) -> dict:
+        """Zwraca wyniki w postaci możliwej do zapisania jako JSON (NaN -> None)."""
+        def peak_dict(peak):
+            if peak is None:
+                return None
+            return {'x_peak': peak.x_peak, 'y_peak': peak.y_peak,
+                    'baseline': peak.baseline, 'height': peak.height}
+        return {
+            'n_points': int(len(self.x)),
+            'oxidation': peak_dict(self.peaks.oxidation),
+            'reduction': peak_dict(self.peaks.reduction),
+            'e_half': self.peaks.e_half,
+            'baseline_settings': {key: {k: float(v) for k, v in values.items()}
+                                  for key, values in self.baseline_settings.items()},
+        }
+
+
+def analyze(x: np.ndarray, raw_y1: np.ndarray, raw_y2: np.ndarray,
+            smoothing: dict = None, baseline_settings: dict = None,
+            derivatives: bool = False, r_u: float = 0.0) -> AnalysisResult:
+    """
+    Wykonuje analizę woltamogramu.
+
+    Parameters:
+        x (ndarray): Potencjał (posortowany rosnąco).
+        raw_y1 (ndarray): Prąd gałęzi utleniania.
+        raw_y2 (ndarray): Prąd gałęzi redukcji.
+        smoothing (dict): Ustawienia wygładzania {'enabled', 'window_length', 'polyorder'}
+            (oraz opcjonalnie 'method' i parametry filtra FFT - patrz apply_smoothing);
+            None lub enabled=False oznacza brak wygładzania.
+        baseline_settings (dict): Linie bazowe {'oxidation', 'reduction'};
+            None oznacza domyślne linie bazowe jak w oknie głównym.
+        derivatives (bool): Czy obliczyć również pierwsze i drugie pochodne.
+        r_u (float): Nieskompensowany opór [Ω] - piki wyznaczane są na osiach
+            skorygowanych o spadek omowy (cvcore.ir_compensation); 0 - bez korekcji.
+
+    Returns:
+        AnalysisResult: Dane i wyniki analizy.
+    """
+    if smoothing and smoothing.get('enabled', True):
+        y1, y2 = apply_smoothing_pair(x, raw_y1, raw_y2, smoothing)
+    else:
+        y1, y2 = raw_y1, raw_y2
+    if baseline_settings is None:
+        baseline_settings = default_baseline_settings(x, y1, y2)
+    if r_u:
+        peaks = IRCompensation(x, y1, y2).peaks(r_u, baseline_settings)
+    else:
+        peaks = compute_peak_parameters(x, y1, y2, baseline_settings)
+    deriv = {}
+    if derivatives:
+        deriv['deriv_y1'] = first_derivative(x, y1)
+        deriv['deriv_y2'] = first_derivative(x, y2)
+        deriv['second_deriv_y1'] = second_derivative(x, y1, deriv['deriv_y1'])
+        deriv['second_deriv_y2'] = second_derivative(x, y2, deriv['deriv_y2'])
+    return AnalysisResult(x=x, raw_y1=raw_y1, raw_y2=raw_y2, y1=y1, y2=y2,
+                          baseline_settings=baseline_settings, peaks=peaks, **deriv)
+
+
+def analyze_file(file_name: str, measurement_type: int = 0, smoothing: dict = None,
+                 baseline_settings: dict = None, derivatives: bool = False, r_u: float = 0.0) -> AnalysisResult:
+    """
+    Wczytuje plik pomiarowy i wykonuje analizę (patrz analyze).
+
+    Parameters:
+        file_name (str): Ścieżka do pliku z trzema kolumnami (E, I_ox, I_red).
+        measurement_type (int): Typ pomiaru (0 - utlenianie, 1 - redukcja).
+    """
+    x, raw_y1, raw_y2 = load_cv(file_name, measurement_type)
+    return analyze(x, raw_y1, raw_y2, smoothing, baseline_settings, derivatives, r_u)
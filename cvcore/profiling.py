@@ -0,0 +1,270 @@
+"""
+Moduł cvcore/profiling.py
+-------------------------
+Zawiera lekki pomiar czasu etapów analizy i rysowania. Pomiar jest domyślnie
+wyłączony - wtedy `profiler.stage()` zwraca wspólny, pusty kontekst, a koszt
+instrumentacji to jedno sprawdzenie flagi.
+
+Pomiar włącza zmienna środowiskowa CVISION_PROFILE (np. CVISION_PROFILE=1)
+lub panel wydajności w oknie głównym. Jeśli wartością zmiennej jest ścieżka
+pliku .json, przy zakończeniu programu zapisywany jest do niej ślad w formacie
+Chrome Trace (chrome://tracing, https://ui.perfetto.dev).
+Zmienna CVISION_PROFILE_MEMORY=1 (lub przełącznik w panelu) dodaje do etapów
+zmianę bieżącego i szczytowego RSS procesu.
+
+Przykład:
+    from cvcore.profiling import profiler
+    with profiler.stage("savgol", n_points=len(y)):
+        ...
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+from cvcore.memory import current_rss, peak_rss
+
+PROFILE_ENV = "CVISION_PROFILE"
+PROFILE_MEMORY_ENV = "CVISION_PROFILE_MEMORY"
+# Liczba ostatnich wywołań etapu uwzględnianych w średniej kroczącej
+ROLLING_WINDOW = 50
+# Maksymalna liczba zdarzeń przechowywanych dla śladu (najstarsze są usuwane)
+MAX_EVENTS = 100_000
+
+
+class _NullStage:
+    """Pusty kontekst etapu używany przy wyłączonym pomiarze."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """Kontekst mierzący czas jednego wywołania etapu."""
+    __slots__ = ('profiler', 'name', 'args', 'start', 'rss', 'peak')
+
+    def __init__(self, profiler, name: str, args: dict):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+        self.start = 0
+        self.rss = self.peak = None
+
+    def __enter__(self):
+        if self.profiler.track_memory:
+            self.rss, self.peak = current_rss(), peak_rss()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter_ns() - self.start
+        memory = None
+        if self.rss is not None and self.peak is not None:
+            # Zmiana RSS po etapie oraz o ile etap podniósł szczyt RSS procesu
+            memory = (current_rss() - self.rss, peak_rss() - self.peak)
+        self.profiler.record(self.name, self.start, duration, self.args, memory)
+        return False
+
+    def set(self, **args):
+        """Dopisuje argumenty znane dopiero w trakcie etapu (np. liczbę wczytanych punktów)."""
+        self.args.update(args)
+
+
+class StageStats:
+    """Statystyki jednego etapu: ostatni czas, średnia krocząca, maksimum, suma."""
+    __slots__ = ('count', 'total_ns', 'last_ns', 'max_ns', 'rolling', 'args', 'memory')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.last_ns = 0
+        self.max_ns = 0
+        self.rolling = deque(maxlen=ROLLING_WINDOW)
+        self.args = {}
+        self.memory = None
+
+    def add(self, duration_ns: int, args: dict, memory: tuple = None):
+        self.count += 1
+        self.total_ns += duration_ns
+        self.last_ns = duration_ns
+        self.max_ns = max(self.max_ns, duration_ns)
+        self.rolling.append(duration_ns)
+        self.args = args
+        if memory is not None:
+            self.memory = memory
+
+    def as_dict(self) -> dict:
+        """Zwraca statystyki w milisekundach."""
+        return {
+            'count': self.count,
+            'last_ms': self.last_ns / 1e6,
+            'rolling_ms': sum(self.rolling) / len(self.rolling) / 1e6 if self.rolling else 0.0,
+            'max_ms': self.max_ns / 1e6,
+            'total_ms': self.total_ns / 1e6,
+            'args': dict(self.args),
+            'rss_delta_mb': self.memory[0] / 2 ** 20 if self.memory else None,
+            'peak_delta_mb': self.memory[1] / 2 ** 20 if self.memory else None,
+        }
+
+
+class Profiler:
+    """
+    Rejestr czasów etapów, liczników (np. trafień pamięci podręcznej)
+    i zdarzeń śladu. Bezpieczny dla wielu wątków (eksport działa w tle).
+    """
+
+    def __init__(self, enabled: bool = False, max_events: int = MAX_EVENTS, track_memory: bool = False):
+        self.enabled = enabled
+        self.track_memory = track_memory
+        self._lock = threading.Lock()
+        self._origin_ns = time.perf_counter_ns()
+        self._stages = {}
+        self._counters = defaultdict(int)
+        self._events = deque(maxlen=max_events)
+        self._threads = {}
+
+    def stage(self, name: str, **args):
+        """
+        Zwraca kontekst mierzący czas etapu.
+
+        Parameters:
+            name (str): Nazwa etapu.
+            **args: Dodatkowe informacje (np. rozmiary tablic) zapisywane ze zdarzeniem.
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, args)
+
+    def record(self, name: str, start_ns: int, duration_ns: int, args: dict = None, memory: tuple = None):
+        """
+        Zapisuje zmierzone wywołanie etapu.
+
+        Parameters:
+            memory (tuple): Opcjonalnie (zmiana RSS, wzrost szczytu RSS) w bajtach.
+        """
+        args = args or {}
+        event_args = args
+        if memory is not None:
+            event_args = {**args, 'rss_delta_mb': round(memory[0] / 2 ** 20, 2),
+                          'peak_delta_mb': round(memory[1] / 2 ** 20, 2)}
+        thread = threading.current_thread()
+        with self._lock:
+            stats = self._stages.get(name)
+            if stats is None:
+                stats = self._stages[name] = StageStats()
+            stats.add(duration_ns, args, memory)
+            self._threads[thread.ident] = thread.name
+            self._events.append((name, start_ns, duration_ns, thread.ident, event_args))
+
+    def count(self, name: str, n: int = 1):
+        """Zwiększa licznik (np. trafień pamięci podręcznej), gdy pomiar jest włączony."""
+        if self.enabled:
+            with self._lock:
+                self._counters[name] += n
+
+    def stats(self) -> dict:
+        """Zwraca statystyki etapów: nazwa -> słownik (patrz StageStats.as_dict)."""
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in self._stages.items()}
+
+    def counters(self) -> dict:
+        """Zwraca bieżące wartości liczników."""
+        with self._lock:
+            return dict(self._counters)
+
+    def reset(self):
+        """Usuwa zebrane statystyki, liczniki i zdarzenia."""
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+            self._events.clear()
+            self._origin_ns = time.perf_counter_ns()
+
+    def chrome_trace(self) -> dict:
+        """
+        Zwraca ślad w formacie Chrome Trace Event (zdarzenia typu "X",
+        czasy w mikrosekundach) wraz ze statystykami etapów i licznikami.
+        """
+        pid = os.getpid()
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+            origin = self._origin_ns
+        trace = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                 for tid, name in threads.items()]
+        for name, start_ns, duration_ns, tid, args in events:
+            trace.append({
+                'name': name, 'cat': 'cvision', 'ph': 'X', 'pid': pid, 'tid': tid,
+                'ts': (start_ns - origin) / 1e3, 'dur': duration_ns / 1e3,
+                'args': {key: _json_value(value) for key, value in args.items()},
+            })
+        return {
+            'traceEvents': trace,
+            'displayTimeUnit': 'ms',
+            'otherData': {'stages': self.stats(), 'counters': self.counters()},
+        }
+
+    def export_trace(self, filename: str):
+        """Zapisuje ślad (chrome_trace) do pliku JSON."""
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False, default=_json_value)
+
+
+def _json_value(value):
+    """Zamienia wartości spoza JSON (np. typy NumPy) na liczby lub tekst."""
+    if isinstance(value, (bool, int, float, str)) or value is None:
+        return value
+    try:
+        return value.item()
+    except (AttributeError, ValueError):
+        return str(value)
+
+
+def profiled(name: str = None):
+    """
+    Dekorator mierzący czas wywołań funkcji jako etapu `name`
+    (domyślnie kwalifikowana nazwa funkcji).
+    Nie należy nim oznaczać slotów Qt podłączanych bezpośrednio do sygnałów
+    z argumentami - opakowanie przyjmuje *args, więc PyQt przekazałoby
+    argumenty sygnału; w slotach używa się `with profiler.stage(...)`.
+    """
+    def decorate(func):
+        stage_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            with _Stage(profiler, stage_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _profile_setting() -> tuple[bool, str]:
+    """Odczytuje zmienną CVISION_PROFILE: (czy włączyć pomiar, plik śladu zapisywany przy wyjściu)."""
+    value = os.environ.get(PROFILE_ENV, "").strip()
+    if value.lower() in ("", "0", "false", "no", "off"):
+        return False, ""
+    return True, value if value.lower().endswith(".json") else ""
+
+
+_enabled, _trace_file = _profile_setting()
+profiler = Profiler(enabled=_enabled,
+                    track_memory=os.environ.get(PROFILE_MEMORY_ENV, "").strip() not in ("", "0"))
+if _trace_file:
+    atexit.register(profiler.export_trace, _trace_file)
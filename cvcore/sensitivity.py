@@ -0,0 +1,240 @@
+"""
+Moduł cvcore/sensitivity.py
+---------------------------
+Zawiera analizę wrażliwości wyników pików na parametry filtru
+Savitzky'ego-Golaya: położenie i wysokość/głębokość pików oraz E1/2 na
+siatce par (długość okna, stopień wielomianu).
+
+Wszystkie warianty wygładzania liczone są jednym splotem wsadowym:
+współczynniki filtrów (savgol_coeffs) wszystkich par, wyśrodkowane
+i uzupełnione zerami do najdłuższego okna, tworzą macierz, przez którą
+mnożone są okna przesuwne krzywej (np.lib.stride_tricks.sliding_window_view
+bez kopiowania danych). Liczone są tylko wiersze w zakresach linii
+bazowych, a końce krzywej - dopasowaniem wielomianu jak w trybie 'interp'
+savgol_filter. Piki wszystkich wariantów wyznaczane są jednocześnie
+(argmax/argmin wzdłuż osi punktów), tak jak w compute_peak_parameters.
+
+Przy R_u > 0 piki wyznaczane są - jak w oknie głównym
+(cvcore.ir_compensation) - na osi E - I·R_u, liczonej osobno dla każdego
+wariantu wygładzania.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from cvcore.baseline import baseline_at
+from cvcore.ir_compensation import IR_UNIT
+from cvcore.profiling import profiler
+from cvcore.smoothing import effective_window
+
+# Liczba wierszy krzywej mnożonych jednym blokiem przez macierz filtrów
+SENSITIVITY_BLOCK_ROWS = 1 << 15
+# Domyślne tolerancje stabilności: położenie [mV] i względna wysokość [%]
+DEFAULT_POSITION_TOLERANCE = 1.0
+DEFAULT_HEIGHT_TOLERANCE = 2.0
+
+
+def filter_bank(pairs: list[tuple[int, int]]) -> np.ndarray:
+    """
+    Tworzy macierz współczynników filtrów Savitzky'ego-Golaya (wiersz na parę),
+    wyśrodkowanych i uzupełnionych zerami do najdłuższego okna.
+
+    Parameters:
+        pairs (list): Pary (długość okna - nieparzysta, stopień wielomianu).
+
+    Returns:
+        ndarray: Macierz (liczba par × najdłuższe okno) do iloczynu skalarnego z oknem krzywej.
+    """
+    from scipy.signal import savgol_coeffs  # import odroczony - SciPy ładuje się długo
+    width = max(window for window, _ in pairs)
+    bank = np.zeros((len(pairs), width))
+    for row, (window, polyorder) in enumerate(pairs):
+        offset = (width - window) // 2
+        bank[row, offset:offset + window] = savgol_coeffs(window, polyorder, use='dot')
+    return bank
+
+
+def smooth_bank(y: np.ndarray, pairs: list[tuple[int, int]], start: int = 0, stop: int = None,
+                block_rows: int = SENSITIVITY_BLOCK_ROWS) -> np.ndarray:
+    """
+    Wygładza wiersze [start, stop) krzywej wszystkimi filtrami z listy par
+    jednym splotem wsadowym (wynik jak savgol_filter w trybie 'interp').
+
+    Parameters:
+        y (ndarray): Wartości krzywej.
+        pairs (list): Pary (długość okna, stopień wielomianu); okna nie dłuższe niż krzywa.
+        start, stop (int): Zakres wierszy wyniku.
+        block_rows (int): Liczba wierszy mnożonych jednym blokiem.
+
+    Returns:
+        ndarray: Macierz (stop - start) × liczba par.
+    """
+    n = len(y)
+    stop = n if stop is None else stop
+    y = np.asarray(y, dtype=float)
+    bank = filter_bank(pairs)
+    half = bank.shape[1] // 2
+    # Zera na końcach: krótsze okna korzystają z wierszy, do których najdłuższe okno nie sięga
+    padded = np.concatenate((np.zeros(half), y, np.zeros(half)))
+    windows = np.lib.stride_tricks.sliding_window_view(padded, bank.shape[1])
+    out = np.empty((stop - start, len(pairs)))
+    for block in range(start, stop, block_rows):
+        end = min(block + block_rows, stop)
+        np.matmul(windows[block:end], bank.T, out=out[block - start:end - start])
+    # Końce krzywej: wartości wielomianu dopasowanego do pierwszego/ostatniego okna (tryb 'interp');
+    # jedno dopasowanie obu końców na parę, wszystkie wiersze końca liczone jednym iloczynem
+    for column, (window, polyorder) in enumerate(pairs):
+        edge = window // 2
+        head = np.arange(max(start, 0), min(stop, edge))
+        tail = np.arange(max(start, n - edge), stop)
+        if not head.size and not tail.size:
+            continue
+        # Położenia w oknie przeskalowane do [-1, 1] (dobre uwarunkowanie macierzy Vandermonde'a)
+        t = np.linspace(-1.0, 1.0, window)
+        powers = np.arange(polyorder + 1)
+        coefficients = np.linalg.lstsq(t[:, None] ** powers, np.column_stack((y[:window], y[n - window:])),
+                                       rcond=None)[0]
+        if head.size:
+            out[head - start, column] = (t[head, None] ** powers) @ coefficients[:, 0]
+        if tail.size:
+            out[tail - start, column] = (t[tail - (n - window), None] ** powers) @ coefficients[:, 1]
+    return out
+
+
+@dataclass(frozen=True)
+class SensitivityGrid:
+    """
+    Wyniki pików na siatce parametrów filtru; tablice mają kształt
+    (liczba stopni × liczba okien), NaN - para niedozwolona (stopień ≥ okno)
+    lub brak danych w zakresie.
+
+    Atrybuty:
+        windows: Długości okien (kolumny siatki).
+        polyorders: Stopnie wielomianu (wiersze siatki).
+        ox_x, ox_height: Położenie i wysokość piku utleniania.
+        red_x, red_height: Położenie i głębokość piku redukcji.
+    """
+    windows: np.ndarray
+    polyorders: np.ndarray
+    ox_x: np.ndarray
+    ox_height: np.ndarray
+    red_x: np.ndarray
+    red_height: np.ndarray
+
+    @property
+    def e_half(self) -> np.ndarray:
+        """Potencjał półfali E1/2 dla każdej pary parametrów."""
+        return (self.ox_x + self.red_x) / 2.0
+
+    def quantities(self) -> dict:
+        """Zwraca nazwy i siatki wyników (kolejność jak na wykresach)."""
+        return {'Ep_ox': self.ox_x, 'H_ox': self.ox_height, 'E_half': self.e_half,
+                'Ep_red': self.red_x, 'D_red': self.red_height}
+
+
+def local_variation(values: np.ndarray) -> np.ndarray:
+    """
+    Największa bezwzględna różnica wartości komórki i jej sąsiadów
+    (w poziomie i w pionie) na siatce; NaN są pomijane.
+    """
+    variation = np.zeros(values.shape)
+    for axis in (0, 1):
+        diff = np.abs(np.diff(values, axis=axis))
+        diff = np.where(np.isfinite(diff), diff, 0.0)
+        before = [(0, 0)] * 2
+        after = [(0, 0)] * 2
+        before[axis] = (1, 0)
+        after[axis] = (0, 1)
+        variation = np.maximum(variation, np.pad(diff, before))
+        variation = np.maximum(variation, np.pad(diff, after))
+    variation[~np.isfinite(values)] = np.nan
+    return variation
+
+
+def stable_mask(values: np.ndarray, tolerance: float, relative: bool = False) -> np.ndarray:
+    """
+    Wyznacza obszar stabilny: komórki, których wartość różni się od sąsiadów
+    nie więcej niż o tolerancję.
+
+    Parameters:
+        values (ndarray): Siatka wyników.
+        tolerance (float): Tolerancja bezwzględna lub - gdy relative - w procentach mediany siatki.
+        relative (bool): Czy tolerancja jest względna.
+    """
+    if relative:
+        finite = values[np.isfinite(values)]
+        tolerance = tolerance / 100.0 * (abs(float(np.median(finite))) if finite.size else 0.0)
+    with np.errstate(invalid='ignore'):
+        return local_variation(values) <= tolerance
+
+
+def _grid_peaks(x: np.ndarray, y: np.ndarray, baseline: dict, pairs: list, oxidation: bool,
+                r_u: float = 0.0) -> tuple:
+    """
+    Wyznacza pik w zakresie linii bazowej dla wszystkich wariantów wygładzania
+    naraz; przy r_u > 0 zakres i położenie piku odnoszą się do osi E - I·R_u.
+    """
+    lo, hi = sorted((baseline['x1'], baseline['x2']))
+    empty = np.full(len(pairs), np.nan)
+    if not pairs:
+        return empty, empty.copy()
+    # Przy korekcji iR liczone są także wiersze, które po przesunięciu o I·R_u mogą trafić do zakresu:
+    # |wygładzony prąd| ≤ max|y| · suma |współczynników| (zapas 2x na dopasowania na końcach krzywej)
+    margin = 0.0
+    if r_u:
+        gain = float(np.abs(filter_bank(pairs)).sum(axis=1).max())
+        margin = 2.0 * abs(r_u) * IR_UNIT * float(np.max(np.abs(y))) * gain
+    i0 = int(np.searchsorted(x, lo - margin, side='left'))
+    i1 = int(np.searchsorted(x, hi + margin, side='right'))
+    if i1 <= i0:
+        return empty, empty.copy()
+    smoothed = smooth_bank(y, pairs, i0, i1)
+    columns = np.arange(len(pairs))
+    if not r_u:
+        rows = np.argmax(smoothed, axis=0) if oxidation else np.argmin(smoothed, axis=0)
+        x_peak = x[i0 + rows]
+    else:
+        # E_corr = E - I·R_u dla każdego wariantu; poza zakresem wartości zastępowane są ±inf
+        axis = x[i0:i1, None] - smoothed * (r_u * IR_UNIT)
+        inside = (axis >= lo) & (axis <= hi)
+        masked = np.where(inside, smoothed, -np.inf if oxidation else np.inf)
+        rows = np.argmax(masked, axis=0) if oxidation else np.argmin(masked, axis=0)
+        found = inside.any(axis=0)
+        x_peak = np.where(found, axis[rows, columns], np.nan)
+    y_peak = np.where(np.isfinite(x_peak), smoothed[rows, columns], np.nan)
+    base = baseline_at(baseline, x_peak)
+    return x_peak, (y_peak - base if oxidation else base - y_peak)
+
+
+def sensitivity_sweep(x: np.ndarray, y1: np.ndarray, y2: np.ndarray, baseline_settings: dict,
+                      windows, polyorders, r_u: float = 0.0) -> SensitivityGrid:
+    """
+    Oblicza parametry pików (jak compute_peak_parameters na krzywych
+    wygładzonych savgol_filter) dla wszystkich par (okno, stopień).
+
+    Parameters:
+        x (ndarray): Oś potencjału (posortowana rosnąco).
+        y1, y2 (ndarray): Niewygładzone gałęzie utleniania i redukcji.
+        baseline_settings (dict): Linie bazowe {'oxidation', 'reduction'} - zakresy pików.
+        windows (sequence): Długości okien (korygowane przez effective_window).
+        polyorders (sequence): Stopnie wielomianu.
+        r_u (float): Nieskompensowany opór [Ω]; przy r_u > 0 wyniki jak IRCompensation.peaks
+            na krzywych wygładzonych.
+
+    Returns:
+        SensitivityGrid: Siatki wyników (wiersze - stopnie, kolumny - okna).
+    """
+    windows = np.array(sorted({effective_window(int(w), len(x)) for w in windows}), dtype=int)
+    polyorders = np.array(sorted({int(p) for p in polyorders}), dtype=int)
+    cells = [(row, column) for row, p in enumerate(polyorders) for column, w in enumerate(windows) if p < w]
+    pairs = [(int(windows[column]), int(polyorders[row])) for row, column in cells]
+    grids = []
+    with profiler.stage("sensitivity_sweep", n_points=len(x), n_pairs=len(pairs)):
+        for y, key, oxidation in ((y1, 'oxidation', True), (y2, 'reduction', False)):
+            for values in _grid_peaks(x, y, baseline_settings[key], pairs, oxidation, r_u):
+                grid = np.full((len(polyorders), len(windows)), np.nan)
+                if cells:
+                    grid[tuple(np.array(cells).T)] = values
+                grids.append(grid)
+    return SensitivityGrid(windows, polyorders, *grids)
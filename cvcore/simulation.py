@@ -0,0 +1,311 @@
+"""
+Moduł cvcore/simulation.py
+--------------------------
+Zawiera cyfrową symulację teoretycznych woltamogramów cyklicznych
+(dyfuzja planarna, jeden etap przeniesienia n elektronów):
+
+    'nernst' - odwracalny (równowaga Nernsta na elektrodzie),
+    'bv'     - quasi-odwracalny (kinetyka Butlera-Volmera: k0, alfa),
+    'ec'     - jak 'bv' z następczą reakcją chemiczną I rzędu produktu (kc).
+
+Schemat: niejawny (Euler wstecz) na rozszerzającej się siatce przestrzennej.
+Macierz trójprzekątniowa węzłów wewnętrznych nie zmienia się w czasie, więc
+jest rozwiązywana jednokrotnie (scipy.linalg.solve_banded) do postaci
+propagatora; krok czasowy to jedno mnożenie macierzy oraz rozwiązanie
+układu 2x2 na powierzchni elektrody. Obliczenia są wektoryzowane względem
+wielu zestawów parametrów (k0, alfa, E0) naraz, co przyspiesza przeglądy
+parametrów i liczenie jakobianu przy dopasowaniu.
+
+Jednostki jak w programie: E [mV], I [μA]; D [cm²/s], k0 [cm/s],
+szybkość skanowania [mV/s], stężenie [mM], powierzchnia [cm²].
+"""
+
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from cvcore.profiling import profiled
+
+FARADAY = 96485.33212
+GAS_CONSTANT = 8.314462618
+MECHANISMS = ('nernst', 'bv', 'ec')
+# Współczynnik rozszerzania siatki i pierwszy krok przestrzenny (względem sqrt(D*dt))
+GRID_GAMMA = 1.12
+GRID_H0 = 0.3
+# Zasięg siatki w wielokrotnościach grubości warstwy dyfuzyjnej sqrt(D*t)
+GRID_EXTENT = 6.0
+# Maksymalna liczba punktów gałęzi symulowanej na siatce danych pomiarowych
+SIM_MAX_POINTS = 2000
+
+
+@dataclass(frozen=True)
+class SimulationParameters:
+    """Parametry symulacji woltamogramu."""
+    mechanism: str = 'bv'
+    E0: float = 0.0               # potencjał formalny [mV]
+    k0: float = 0.01              # standardowa stała szybkości [cm/s]
+    alpha: float = 0.5            # współczynnik przejścia
+    D: float = 1e-5               # współczynnik dyfuzji [cm²/s]
+    scan_rate: float = 100.0      # szybkość skanowania [mV/s]
+    n: int = 1                    # liczba elektronów
+    concentration: float = 1.0    # stężenie [mM]
+    area: float = 0.0707          # powierzchnia elektrody [cm²]
+    kc: float = 0.0               # stała szybkości reakcji następczej [1/s] (tylko 'ec')
+    temperature: float = 298.15   # temperatura [K]
+    oxidation_first: bool = True  # True: start od formy zredukowanej i skan w stronę dodatnią
+
+
+def expanding_grid(D: float, dt: float, t_total: float, gamma: float = GRID_GAMMA) -> np.ndarray:
+    """
+    Buduje rozszerzającą się siatkę przestrzenną x_i = h0 (gamma^i - 1) / (gamma - 1)
+    sięgającą GRID_EXTENT * sqrt(D * t_total) w głąb roztworu.
+
+    Returns:
+        ndarray: Położenia węzłów [cm], pierwszy węzeł na elektrodzie (x = 0).
+    """
+    h0 = GRID_H0 * np.sqrt(D * dt)
+    x_max = GRID_EXTENT * np.sqrt(D * t_total)
+    n_nodes = int(np.ceil(np.log(1 + x_max * (gamma - 1) / h0) / np.log(gamma)))
+    return h0 * (gamma ** np.arange(n_nodes + 1) - 1) / (gamma - 1)
+
+
+def _propagator(x: np.ndarray, D: float, dt: float, k_chem: float = 0.0):
+    """
+    Rozwiązuje jednokrotnie układ trójprzekątniowy kroku niejawnego dla węzłów
+    wewnętrznych: c_new = P c_old + g c_0 + h c_bulk.
+
+    Returns:
+        tuple: (P, g, h) - propagator oraz odpowiedzi na stężenie powierzchniowe i w głębi roztworu.
+    """
+    from scipy.linalg import solve_banded  # import odroczony - SciPy ładuje się długo
+    h_minus = np.diff(x)[:-1]
+    h_plus = np.diff(x)[1:]
+    lam_minus = 2 * D * dt / (h_minus * (h_minus + h_plus))
+    lam_plus = 2 * D * dt / (h_plus * (h_minus + h_plus))
+    m = len(lam_minus)
+    ab = np.zeros((3, m))
+    ab[0, 1:] = -lam_plus[:-1]
+    ab[1] = 1 + lam_minus + lam_plus + k_chem * dt
+    ab[2, :-1] = -lam_minus[1:]
+    P = solve_banded((1, 1), ab, np.eye(m))
+    return P, P[:, 0] * lam_minus[0], P[:, -1] * lam_plus[-1]
+
+
+def _as_batch(value, size: int) -> np.ndarray:
+    """Zwraca parametr jako tablicę (size,) - skalar jest powielany."""
+    return np.broadcast_to(np.asarray(value, dtype=float), (size,)).copy()
+
+
+@profiled("simulate")
+def simulate_cv_batch(E: np.ndarray, params: SimulationParameters, k0=None, alpha=None, E0=None):
+    """
+    Symuluje woltamogramy dla wielu zestawów parametrów kinetycznych naraz.
+
+    Parameters:
+        E (ndarray): Potencjały gałęzi [mV] (rosnąco, równe odstępy; skrajne wartości
+            wyznaczają zakres skanu).
+        params (SimulationParameters): Parametry wspólne dla wszystkich symulacji.
+        k0, alpha, E0 (array-like): Opcjonalne tablice parametrów (po jednym na symulację);
+            None oznacza wartość z params.
+
+    Returns:
+        tuple: (E, I_ox, I_red) - prądy gałęzi utleniania i redukcji [μA],
+            tablice o kształcie (len(E), liczba symulacji).
+    """
+    if params.mechanism not in MECHANISMS:
+        raise ValueError(f"Nieznany mechanizm: {params.mechanism}")
+    E = np.asarray(E, dtype=float)
+    n_points = len(E)
+    if n_points < 3:
+        raise ValueError("Symulacja wymaga co najmniej 3 punktów potencjału.")
+    sizes = [np.size(v) for v in (k0, alpha, E0) if v is not None]
+    batch = max(sizes) if sizes else 1
+    k0 = _as_batch(params.k0 if k0 is None else k0, batch)
+    alpha = _as_batch(params.alpha if alpha is None else alpha, batch)
+    E0 = _as_batch(params.E0 if E0 is None else E0, batch)
+
+    f = params.n * FARADAY / (GAS_CONSTANT * params.temperature) / 1000.0  # [1/mV]
+    D = params.D
+    dt = (E[-1] - E[0]) / (n_points - 1) / params.scan_rate
+    t_total = 2 * n_points * dt
+    x = expanding_grid(D, dt, t_total)
+
+    # Sekwencja potencjałów: skan do wierzchołka i z powrotem
+    if params.oxidation_first:
+        sequence = np.concatenate([E, E[::-1]])
+    else:
+        sequence = np.concatenate([E[::-1], E])
+
+    # Propagatory obu form; reakcja następcza zużywa produkt pierwszego skanu
+    k_chem = params.kc if params.mechanism == 'ec' else 0.0
+    P_R, g_R, h_R = _propagator(x, D, dt, k_chem if not params.oxidation_first else 0.0)
+    P_O, g_O, h_O = _propagator(x, D, dt, k_chem if params.oxidation_first else 0.0)
+    m = P_R.shape[0]
+    bulk_R, bulk_O = (1.0, 0.0) if params.oxidation_first else (0.0, 1.0)
+
+    # Gradient na elektrodzie (trzy węzły, siatka nierównomierna)
+    h1, h2 = x[1], x[2]
+    a0 = -(h1 + h2) / (h1 * h2)
+    a1 = h2 / (h1 * (h2 - h1))
+    a2 = -h1 / (h2 * (h2 - h1))
+    # grad = p * c_0 + q, gdzie q zależy liniowo od stanu z poprzedniego kroku
+    p_R = a0 + a1 * g_R[0] + a2 * g_R[1]
+    p_O = a0 + a1 * g_O[0] + a2 * g_O[1]
+
+    # Krok jako jedno mnożenie macierzy: stan rozszerzony o stałą 1 (wkład stężenia
+    # w głębi roztworu), a dodatkowe wiersze dają składniki q obu form
+    size = 2 * m + 1
+    step = np.zeros((size + 2, size))
+    step[:m, :m] = P_R
+    step[m:2 * m, m:2 * m] = P_O
+    step[:m, 2 * m] = h_R * bulk_R
+    step[m:2 * m, 2 * m] = h_O * bulk_O
+    step[2 * m, 2 * m] = 1.0
+    step[size, :m] = a1 * P_R[0] + a2 * P_R[1]
+    step[size, 2 * m] = (a1 * h_R[0] + a2 * h_R[1]) * bulk_R
+    step[size + 1, m:2 * m] = a1 * P_O[0] + a2 * P_O[1]
+    step[size + 1, 2 * m] = (a1 * h_O[0] + a2 * h_O[1]) * bulk_O
+    # Stężenia powierzchniowe dołączone do stanu: wiersze q po obliczeniu c_0
+    # zastępowane są przez c_0, a ich wkład do kolejnego kroku (g c_0) jest
+    # wliczony w ostatnie kolumny macierzy kroku
+    surface = np.zeros((size, 2))
+    surface[:m, 0] = g_R
+    surface[m:2 * m, 1] = g_O
+    step = np.hstack([step, step @ surface])
+
+    # Warunek na elektrodzie jest liniowy w (q_R, q_O): c_0 = L q. Współczynniki L
+    # dla wszystkich kroków i symulacji liczone są przed pętlą czasową.
+    eta = sequence[:, None] - E0[None, :]
+    if params.mechanism == 'nernst':
+        ratio = np.exp(f * eta)
+        L00 = -1.0 / (p_R + p_O * ratio)
+        L01 = L00
+        L10 = ratio * L00
+        L11 = L10
+    else:
+        k_f = k0 * np.exp((1 - alpha) * f * eta)
+        k_b = k0 * np.exp(-alpha * f * eta)
+        a11 = D * p_R - k_f
+        a22 = D * p_O - k_b
+        det = a11 * a22 - k_b * k_f
+        L00 = -D * a22 / det
+        L01 = D * k_b / det
+        L10 = D * k_f / det
+        L11 = -D * a11 / det
+
+    state = np.zeros((size + 2, batch))
+    state[:m] = bulk_R
+    state[m:2 * m] = bulk_O
+    state[2 * m] = 1.0
+    n_steps = len(sequence)
+    c0_hist = np.empty((n_steps, batch))
+    q_hist = np.empty((n_steps, batch))
+    for k in range(n_steps):
+        state = step @ state
+        q_R = state[size]
+        q_O = state[size + 1]
+        c0_R = L00[k] * q_R + L01[k] * q_O
+        c0_O = L10[k] * q_R + L11[k] * q_O
+        q_hist[k] = q_R
+        c0_hist[k] = state[size] = c0_R
+        state[size + 1] = c0_O
+    flux = D * (p_R * c0_hist + q_hist)
+
+    # Prąd anodowy dodatni; stężenia znormalizowane -> I [μA] = n F A C[mM] * strumień
+    current = params.n * FARADAY * params.area * params.concentration * flux
+    if params.oxidation_first:
+        i_ox, i_red = current[:n_points], current[n_points:][::-1]
+    else:
+        i_red, i_ox = current[:n_points][::-1], current[n_points:]
+    return E, i_ox, i_red
+
+
+def simulate_cv(E: np.ndarray, params: SimulationParameters):
+    """
+    Symuluje jeden woltamogram.
+
+    Parameters:
+        E (ndarray): Potencjały gałęzi [mV] (rosnąco, równe odstępy).
+        params (SimulationParameters): Parametry symulacji.
+
+    Returns:
+        tuple: (E, I_ox, I_red) - prądy gałęzi utleniania i redukcji [μA].
+    """
+    E, i_ox, i_red = simulate_cv_batch(E, params)
+    return E, i_ox[:, 0], i_red[:, 0]
+
+
+def simulate_on(x: np.ndarray, params: SimulationParameters, max_points: int = SIM_MAX_POINTS, **batch):
+    """
+    Symuluje woltamogram(y) na siatce potencjałów danych pomiarowych.
+    Symulacja biegnie na równomiernej siatce (najwyżej max_points punktów na gałąź),
+    a wynik jest interpolowany do x, gdy siatki się różnią.
+
+    Returns:
+        tuple: (I_ox, I_red) o kształcie (len(x), liczba symulacji).
+    """
+    x = np.asarray(x, dtype=float)
+    grid = np.linspace(x[0], x[-1], min(len(x), max_points))
+    _, i_ox, i_red = simulate_cv_batch(grid, params, **batch)
+    if len(grid) == len(x) and np.allclose(grid, x, rtol=0, atol=1e-9 * max(abs(x[-1] - x[0]), 1.0)):
+        return i_ox, i_red
+    i_ox = np.column_stack([np.interp(x, grid, col) for col in i_ox.T])
+    i_red = np.column_stack([np.interp(x, grid, col) for col in i_red.T])
+    return i_ox, i_red
+
+
+@profiled("fit_kinetics")
+def fit_kinetics(x: np.ndarray, i_ox: np.ndarray, i_red: np.ndarray, params: SimulationParameters,
+                 fit: tuple = ('k0', 'alpha')):
+    """
+    Dopasowuje parametry kinetyczne (k0, alfa, opcjonalnie E0) do zmierzonego
+    woltamogramu metodą najmniejszych kwadratów (scipy.optimize.least_squares).
+    Jakobian liczony jest jedną wsadową symulacją wszystkich przesunięć parametrów.
+
+    Parameters:
+        x (ndarray): Potencjał danych pomiarowych [mV] (rosnąco).
+        i_ox (ndarray): Prąd gałęzi utleniania [μA].
+        i_red (ndarray): Prąd gałęzi redukcji [μA].
+        params (SimulationParameters): Parametry początkowe i stałe.
+        fit (tuple): Dopasowywane parametry - podzbiór ('k0', 'alpha', 'E0').
+
+    Returns:
+        tuple: (dopasowane SimulationParameters, wynik least_squares).
+    """
+    from scipy.optimize import least_squares  # import odroczony - SciPy ładuje się długo
+    fit = tuple(name for name in ('k0', 'alpha', 'E0') if name in fit)
+    if not fit:
+        raise ValueError("Nie wybrano parametrów do dopasowania.")
+    measured = np.concatenate([i_ox, i_red])
+    # k0 dopasowywane w skali logarytmicznej
+    to_vector = {'k0': lambda p: np.log10(p.k0), 'alpha': lambda p: p.alpha, 'E0': lambda p: p.E0}
+    bounds_map = {'k0': (-8.0, 2.0), 'alpha': (0.05, 0.95), 'E0': (-np.inf, np.inf)}
+    theta0 = np.array([to_vector[name](params) for name in fit])
+    lower = np.array([bounds_map[name][0] for name in fit])
+    upper = np.array([bounds_map[name][1] for name in fit])
+    theta0 = np.clip(theta0, lower, upper)
+    steps = np.array([1e-3 if name != 'E0' else 1e-2 for name in fit])
+
+    def batch_residuals(thetas):
+        overrides = {}
+        for j, name in enumerate(fit):
+            overrides[name] = 10 ** thetas[:, j] if name == 'k0' else thetas[:, j]
+        sim_ox, sim_red = simulate_on(x, params, **overrides)
+        return np.vstack([sim_ox, sim_red]) - measured[:, None]
+
+    def residuals(theta):
+        return batch_residuals(theta[None, :])[:, 0]
+
+    def jacobian(theta):
+        # Przesunięcie w stronę wnętrza przedziału, aby nie wyjść poza ograniczenia
+        direction = np.where(theta + steps <= upper, 1.0, -1.0)
+        thetas = np.repeat(theta[None, :], len(fit) + 1, axis=0)
+        thetas[1:] += np.diag(direction * steps)
+        values = batch_residuals(thetas)
+        return (values[:, 1:] - values[:, :1]) / (direction * steps)
+
+    result = least_squares(residuals, theta0, jac=jacobian, bounds=(lower, upper))
+    fitted = {}
+    for j, name in enumerate(fit):
+        fitted[name] = float(10 ** result.x[j]) if name == 'k0' else float(result.x[j])
+    return replace(params, **fitted), result
@@ -0,0 +1,179 @@
+"""
+Moduł cvcore/smoothing.py
+-------------------------
+Zawiera wygładzanie krzywych filtrem Savitzky'ego-Golaya oraz wybór metody
+wygładzania na podstawie ustawień (Savitzky-Golay lub filtr FFT z modułu
+cvcore.spectrum). SciPy importowane jest dopiero przy pierwszym wygładzaniu.
+
+Długie krzywe dzielone są na fragmenty z zakładkami o szerokości połowy
+okna i wygładzane równolegle w puli wątków (splot w SciPy zwalnia GIL);
+gałęzie utleniania i redukcji liczone są jednocześnie. Wewnątrz fragmentu
+filtr jest zwykłym splotem, a krawędzie fragmentów leżą w odrzucanych
+zakładkach, więc wynik jest identyczny bit w bit z pojedynczym wywołaniem
+savgol_filter (także na końcach krzywej, gdzie działa tryb 'interp').
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from cvcore.profiling import profiler
+from cvcore.spectrum import DEFAULT_NOTCH_WIDTH, fourier_filter
+
+# Metody wygładzania: klucz 'method' ustawień wygładzania
+SMOOTHING_METHODS = ('savgol', 'fft')
+# Łączna liczba punktów, od której krzywe wygładzane są fragmentami w puli wątków
+PARALLEL_MIN_POINTS = 1 << 21
+# Docelowa liczba punktów fragmentu (bez zakładek)
+CHUNK_POINTS = 1 << 20
+
+_executor = None
+
+
+def smoothing_executor() -> ThreadPoolExecutor:
+    """Zwraca wspólną pulę wątków wygładzania (tworzoną przy pierwszym użyciu, wątek na rdzeń)."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="cvision-smooth")
+    return _executor
+
+
+def effective_window(window_length: int, n: int) -> int:
+    """
+    Dopasowuje długość okna filtru: musi być nieparzysta i nie większa niż
+    liczba próbek.
+
+    Parameters:
+        window_length (int): Żądana długość okna.
+        n (int): Liczba próbek krzywej.
+
+    Returns:
+        int: Długość okna stosowana przez filtr.
+    """
+    if window_length % 2 == 0:
+        window_length += 1
+    if window_length > n:
+        window_length = n if n % 2 == 1 else n - 1
+    return window_length
+
+
+def smooth(y: np.ndarray, window_length: int, polyorder: int, executor=None) -> np.ndarray:
+    """
+    Wygładza krzywą filtrem Savitzky'ego-Golaya.
+
+    Parameters:
+        y (ndarray): Wartości krzywej.
+        window_length (int): Długość okna (korygowana przez effective_window).
+        polyorder (int): Stopień wielomianu.
+        executor (Executor): Pula wątków dla długich krzywych (domyślnie smoothing_executor()).
+
+    Returns:
+        ndarray: Wygładzona krzywa.
+    """
+    return smooth_many([y], window_length, polyorder, executor)[0]
+
+
+def chunk_bounds(n: int, window_length: int, chunk_points: int = CHUNK_POINTS) -> list[tuple[int, int]]:
+    """
+    Dzieli n punktów na fragmenty o długości ok. chunk_points, nie krótsze
+    niż okno filtru.
+
+    Returns:
+        list: Pary (początek, koniec) kolejnych fragmentów.
+    """
+    n_chunks = max(1, min(-(-n // max(chunk_points, 1)), n // max(window_length, 1)))
+    edges = np.linspace(0, n, n_chunks + 1).astype(np.int64)
+    return list(zip(edges[:-1].tolist(), edges[1:].tolist()))
+
+
+def _smooth_chunk(y: np.ndarray, out: np.ndarray, start: int, stop: int, window_length: int, polyorder: int):
+    """Wygładza fragment [start, stop) z zakładkami o szerokości połowy okna i zapisuje go w out."""
+    from scipy.signal import savgol_filter
+    halo = window_length // 2
+    lo, hi = max(start - halo, 0), min(stop + halo, len(y))
+    out[start:stop] = savgol_filter(y[lo:hi], window_length, polyorder)[start - lo:stop - lo]
+
+
+def smooth_many(curves, window_length: int, polyorder: int, executor=None,
+                chunk_points: int = CHUNK_POINTS) -> list[np.ndarray]:
+    """
+    Wygładza kilka krzywych filtrem Savitzky'ego-Golaya. Długie krzywe
+    dzielone są na fragmenty z zakładkami, a fragmenty wszystkich krzywych
+    liczone są równolegle jako jedna lista zadań puli wątków.
+
+    Parameters:
+        curves (list): Krzywe do wygładzenia (np. gałąź utleniania i redukcji).
+        window_length (int): Długość okna (korygowana przez effective_window dla każdej krzywej).
+        polyorder (int): Stopień wielomianu.
+        executor (Executor): Pula wątków (domyślnie smoothing_executor(); na jednym rdzeniu
+            krzywe wygładzane są bez podziału).
+        chunk_points (int): Docelowa liczba punktów fragmentu.
+
+    Returns:
+        list: Wygładzone krzywe (identyczne z wynikiem pojedynczego savgol_filter).
+    """
+    from scipy.signal import savgol_filter  # import odroczony - SciPy ładuje się długo
+    total = sum(len(y) for y in curves)
+    if executor is None and (os.cpu_count() or 1) > 1:
+        executor = smoothing_executor()
+    if total < PARALLEL_MIN_POINTS or executor is None:
+        results = []
+        for y in curves:
+            window = effective_window(window_length, len(y))
+            with profiler.stage("savgol", n_points=len(y), window_length=window, polyorder=polyorder):
+                results.append(savgol_filter(y, window, polyorder))
+        return results
+    results, tasks = [], []
+    for y in curves:
+        window = effective_window(window_length, len(y))
+        # Typ wyniku jak w savgol_filter: float32 pozostaje float32, pozostałe - float64
+        out = np.empty(len(y), dtype=np.float32 if y.dtype == np.float32 else np.float64)
+        results.append(out)
+        tasks += [(y, out, start, stop, window) for start, stop in chunk_bounds(len(y), window, chunk_points)]
+    with profiler.stage("savgol_parallel", n_points=total, n_chunks=len(tasks)):
+        futures = [executor.submit(_smooth_chunk, y, out, start, stop, window, polyorder)
+                   for y, out, start, stop, window in tasks]
+        for future in futures:
+            future.result()
+    return results
+
+
+def apply_smoothing(x: np.ndarray, y: np.ndarray, smoothing: dict) -> np.ndarray:
+    """
+    Wygładza krzywą metodą wskazaną w ustawieniach.
+
+    Parameters:
+        x (ndarray): Oś potencjału (potrzebna filtrowi FFT).
+        y (ndarray): Wartości krzywej.
+        smoothing (dict): Ustawienia wygładzania: 'method' ('savgol' - domyślnie,
+            lub 'fft'), dla Savitzky'ego-Golaya 'window_length' i 'polyorder',
+            dla filtra FFT 'lowpass', 'notch', 'harmonics', 'notch_width'
+            i 'scan_rate' (patrz cvcore.spectrum.fourier_filter).
+
+    Returns:
+        ndarray: Wygładzona krzywa.
+    """
+    method = smoothing.get('method') or 'savgol'
+    if method == 'fft':
+        return fourier_filter(x, y, lowpass=smoothing.get('lowpass'), notch=smoothing.get('notch'),
+                              harmonics=int(smoothing.get('harmonics') or 1),
+                              notch_width=float(smoothing.get('notch_width') or DEFAULT_NOTCH_WIDTH),
+                              scan_rate=smoothing.get('scan_rate'))
+    if method != 'savgol':
+        raise ValueError(f"Nieznana metoda wygładzania: {method}")
+    return smooth(y, int(smoothing.get('window_length', 15)), int(smoothing.get('polyorder', 3)))
+
+
+def apply_smoothing_pair(x: np.ndarray, y1: np.ndarray, y2: np.ndarray, smoothing: dict) -> tuple:
+    """
+    Wygładza obie gałęzie metodą wskazaną w ustawieniach (patrz apply_smoothing).
+    Filtrem Savitzky'ego-Golaya gałęzie liczone są jednocześnie (smooth_many).
+
+    Returns:
+        tuple: (wygładzona gałąź utleniania, wygładzona gałąź redukcji).
+    """
+    if (smoothing.get('method') or 'savgol') == 'savgol':
+        y1, y2 = smooth_many([y1, y2], int(smoothing.get('window_length', 15)), int(smoothing.get('polyorder', 3)))
+        return y1, y2
+    return apply_smoothing(x, y1, smoothing), apply_smoothing(x, y2, smoothing)
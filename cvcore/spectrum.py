@@ -0,0 +1,207 @@
+"""
+Moduł cvcore/spectrum.py
+------------------------
+Zawiera analizę szumu w dziedzinie częstotliwości: widmo mocy prądu (rfft)
+oraz filtrowanie zerofazowe (filtr dolnoprzepustowy i filtry wycinające,
+np. przydźwięk sieci 50/60 Hz z harmonicznymi) jako alternatywę dla
+wygładzania Savitzky'ego-Golaya.
+
+Gałąź woltamogramu jest skanem monotonicznym, więc równomierna oś potencjału
+jest równomierną osią czasu: krok czasu to krok potencjału podzielony przez
+szybkość skanu. Przy podanej szybkości skanu [mV/s] częstotliwości wyrażone
+są w Hz, bez niej - w cyklach na mV.
+
+Filtr mnoży widmo przez rzeczywistą maskę, więc nie przesuwa fazy (nie
+przesuwa pików). Koszt to O(n log n): jedna transformata w przód i jedna
+odwrotna (SciPy importowane jest dopiero przy pierwszym użyciu).
+"""
+
+import numpy as np
+
+from cvcore.profiling import profiler
+
+# Częstotliwości sieci energetycznej [Hz]
+MAINS_FREQUENCIES = (50.0, 60.0)
+# Domyślna szerokość filtra wycinającego (w jednostkach częstotliwości)
+DEFAULT_NOTCH_WIDTH = 2.0
+# Szerokość pasma przejściowego filtra dolnoprzepustowego jako ułamek częstotliwości odcięcia
+LOWPASS_ROLLOFF = 0.2
+# Względna tolerancja kroku, przy której oś uznawana jest za równomierną
+UNIFORM_RTOL = 1e-3
+# Najmniejsza liczba punktów prostej dopasowywanej na każdym końcu krzywej przed filtrowaniem
+MIN_EDGE_POINTS = 8
+
+
+def sampling_step(x: np.ndarray, scan_rate: float = None) -> float:
+    """
+    Zwraca krok próbkowania: mediana kroku osi potencjału lub, przy podanej
+    szybkości skanu, krok czasu [s].
+
+    Parameters:
+        x (ndarray): Oś potencjału [mV] (posortowana).
+        scan_rate (float): Szybkość skanu [mV/s]; None - krok w mV.
+    """
+    if len(x) < 2:
+        raise ValueError("Za mało punktów do analizy widma.")
+    step = float(np.median(np.abs(np.diff(x))))
+    if step <= 0:
+        raise ValueError("Oś potencjału nie jest rosnąca - nie można wyznaczyć kroku próbkowania.")
+    return step / scan_rate if scan_rate else step
+
+
+def is_uniform(x: np.ndarray, rtol: float = UNIFORM_RTOL) -> bool:
+    """Czy próbki osi są rozmieszczone równomiernie (z tolerancją rtol)."""
+    if len(x) < 3:
+        return True
+    dx = np.diff(x)
+    step = np.median(dx)
+    return bool(np.all(np.abs(dx - step) <= rtol * abs(step)))
+
+
+def _uniform_samples(x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Zwraca próbki na równomiernej siatce (interpolacja liniowa tylko dla osi nierównomiernej)."""
+    if is_uniform(x):
+        return x, y
+    grid = np.linspace(x[0], x[-1], len(x))
+    return grid, np.interp(grid, x, y)
+
+
+def power_spectrum(x: np.ndarray, y: np.ndarray, scan_rate: float = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Oblicza jednostronną gęstość widmową mocy krzywej (okno Hanna, bez
+    składowej liniowej, aby trend prądu pojemnościowego nie przesłaniał szumu).
+
+    Parameters:
+        x (ndarray): Oś potencjału [mV] (posortowana rosnąco).
+        y (ndarray): Prąd.
+        scan_rate (float): Szybkość skanu [mV/s]; None - częstotliwości w cyklach/mV.
+
+    Returns:
+        tuple: (częstotliwości, gęstość widmowa mocy).
+    """
+    from scipy import fft  # import odroczony - SciPy ładuje się długo
+    x, y = _uniform_samples(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    n = len(y)
+    step = sampling_step(x, scan_rate)
+    with profiler.stage("power_spectrum", n_points=n):
+        # Usunięcie trendu liniowego wyznaczonego z końców krzywej (O(n), bez dopasowania)
+        trend = np.linspace(y[0], y[-1], n)
+        window = np.hanning(n)
+        spectrum = fft.rfft((y - trend) * window, workers=-1)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        power *= 2.0 * step / np.dot(window, window)
+        power[0] /= 2.0
+        if n % 2 == 0:
+            power[-1] /= 2.0
+        return fft.rfftfreq(n, step), power
+
+
+def dominant_frequencies(freq: np.ndarray, power: np.ndarray, count: int = 5) -> list[tuple[float, float]]:
+    """
+    Zwraca najsilniejsze lokalne maksima widma (bez składowej stałej).
+
+    Returns:
+        list: Pary (częstotliwość, moc) posortowane malejąco według mocy.
+    """
+    if len(power) < 3:
+        return []
+    inner = power[1:-1]
+    peaks = np.flatnonzero((inner > power[:-2]) & (inner >= power[2:])) + 1
+    peaks = peaks[np.argsort(power[peaks])[::-1][:count]]
+    return [(float(freq[i]), float(power[i])) for i in peaks]
+
+
+def frequency_mask(freq: np.ndarray, lowpass: float = None, notch: float = None, harmonics: int = 1,
+                   notch_width: float = DEFAULT_NOTCH_WIDTH) -> np.ndarray:
+    """
+    Zwraca rzeczywistą maskę widma (0..1) z łagodnymi (kosinusowymi) zboczami.
+
+    Parameters:
+        freq (ndarray): Częstotliwości prążków rfft.
+        lowpass (float): Częstotliwość odcięcia filtra dolnoprzepustowego; None - bez filtra.
+        notch (float): Częstotliwość podstawowa filtra wycinającego (np. 50 Hz); None - bez filtra.
+        harmonics (int): Liczba wycinanych harmonicznych (1 - tylko częstotliwość podstawowa).
+        notch_width (float): Szerokość pasma wycinanego wokół każdej harmonicznej.
+    """
+    mask = np.ones(len(freq))
+    if lowpass:
+        transition = np.clip((freq - lowpass) / (LOWPASS_ROLLOFF * lowpass), 0.0, 1.0)
+        mask *= 0.5 * (1.0 + np.cos(np.pi * transition))
+    if notch:
+        half_width = notch_width / 2.0
+        for k in range(1, max(int(harmonics), 1) + 1):
+            center = k * notch
+            if center - half_width > freq[-1]:
+                break
+            # Maska zmieniana jest tylko w wąskim pasie wokół harmonicznej
+            lo, hi = np.searchsorted(freq, (center - half_width, center + half_width))
+            distance = np.abs(freq[lo:hi] - center) / half_width
+            mask[lo:hi] *= 0.5 * (1.0 - np.cos(np.pi * distance))
+    return mask
+
+
+def _edge_trend(y: np.ndarray, points: int) -> np.ndarray:
+    """
+    Zwraca trend liniowy łączący końce krzywej, których wartości wyznaczane
+    są z prostych dopasowanych do pierwszych i ostatnich `points` punktów
+    (a nie z pojedynczych, zaszumionych próbek).
+
+    Parameters:
+        y (ndarray): Wartości krzywej.
+        points (int): Liczba punktów dopasowania na każdym końcu.
+    """
+    n = len(y)
+    points = int(min(max(points, 2), n))
+    t = np.arange(points, dtype=float)
+    start = np.polyval(np.polyfit(t, y[:points], 1), 0.0)
+    end = np.polyval(np.polyfit(t, y[n - points:], 1), points - 1.0)
+    return np.linspace(start, end, n)
+
+
+def fourier_filter(x: np.ndarray, y: np.ndarray, lowpass: float = None, notch: float = None,
+                   harmonics: int = 1, notch_width: float = DEFAULT_NOTCH_WIDTH,
+                   scan_rate: float = None) -> np.ndarray:
+    """
+    Filtruje krzywą w dziedzinie częstotliwości (filtr zerofazowy).
+
+    Przed transformatą od krzywej odejmowany jest trend liniowy łączący
+    końce krzywej wyznaczone prostymi dopasowanymi do punktów z jednego
+    okresu najniższej filtrowanej częstotliwości (_edge_trend), a reszta
+    przedłużana jest odbiciem nieparzystym względem zera aż do szybkiej
+    długości FFT (bez dopełniania zerami). Przefiltrowana reszta jest więc
+    na końcach bliska zeru, a krzywa - dopasowanej prostej, a nie
+    pojedynczym zaszumionym próbkom; przedłużenie nie wprowadza zafalowań
+    na brzegach. Trend dodawany jest z powrotem po filtrowaniu.
+
+    Parameters:
+        x (ndarray): Oś potencjału [mV] (posortowana rosnąco, równomierna).
+        y (ndarray): Prąd.
+        lowpass, notch, harmonics, notch_width: Patrz frequency_mask
+            (w Hz przy podanej szybkości skanu, inaczej w cyklach/mV).
+        scan_rate (float): Szybkość skanu [mV/s].
+
+    Returns:
+        ndarray: Przefiltrowana krzywa (ta sama długość co y).
+    """
+    from scipy import fft  # import odroczony - SciPy ładuje się długo
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n < 3 or not (lowpass or notch):
+        return y.copy()
+    step = sampling_step(x, scan_rate)
+    with profiler.stage("fourier_filter", n_points=n):
+        # Końce trendu z prostych dopasowanych do okresu najniższej filtrowanej częstotliwości
+        cutoff = min(f for f in (lowpass, notch) if f)
+        trend = _edge_trend(y, max(round(1.0 / (cutoff * step)), MIN_EDGE_POINTS))
+        residual = y - trend
+        size = fft.next_fast_len(n + 2 * max(n // 8, 16), real=True)
+        pad = (size - n) // 2
+        # Odbicie nieparzyste względem zera (nie względem skrajnej próbki, która zawiera szum)
+        padded = np.pad(residual, (pad, size - n - pad), mode='reflect')
+        padded[:pad] *= -1.0
+        padded[pad + n:] *= -1.0
+        spectrum = fft.rfft(padded, workers=-1)
+        spectrum *= frequency_mask(fft.rfftfreq(size, step), lowpass, notch, harmonics, notch_width)
+        filtered = fft.irfft(spectrum, size, workers=-1)[pad:pad + n]
+        filtered += trend
+        return filtered
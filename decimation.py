@@ -0,0 +1,206 @@
+"""
+Moduł decimation.py
+-------------------
+Zawiera decymację min/max zachowującą kształt krzywej (piki i szpilki)
+oraz piramidę poziomów szczegółowości (LOD) budowaną raz na krzywą.
+Moduł nie zależy od Qt, dzięki czemu może być używany także poza GUI.
+"""
+
+import numpy as np
+
+# Liczba próbek przetwarzanych naraz przy budowie pierwszego poziomu piramidy
+FIRST_LEVEL_BLOCK = 1 << 18
+
+
+def _reduce_minmax(y: np.ndarray,
+                   lo: np.ndarray,
+                   hi: np.ndarray,
+                   factor: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Łączy po `factor` sąsiednich kubełków w jeden, zachowując indeksy
+    minimum i maksimum wartości y w każdym nowym kubełku.
+
+    Parameters:
+        y (ndarray): Wartości krzywej.
+        lo (ndarray): Indeksy minimów kubełków poprzedniego poziomu.
+        hi (ndarray): Indeksy maksimów kubełków poprzedniego poziomu.
+        factor (int): Liczba łączonych kubełków.
+
+    Returns:
+        tuple: (lo, hi) - indeksy minimów i maksimów nowego poziomu.
+    """
+    pad = (-len(lo)) % factor
+    if pad:
+        # Ostatni, niepełny kubełek uzupełniamy powtórzeniem ostatniego indeksu
+        lo = np.concatenate([lo, np.repeat(lo[-1], pad)])
+        hi = np.concatenate([hi, np.repeat(hi[-1], pad)])
+    lo = lo.reshape(-1, factor)
+    hi = hi.reshape(-1, factor)
+    rows = np.arange(lo.shape[0])
+    new_lo = lo[rows, np.argmin(y[lo], axis=1)]
+    new_hi = hi[rows, np.argmax(y[hi], axis=1)]
+    return new_lo, new_hi
+
+
+def _first_level(y: np.ndarray, factor: int, dtype) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Wyznacza pierwszy poziom piramidy bezpośrednio z krzywej: argmin/argmax
+    w widoku (kubełki, factor), bez tablicy indeksów wszystkich próbek.
+    Krzywa przetwarzana jest blokami FIRST_LEVEL_BLOCK próbek, więc tymczasowe
+    kopie (np. gdy y jest kolumną wczytanej tablicy, a nie tablicą ciągłą)
+    nie zależą od długości danych. Wynik jest taki sam jak
+    _reduce_minmax(y, arange(n), arange(n), factor).
+    """
+    n = len(y)
+    n_buckets = -(-n // factor)
+    lo = np.empty(n_buckets, dtype=dtype)
+    hi = np.empty(n_buckets, dtype=dtype)
+    block = max(FIRST_LEVEL_BLOCK // factor, 1) * factor
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        full = stop - (stop - start) % factor
+        b0, b1 = start // factor, full // factor
+        if full > start:
+            rows = y[start:full].reshape(-1, factor)
+            starts = np.arange(start, full, factor, dtype=dtype)
+            np.add(np.argmin(rows, axis=1), starts, out=lo[b0:b1], casting='unsafe')
+            np.add(np.argmax(rows, axis=1), starts, out=hi[b0:b1], casting='unsafe')
+        if full < stop:
+            # Ostatni, niepełny kubełek
+            tail = y[full:stop]
+            lo[b1] = full + np.argmin(tail)
+            hi[b1] = full + np.argmax(tail)
+    return lo, hi
+
+
+def _interleave(lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """Zwraca indeksy min/max kolejnych kubełków ułożone w kolejności próbek."""
+    idx = np.empty(2 * len(lo), dtype=np.intp)
+    idx[0::2] = np.minimum(lo, hi)
+    idx[1::2] = np.maximum(lo, hi)
+    return idx
+
+
+def minmax_indices(curves: list[np.ndarray], n_buckets: int) -> np.ndarray:
+    """
+    Wyznacza indeksy próbek zachowujące kształt kilku krzywych o wspólnej osi x.
+
+    Dane dzielone są na `n_buckets` kubełków; z każdego kubełka brane są
+    indeksy minimum i maksimum każdej z krzywych. Wynik jest posortowany
+    i pozbawiony powtórzeń, więc może indeksować wspólną oś x.
+
+    Parameters:
+        curves (list): Lista krzywych (ndarray) o tej samej długości.
+        n_buckets (int): Liczba kubełków.
+
+    Returns:
+        ndarray: Posortowane indeksy wybranych próbek.
+    """
+    n = len(curves[0])
+    if n_buckets <= 0 or 2 * len(curves) * n_buckets >= n:
+        return np.arange(n)
+    factor = int(np.ceil(n / n_buckets))
+    base = np.arange(n)
+    picked = [np.array([0, n - 1])]
+    for y in curves:
+        lo, hi = _reduce_minmax(y, base, base, factor)
+        picked.append(lo)
+        picked.append(hi)
+    return np.unique(np.concatenate(picked))
+
+
+class MinMaxPyramid:
+    """
+    Piramida poziomów szczegółowości dla jednej krzywej.
+
+    Każdy poziom przechowuje indeksy minimum i maksimum w kubełkach o
+    rozmiarze factor**k, dzięki czemu zapytanie o widoczny zakres zwraca
+    liczbę punktów proporcjonalną do szerokości widoku w pikselach,
+    bez utraty pików i szpilek.
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, factor: int = 4):
+        """
+        Buduje piramidę dla krzywej (x, y).
+
+        Parameters:
+            x (ndarray): Wartości osi x (najlepiej posortowane rosnąco).
+            y (ndarray): Wartości krzywej.
+            factor (int): Krotność zmniejszania liczby kubełków między poziomami.
+        """
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        self.factor = factor
+        n = len(self.y)
+        self.is_sorted = n < 2 or bool(np.all(self.x[1:] >= self.x[:-1]))
+        self.levels: list[tuple[int, np.ndarray, np.ndarray]] = []
+        if n == 0:
+            self.x_bounds = (0.0, 0.0)
+            self.y_bounds = (0.0, 0.0)
+            return
+        # Indeksy 32-bitowe, gdy wystarczają - piramida zajmuje o połowę mniej pamięci
+        dtype = np.int32 if n < np.iinfo(np.int32).max else np.intp
+        if n > 1:
+            lo, hi = _first_level(self.y, factor, dtype)
+            bucket = factor
+            self.levels.append((bucket, lo, hi))
+            while len(lo) > 1:
+                lo, hi = _reduce_minmax(self.y, lo, hi, factor)
+                bucket *= factor
+                self.levels.append((bucket, lo, hi))
+        top_lo, top_hi = self.levels[-1][1:] if self.levels else (np.zeros(1, dtype), np.zeros(1, dtype))
+        self.y_bounds = (float(self.y[top_lo[0]]), float(self.y[top_hi[0]]))
+        if self.is_sorted:
+            self.x_bounds = (float(self.x[0]), float(self.x[-1]))
+        else:
+            self.x_bounds = (float(np.min(self.x)), float(np.max(self.x)))
+
+    def __len__(self):
+        return len(self.y)
+
+    def index_range(self, x_min: float, x_max: float) -> tuple[int, int]:
+        """
+        Zwraca zakres indeksów [i0, i1) pokrywający przedział [x_min, x_max]
+        wraz z jednym punktem zapasu po obu stronach.
+        """
+        n = len(self.y)
+        if not self.is_sorted:
+            return 0, n
+        i0 = max(int(np.searchsorted(self.x, x_min, side='left')) - 1, 0)
+        i1 = min(int(np.searchsorted(self.x, x_max, side='right')) + 1, n)
+        return i0, i1
+
+    def select_level(self, count: int, max_points: int) -> int:
+        """
+        Wybiera najdrobniejszy poziom, dla którego zakres `count` próbek
+        mieści się w budżecie `max_points` punktów (0 oznacza dane surowe).
+        """
+        if count <= max_points:
+            return 0
+        for level, (bucket, _, _) in enumerate(self.levels, start=1):
+            if 2 * count / bucket <= max_points:
+                return level
+        return len(self.levels)
+
+    def query(self, x_min: float, x_max: float, max_points: int) -> tuple[np.ndarray, np.ndarray, tuple]:
+        """
+        Zwraca zdecymowane dane dla widocznego zakresu osi x.
+
+        Parameters:
+            x_min (float): Lewa granica widocznego zakresu.
+            x_max (float): Prawa granica widocznego zakresu.
+            max_points (int): Budżet punktów (zwykle ~2x szerokość widoku w pikselach).
+
+        Returns:
+            tuple: (x, y, key) - dane do narysowania oraz klucz (i0, i1, poziom),
+            który pozwala pominąć ponowne rysowanie, gdy wynik się nie zmienił.
+        """
+        i0, i1 = self.index_range(x_min, x_max)
+        level = self.select_level(i1 - i0, max_points)
+        if level == 0:
+            return self.x[i0:i1], self.y[i0:i1], (i0, i1, 0)
+        bucket, lo, hi = self.levels[level - 1]
+        j0 = i0 // bucket
+        j1 = (i1 - 1) // bucket + 1
+        idx = _interleave(lo[j0:j1], hi[j0:j1])
+        return self.x[idx], self.y[idx], (j0, j1, level)
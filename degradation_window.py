@@ -0,0 +1,198 @@
+"""
+Moduł degradation_window.py
+---------------------------
+Zawiera okno śledzenia degradacji elektrody w długich pomiarach
+wielocyklowych: wykresy trendów położenia i prądu pików, ΔEp oraz E1/2
+w kolejnych cyklach (cvcore.cycles.track_cycles) i eksport szeregów
+czasowych do formatów kolumnowych.
+"""
+
+import os
+import time
+
+import numpy as np
+from PyQt6 import QtWidgets, QtGui, QtCore
+import pyqtgraph as pg
+
+from columnar_export import COLUMNAR_FORMATS, columnar_format, export_columnar
+from cvcore import default_baseline_settings
+from cvcore.cycles import cycle_starts, load_cycles, track_cycles
+
+BASELINE_MODE_LABELS = {
+    'fixed': "Linia bazowa z okna głównego",
+    'cycle': "Linia bazowa w każdym cyklu (końce zakresu)",
+}
+
+
+class DegradationWindow(QtWidgets.QDialog):
+    """
+    Okno trendów parametrów pików w kolejnych cyklach długiego pomiaru.
+    """
+
+    def __init__(self, main_window):
+        """
+        Parameters:
+            main_window (MainWindow): Okno główne (typ pomiaru i zakresy linii bazowych).
+        """
+        super().__init__(main_window)
+        self.setWindowTitle("Degradacja elektrody (trendy cykli)")
+        self.resize(1000, 750)
+        self.main_window = main_window
+        self.file_name = None
+        self.data = None
+        self.trends = None
+        self.baseline_settings = None
+        self.init_ui()
+
+    def init_ui(self):
+        """Tworzy interfejs okna: przyciski, wykresy trendów i podsumowanie."""
+        layout = QtWidgets.QVBoxLayout(self)
+        controls = QtWidgets.QHBoxLayout()
+        btn_open = QtWidgets.QPushButton("Wczytaj plik wielu cykli")
+        btn_open.clicked.connect(self.open_file)
+        controls.addWidget(btn_open)
+        self.baseline_mode_combo = QtWidgets.QComboBox()
+        for mode, label in BASELINE_MODE_LABELS.items():
+            self.baseline_mode_combo.addItem(label, mode)
+        self.baseline_mode_combo.currentIndexChanged.connect(self.update_trends)
+        controls.addWidget(self.baseline_mode_combo)
+        btn_refresh = QtWidgets.QPushButton("Przelicz")
+        btn_refresh.setToolTip("Przelicza trendy z bieżącymi zakresami linii bazowych okna głównego.")
+        btn_refresh.clicked.connect(self.update_trends)
+        controls.addWidget(btn_refresh)
+        controls.addStretch()
+        btn_export = QtWidgets.QPushButton("Eksport trendów")
+        btn_export.clicked.connect(self.export_trends)
+        controls.addWidget(btn_export)
+        layout.addLayout(controls)
+
+        self.plots = pg.GraphicsLayoutWidget()
+        self.plot_ep = self.plots.addPlot(row=0, col=0, title="Potencjał pików Ep [mV]")
+        self.plot_ip = self.plots.addPlot(row=0, col=1, title="Wysokość pików względem linii bazowej [μA]")
+        self.plot_delta = self.plots.addPlot(row=1, col=0, title="ΔEp [mV]")
+        self.plot_half = self.plots.addPlot(row=1, col=1, title="E1/2 [mV]")
+        for plot in (self.plot_ep, self.plot_ip, self.plot_delta, self.plot_half):
+            plot.setLabel('bottom', "Cykl")
+            plot.showGrid(x=True, y=True, alpha=0.3)
+            plot.addLegend()
+        self.plot_ip.setXLink(self.plot_ep)
+        self.plot_delta.setXLink(self.plot_ep)
+        self.plot_half.setXLink(self.plot_ep)
+        layout.addWidget(self.plots)
+        self.summary_label = QtWidgets.QLabel("Wczytaj plik z wieloma cyklami (E, I_utl, I_red, opcjonalnie nr cyklu).")
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+
+    def open_file(self):
+        """Wczytuje plik wielocyklowy (w kolejności pomiaru) i oblicza trendy."""
+        file_name, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Wybierz plik wielu cykli", "",
+                                                             "Text Files (*.txt);;All Files (*)")
+        if not file_name:
+            return
+        QtWidgets.QApplication.setOverrideCursor(QtGui.QCursor(QtCore.Qt.CursorShape.WaitCursor))
+        try:
+            self.data = load_cycles(file_name, self.main_window.measurement_type_combo.currentIndex())
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Błąd", f"Nie udało się wczytać pliku.\n{str(e)}")
+            return
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+        self.file_name = file_name
+        self.update_trends()
+
+    def current_baseline_settings(self) -> dict:
+        """
+        Zwraca zakresy pików: linie bazowe okna głównego, a bez wczytanych
+        tam danych - domyślne linie bazowe pierwszego cyklu.
+        """
+        if self.main_window.x is not None:
+            return self.main_window.baseline_settings
+        x, y1, y2, cycle = self.data
+        starts = cycle_starts(x, cycle)
+        end = starts[1] if len(starts) > 1 else len(x)
+        return default_baseline_settings(x[:end], y1[:end], y2[:end])
+
+    def update_trends(self):
+        """Oblicza parametry pików we wszystkich cyklach i rysuje trendy."""
+        if self.data is None:
+            return
+        x, y1, y2, cycle = self.data
+        self.baseline_settings = self.current_baseline_settings()
+        start = time.perf_counter()
+        try:
+            self.trends = track_cycles(x, y1, y2, self.baseline_settings, cycle,
+                                       baseline_mode=self.baseline_mode_combo.currentData())
+        except ValueError as e:
+            QtWidgets.QMessageBox.warning(self, "Błąd", str(e))
+            return
+        elapsed = time.perf_counter() - start
+        self.draw_trends()
+        trends = self.trends
+        text = (f"{os.path.basename(self.file_name)}: {len(trends.cycle)} cykli, {len(x)} punktów, "
+                f"obliczenia: {elapsed * 1000:.0f} ms.")
+        if len(trends.cycle) > 1:
+            text += (f" Zmiana od 1. do ostatniego cyklu: H_ox {_format_change(self.relative_change(trends.ox_height), '%')}, "
+                     f"D_red {_format_change(self.relative_change(trends.red_height), '%')}, "
+                     f"ΔEp {_format_change(trends.delta_ep[-1] - trends.delta_ep[0], ' mV')}.")
+        self.summary_label.setText(text)
+
+    @staticmethod
+    def relative_change(values: np.ndarray) -> float:
+        """Zmiana ostatniej wartości względem pierwszej [%] (NaN, gdy brak danych)."""
+        valid = values[np.isfinite(values)]
+        if len(valid) < 2 or valid[0] == 0:
+            return float('nan')
+        return 100.0 * (valid[-1] - valid[0]) / abs(valid[0])
+
+    def draw_trends(self):
+        """Rysuje szeregi czasowe parametrów pików."""
+        trends = self.trends
+        cycles = trends.cycle
+        ox_pen = pg.mkPen(color='b', width=1)
+        red_pen = pg.mkPen(color='r', width=1)
+        for plot in (self.plot_ep, self.plot_ip, self.plot_delta, self.plot_half):
+            plot.clear()
+        self.plot_ep.plot(cycles, trends.ox_x, pen=ox_pen, name="Ep utlenianie")
+        self.plot_ep.plot(cycles, trends.red_x, pen=red_pen, name="Ep redukcja")
+        self.plot_ip.plot(cycles, trends.ox_height, pen=ox_pen, name="H utlenianie")
+        self.plot_ip.plot(cycles, trends.red_height, pen=red_pen, name="D redukcja")
+        self.plot_delta.plot(cycles, trends.delta_ep, pen=pg.mkPen(color='g', width=1), name="ΔEp")
+        self.plot_half.plot(cycles, trends.e_half, pen=pg.mkPen(color='m', width=1), name="E1/2")
+        for plot in (self.plot_ep, self.plot_ip, self.plot_delta, self.plot_half):
+            for item in plot.listDataItems():
+                # Tysiące cykli: pyqtgraph zmniejsza liczbę rysowanych punktów do szerokości widoku
+                item.setDownsampling(auto=True, method='peak')
+                item.setClipToView(True)
+
+    def export_trends(self):
+        """Eksportuje szeregi czasowe do formatu Parquet, HDF5 lub skompresowanego CSV."""
+        if self.trends is None:
+            QtWidgets.QMessageBox.warning(self, "Brak danych", "Najpierw wczytaj plik wielu cykli.")
+            return
+        filters = ";;".join(f"{name} (*{extension})" for extension, name in COLUMNAR_FORMATS.items())
+        filename, selected_filter = QtWidgets.QFileDialog.getSaveFileName(self, "Eksport trendów", "", filters)
+        if not filename:
+            return
+        if columnar_format(filename) is None:
+            for extension, name in COLUMNAR_FORMATS.items():
+                if selected_filter.startswith(name):
+                    filename += extension
+                    break
+        settings = {
+            'source_file': self.file_name,
+            'measurement_type': self.main_window.measurement_type_combo.currentIndex(),
+            'baseline_mode': self.baseline_mode_combo.currentData(),
+            'baseline_settings': {key: {k: float(v) for k, v in values.items()}
+                                  for key, values in self.baseline_settings.items()},
+        }
+        try:
+            export_columnar(filename, self.trends.columns(), [], [], [], [], settings)
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Błąd", f"Nie udało się zapisać trendów:\n{e}")
+            return
+        QtWidgets.QMessageBox.information(self, "Sukces", f"Trendy zostały zapisane do pliku {filename}")
+
+
+def _format_change(value: float, unit: str) -> str:
+    """Formatuje zmianę parametru ("n/d", gdy nie da się jej obliczyć)."""
+    return "n/d" if not np.isfinite(value) else f"{value:+.2f}{unit}"
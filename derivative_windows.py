@@ -7,8 +7,9 @@ Zawiera klasy okien do analizy pochodnych oraz drugich pochodnych.
 import numpy as np
 from PyQt6 import QtWidgets, QtCore
 import pyqtgraph as pg
-from scipy.signal import savgol_filter
-from utils import compute_zero_crossings  # import funkcji wykrywającej miejsca zerowe
+from cvcore import smooth, compute_zero_crossings
+from plot_lod import plot_lod
+from crosshair import DataCrosshair
 
 
 class DerivativeWindow(QtWidgets.QDialog):
@@ -86,7 +87,7 @@ class DerivativeWindow(QtWidgets.QDialog):
         self.plot_widget = pg.PlotWidget(title="Wykres pochodnych")
         self.plot_widget.addLegend()
         main_layout.addWidget(self.plot_widget)
-        self.plot_widget.scene().sigMouseMoved.connect(self.mouseMoved)
+        self.crosshair = DataCrosshair(self.plot_widget, self.on_crosshair_moved)
         self.update_plot()
 
     def update_plot(self):
@@ -94,14 +95,9 @@ class DerivativeWindow(QtWidgets.QDialog):
         if self.smoothingCheckBox.isChecked():
             window_length = self.windowSpinBox.value()
             polyorder = self.polySpinBox.value()
-            if window_length % 2 == 0:
-                window_length += 1
-            if window_length > len(self.orig_deriv_y1):
-                window_length = len(self.orig_deriv_y1) if len(self.orig_deriv_y1) % 2 == 1 else len(
-                    self.orig_deriv_y1) - 1
             try:
-                smooth_y1 = savgol_filter(self.orig_deriv_y1, window_length, polyorder)
-                smooth_y2 = savgol_filter(self.orig_deriv_y2, window_length, polyorder)
+                smooth_y1 = smooth(self.orig_deriv_y1, window_length, polyorder)
+                smooth_y2 = smooth(self.orig_deriv_y2, window_length, polyorder)
             except Exception as e:
                 QtWidgets.QMessageBox.warning(self, "Błąd", f"Nie udało się wygładzić danych: {str(e)}")
                 smooth_y1 = self.orig_deriv_y1
@@ -114,11 +110,13 @@ class DerivativeWindow(QtWidgets.QDialog):
         self.current_curve2 = smooth_y2
         self.plot_widget.clear()
         self.plot_widget.addLegend()
-        self.plot_widget.plot(self.x, smooth_y1, pen=pg.mkPen(color='b', width=2), name='Pochodna utleniania')
-        self.plot_widget.plot(self.x, smooth_y2, pen=pg.mkPen(color='r', width=2), name='Pochodna redukcji')
+        plot_lod(self.plot_widget, self.x, smooth_y1, pen=pg.mkPen(color='b', width=2), name='Pochodna utleniania')
+        plot_lod(self.plot_widget, self.x, smooth_y2, pen=pg.mkPen(color='r', width=2), name='Pochodna redukcji')
         if self.intersectionPlot is not None:
             self.plot_widget.removeItem(self.intersectionPlot)
             self.intersectionPlot = None
+        self.crosshair.attach()
+        self.crosshair.set_data(self.x, [smooth_y1, smooth_y2])
 
     def find_intersections(self):
         """
@@ -149,12 +147,13 @@ class DerivativeWindow(QtWidgets.QDialog):
         else:
             QtWidgets.QMessageBox.information(self, "Miejsca zerowe", "Brak miejsc zerowych w zadanym zakresie.")
 
-    def mouseMoved(self, evt):
-        """Aktualizuje etykietę z pozycją kursora podczas poruszania myszką."""
-        pos = evt[0] if isinstance(evt, (list, tuple)) else evt
-        if self.plot_widget.sceneBoundingRect().contains(pos):
-            mouse_point = self.plot_widget.getViewBox().mapSceneToView(pos)
+    def on_crosshair_moved(self, index, curve_index, mouse_point):
+        """Aktualizuje etykietę wartościami krzywych w punkcie, do którego przyciągnięto kursor."""
+        if index is None:
             self.cursorLabel.setText(f"x = {mouse_point.x():.3f}, y = {mouse_point.y():.3f}")
+            return
+        self.cursorLabel.setText(f"x = {self.x[index]:.3f}, y_utl = {self.current_curve1[index]:.4g}, "
+                                 f"y_red = {self.current_curve2[index]:.4g}")
 
 
 class SecondDerivativeWindow(QtWidgets.QDialog):
@@ -232,7 +231,7 @@ class SecondDerivativeWindow(QtWidgets.QDialog):
         self.plot_widget = pg.PlotWidget(title="Wykres drugiej pochodnej")
         self.plot_widget.addLegend()
         main_layout.addWidget(self.plot_widget)
-        self.plot_widget.scene().sigMouseMoved.connect(self.mouseMoved)
+        self.crosshair = DataCrosshair(self.plot_widget, self.on_crosshair_moved)
         self.update_plot()
 
     def update_plot(self):
@@ -240,14 +239,9 @@ class SecondDerivativeWindow(QtWidgets.QDialog):
         if self.smoothingCheckBox.isChecked():
             window_length = self.windowSpinBox.value()
             polyorder = self.polySpinBox.value()
-            if window_length % 2 == 0:
-                window_length += 1
-            if window_length > len(self.orig_second_deriv_y1):
-                window_length = len(self.orig_second_deriv_y1) if len(self.orig_second_deriv_y1) % 2 == 1 else len(
-                    self.orig_second_deriv_y1) - 1
             try:
-                smooth_y1 = savgol_filter(self.orig_second_deriv_y1, window_length, polyorder)
-                smooth_y2 = savgol_filter(self.orig_second_deriv_y2, window_length, polyorder)
+                smooth_y1 = smooth(self.orig_second_deriv_y1, window_length, polyorder)
+                smooth_y2 = smooth(self.orig_second_deriv_y2, window_length, polyorder)
             except Exception as e:
                 QtWidgets.QMessageBox.warning(self, "Błąd", f"Nie udało się wygładzić danych: {str(e)}")
                 smooth_y1 = self.orig_second_deriv_y1
@@ -260,11 +254,13 @@ class SecondDerivativeWindow(QtWidgets.QDialog):
         self.current_curve2 = smooth_y2
         self.plot_widget.clear()
         self.plot_widget.addLegend()
-        self.plot_widget.plot(self.x, smooth_y1, pen=pg.mkPen(color='b', width=2), name='Druga pochodna utleniania')
-        self.plot_widget.plot(self.x, smooth_y2, pen=pg.mkPen(color='r', width=2), name='Druga pochodna redukcji')
+        plot_lod(self.plot_widget, self.x, smooth_y1, pen=pg.mkPen(color='b', width=2), name='Druga pochodna utleniania')
+        plot_lod(self.plot_widget, self.x, smooth_y2, pen=pg.mkPen(color='r', width=2), name='Druga pochodna redukcji')
         if self.intersectionPlot is not None:
             self.plot_widget.removeItem(self.intersectionPlot)
             self.intersectionPlot = None
+        self.crosshair.attach()
+        self.crosshair.set_data(self.x, [smooth_y1, smooth_y2])
 
     def find_intersections(self):
         """
@@ -295,9 +291,10 @@ class SecondDerivativeWindow(QtWidgets.QDialog):
         else:
             QtWidgets.QMessageBox.information(self, "Miejsca zerowe", "Brak miejsc zerowych w zadanym zakresie.")
 
-    def mouseMoved(self, evt):
-        """Aktualizuje etykietę z pozycją kursora podczas poruszania myszką."""
-        pos = evt[0] if isinstance(evt, (list, tuple)) else evt
-        if self.plot_widget.sceneBoundingRect().contains(pos):
-            mouse_point = self.plot_widget.getViewBox().mapSceneToView(pos)
+    def on_crosshair_moved(self, index, curve_index, mouse_point):
+        """Aktualizuje etykietę wartościami krzywych w punkcie, do którego przyciągnięto kursor."""
+        if index is None:
             self.cursorLabel.setText(f"x = {mouse_point.x():.3f}, y = {mouse_point.y():.3f}")
+            return
+        self.cursorLabel.setText(f"x = {self.x[index]:.3f}, y_utl = {self.current_curve1[index]:.4g}, "
+                                 f"y_red = {self.current_curve2[index]:.4g}")
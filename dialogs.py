@@ -1,11 +1,14 @@
 """
 Moduł dialogs.py
 -----------------
-Zawiera klasy dialogowe do ustawień osi oraz linii bazowej.
+Zawiera klasy dialogowe do ustawień osi (wraz z liczbą punktów wykresu
+w eksporcie do Excela) oraz linii bazowej.
 """
 
 from PyQt6 import QtWidgets, QtGui, QtCore
 
+from excel_export import CHART_POINT_BUDGET, EXCEL_MAX_ROWS
+
 
 class AxisSettingsDialog(QtWidgets.QDialog):
     """
@@ -72,6 +75,15 @@ class AxisSettingsDialog(QtWidgets.QDialog):
         font_layout.addWidget(self.font_label)
         layout.addRow("Czcionka:", font_layout)
 
+        # Budżet punktów zdecymowanej serii wykresu w eksporcie do Excela
+        self.chart_points_spin = QtWidgets.QSpinBox()
+        self.chart_points_spin.setRange(100, EXCEL_MAX_ROWS - 1)
+        self.chart_points_spin.setSingleStep(1000)
+        self.chart_points_spin.setValue(int(self.current_settings.get('chart_points', CHART_POINT_BUDGET)))
+        self.chart_points_spin.setToolTip("Maksymalna liczba punktów serii wykresu w pliku Excel "
+                                          "(dane w arkuszu zapisywane są w całości).")
+        layout.addRow("Punkty wykresu w Excelu:", self.chart_points_spin)
+
         # Przyciski OK, Anuluj, Apply
         self.button_box = QtWidgets.QDialogButtonBox(
             QtWidgets.QDialogButtonBox.StandardButton.Ok |
@@ -109,7 +121,8 @@ class AxisSettingsDialog(QtWidgets.QDialog):
             'x_max': self.x_max_spin.value(),
             'y_min': self.y_min_spin.value(),
             'y_max': self.y_max_spin.value(),
-            'font': self.font
+            'font': self.font,
+            'chart_points': self.chart_points_spin.value(),
         }
 
 
@@ -0,0 +1,222 @@
+"""
+Moduł excel_export.py
+---------------------
+Zawiera zapis wyników do pliku Excel (.xlsx) w trybie stałej pamięci
+XlsxWritera. Dane trafiają do arkusza wprost z tablic NumPy, blokami
+wierszy, bez budowania pośredniego DataFrame. Gdy liczba wierszy
+przekracza limit Excela, dane są dzielone na kolejne arkusze.
+Wykres korzysta z osobnego arkusza ze zdecymowaną (min/max) serią danych,
+dzięki czemu skoroszyt otwiera się szybko także dla dużych zbiorów.
+"""
+
+import numpy as np
+
+from decimation import minmax_indices
+
+# Limit wierszy arkusza Excela (łącznie z wierszem nagłówka)
+EXCEL_MAX_ROWS = 1048576
+# Liczba wierszy danych przetwarzanych jednym blokiem
+DATA_CHUNK_ROWS = 65536
+# Domyślny budżet punktów serii wykresu
+CHART_POINT_BUDGET = 4000
+
+
+def split_rows(n_rows: int, sheet_name: str = "Dane",
+               max_rows: int = EXCEL_MAX_ROWS) -> list[tuple[str, int, int]]:
+    """
+    Dzieli wiersze danych na arkusze mieszczące się w limicie Excela.
+
+    Parameters:
+        n_rows (int): Liczba wierszy danych.
+        sheet_name (str): Nazwa pierwszego arkusza; kolejne otrzymują sufiks _2, _3, ...
+        max_rows (int): Maksymalna liczba wierszy arkusza (łącznie z nagłówkiem).
+
+    Returns:
+        list: Lista krotek (nazwa arkusza, pierwszy wiersz, wiersz za ostatnim).
+    """
+    per_sheet = max_rows - 1
+    parts = []
+    for number, start in enumerate(range(0, max(n_rows, 1), per_sheet), start=1):
+        name = sheet_name if number == 1 else f"{sheet_name}_{number}"
+        parts.append((name, start, min(start + per_sheet, n_rows)))
+    return parts
+
+
+def write_rows(worksheet, first_row: int, block: np.ndarray):
+    """
+    Zapisuje blok liczb wiersz po wierszu (wymóg trybu stałej pamięci).
+    Wartości NaN zapisywane są jako puste komórki.
+
+    Parameters:
+        worksheet: Arkusz XlsxWritera.
+        first_row (int): Indeks pierwszego wiersza arkusza.
+        block (ndarray): Dwuwymiarowa tablica wartości (wiersze x kolumny).
+    """
+    nan_mask = np.isnan(block)
+    if nan_mask.any():
+        rows = block.astype(object)
+        rows[nan_mask] = None
+        rows = rows.tolist()
+    else:
+        rows = block.tolist()
+    for offset, row in enumerate(rows):
+        worksheet.write_row(first_row + offset, 0, row)
+
+
+def write_data_sheets(workbook, columns: dict, sheet_name: str = "Dane",
+                      max_rows: int = EXCEL_MAX_ROWS, progress=None) -> list[tuple[str, int, int]]:
+    """
+    Zapisuje kolumny danych do jednego lub kilku arkuszy.
+
+    Parameters:
+        workbook (xlsxwriter.Workbook): Skoroszyt otwarty w trybie constant_memory.
+        columns (dict): Słownik nazwa kolumny -> tablica wartości (jednakowej długości).
+        sheet_name (str): Nazwa pierwszego arkusza danych.
+        max_rows (int): Maksymalna liczba wierszy arkusza (łącznie z nagłówkiem).
+        progress (callable): Opcjonalna funkcja progress(zapisane wiersze, wszystkie wiersze, etap)
+            wywoływana po każdym bloku; może przerwać zapis, zgłaszając wyjątek.
+
+    Returns:
+        list: Lista krotek (nazwa arkusza, pierwszy wiersz, wiersz za ostatnim).
+    """
+    names = list(columns)
+    arrays = [np.asarray(columns[name], dtype=float) for name in names]
+    n_rows = len(arrays[0]) if arrays else 0
+    parts = split_rows(n_rows, sheet_name, max_rows)
+    for name, start, stop in parts:
+        worksheet = workbook.add_worksheet(name)
+        worksheet.write_row(0, 0, names)
+        for chunk_start in range(start, stop, DATA_CHUNK_ROWS):
+            chunk_stop = min(chunk_start + DATA_CHUNK_ROWS, stop)
+            block = np.column_stack([a[chunk_start:chunk_stop] for a in arrays])
+            write_rows(worksheet, 1 + chunk_start - start, block)
+            if progress is not None:
+                progress(chunk_stop, n_rows, f"Arkusz {name}")
+    return parts
+
+
+def write_chart_sheet(workbook, columns: dict, point_budget: int = CHART_POINT_BUDGET,
+                      sheet_name: str = "Wykres_dane") -> int:
+    """
+    Zapisuje zdecymowaną serię (x, y_ox, y_red) do osobnego arkusza, do którego
+    odwołuje się wykres. Z każdego kubełka danych brane są minimum i maksimum
+    obu krzywych, więc kształt pików zostaje zachowany.
+
+    Parameters:
+        workbook (xlsxwriter.Workbook): Skoroszyt.
+        columns (dict): Kolumny danych; pierwsze trzy to x, y_ox, y_red.
+        point_budget (int): Maksymalna liczba punktów serii.
+        sheet_name (str): Nazwa arkusza serii wykresu.
+
+    Returns:
+        int: Liczba zapisanych punktów.
+    """
+    names = list(columns)[:3]
+    arrays = [np.asarray(columns[name], dtype=float) for name in names]
+    # Każdy kubełek daje do czterech punktów (min i max dwóch krzywych)
+    idx = minmax_indices(arrays[1:], max(point_budget // 4, 1))
+    worksheet = workbook.add_worksheet(sheet_name)
+    worksheet.write_row(0, 0, names)
+    write_rows(worksheet, 1, np.column_stack([a[idx] for a in arrays]))
+    return len(idx)
+
+
+def write_table_sheet(workbook, sheet_name: str, header: list, rows: list):
+    """
+    Zapisuje niewielką tabelę (nagłówek i wiersze) do nowego arkusza.
+
+    Returns:
+        Worksheet: Utworzony arkusz.
+    """
+    worksheet = workbook.add_worksheet(sheet_name)
+    worksheet.write_row(0, 0, header)
+    for offset, row in enumerate(rows, start=1):
+        worksheet.write_row(offset, 0, row)
+    return worksheet
+
+
+def export_workbook(filename: str,
+                    columns: dict,
+                    params_header: list,
+                    params_rows: list,
+                    deriv_intersections: list,
+                    second_deriv_intersections: list,
+                    e_half: float,
+                    measurement_type: int,
+                    progress=None,
+                    chart_points: int = CHART_POINT_BUDGET):
+    """
+    Zapisuje dane, parametry, miejsca zerowe oraz wykres do pliku Excel.
+
+    Parameters:
+        filename (str): Ścieżka pliku .xlsx.
+        columns (dict): Kolumny arkusza "Dane" (pierwsze trzy: x, y_ox, y_red).
+        params_header (list): Nagłówek tabeli wyników.
+        params_rows (list): Wiersze tabeli wyników.
+        deriv_intersections (list): Miejsca zerowe pierwszej pochodnej (x, y).
+        second_deriv_intersections (list): Miejsca zerowe drugiej pochodnej (x, y).
+        e_half (float): Wartość E1/2 rysowana na wykresie.
+        measurement_type (int): Typ pomiaru (0 - utlenianie, 1 - redukcja).
+        progress (callable): Opcjonalna funkcja postępu, patrz write_data_sheets.
+        chart_points (int): Budżet punktów zdecymowanej serii wykresu.
+    """
+    import xlsxwriter  # import odroczony - potrzebny dopiero przy eksporcie
+    workbook = xlsxwriter.Workbook(filename, {'constant_memory': True})
+    try:
+        write_data_sheets(workbook, columns, progress=progress)
+        n_chart = write_chart_sheet(workbook, columns, chart_points)
+        params_sheet = write_table_sheet(workbook, "Parametry", params_header, params_rows)
+        if deriv_intersections:
+            write_table_sheet(workbook, "Przecięcia Pochodnej", ["x", "y"], deriv_intersections)
+        if second_deriv_intersections:
+            write_table_sheet(workbook, "Przecięcia Drugiej Pochodnej", ["x", "y"], second_deriv_intersections)
+
+        # Punkty pionowej linii E1/2 zapisujemy pod tabelą wyników (w trybie
+        # stałej pamięci nie można wrócić do arkusza danych po jego zapisaniu)
+        names = list(columns)
+        y_min = min(np.nanmin(columns[names[1]]), np.nanmin(columns[names[2]]))
+        y_max = max(np.nanmax(columns[names[1]]), np.nanmax(columns[names[2]]))
+        helper_row = len(params_rows) + 2
+        params_sheet.write_row(helper_row, 0, ["E1/2 (wykres)", "y"])
+        params_sheet.write_row(helper_row + 1, 0, [e_half, y_min])
+        params_sheet.write_row(helper_row + 2, 0, [e_half, y_max])
+
+        sheet = "Wykres_dane"
+        last = n_chart + 1
+        chart = workbook.add_chart({'type': 'line'})
+        chart.add_series({
+            'name': f'={sheet}!$B$1',
+            'categories': f"={sheet}!$A$2:$A${last}",
+            'values': f"={sheet}!$B$2:$B${last}",
+            'line': {'color': 'red'},
+        })
+        chart.add_series({
+            'name': f'={sheet}!$C$1',
+            'categories': f"={sheet}!$A$2:$A${last}",
+            'values': f"={sheet}!$C$2:$C${last}",
+            'line': {'color': 'blue'},
+        })
+        chart.add_series({
+            'name': 'E1/2',
+            'categories': f"=Parametry!$A${helper_row + 2}:$A${helper_row + 3}",
+            'values': f"=Parametry!$B${helper_row + 2}:$B${helper_row + 3}",
+            'line': {'color': 'green', 'dash_type': 'dash'},
+        })
+        chart.set_x_axis({
+            'name': 'E [mV]',
+            'name_font': {'name': 'Verdana', 'bold': True, 'size': 14},
+            'num_font': {'name': 'Calibri', 'size': 10},
+            'crossing': 'min' if measurement_type == 0 else 'max',
+        })
+        chart.set_y_axis({
+            'name': 'I [μA]',
+            'name_font': {'name': 'Verdana', 'bold': True, 'size': 14},
+            'num_font': {'name': 'Calibri', 'size': 10},
+        })
+        chart.set_size({'width': 600, 'height': 600})
+        workbook.get_worksheet_by_name("Dane").insert_chart('G2', chart)
+        if progress is not None:
+            n_rows = len(columns[names[0]])
+            progress(n_rows, n_rows, "Zapis skoroszytu")
+    finally:
+        workbook.close()
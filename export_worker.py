@@ -0,0 +1,157 @@
+"""
+Moduł export_worker.py
+----------------------
+Zawiera eksport wykonywany w tle. Przed uruchomieniem tworzona jest
+niezmienna migawka danych i wyników (ExportSnapshot), a sam zapis odbywa się
+w wątku roboczym, który raportuje postęp sygnałami Qt i może zostać
+anulowany - wtedy niepełny plik jest usuwany.
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+from PyQt6 import QtCore
+
+from excel_export import CHART_POINT_BUDGET, export_workbook
+from columnar_export import export_columnar
+from cvcore.profiling import profiler
+
+
+class ExportCancelled(Exception):
+    """Wyjątek zgłaszany, gdy użytkownik anuluje eksport."""
+
+
+def readonly_view(values):
+    """Zwraca widok tablicy tylko do odczytu (bez kopiowania danych)."""
+    view = np.asarray(values).view()
+    view.flags.writeable = False
+    return view
+
+
+@dataclass(frozen=True)
+class ExportSnapshot:
+    """
+    Niezmienna migawka danych i wyników przekazywana do eksportu w tle.
+
+    Tablice są widokami tylko do odczytu, a wiersze wyników krotkami, więc
+    dalsza praca w oknie głównym (np. wczytanie kolejnego pliku) nie wpływa
+    na zapisywany plik.
+    """
+    filename: str
+    kind: str  # 'excel' lub 'columnar'
+    columns: dict
+    params_header: tuple
+    params_rows: tuple
+    deriv_intersections: tuple
+    second_deriv_intersections: tuple
+    e_half: float
+    measurement_type: int
+    settings: dict
+    chart_points: int = CHART_POINT_BUDGET
+
+    @property
+    def n_rows(self):
+        """Liczba wierszy danych."""
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+
+def make_snapshot(filename, kind, columns, params_header, params_rows,
+                  deriv_intersections, second_deriv_intersections,
+                  e_half, measurement_type, settings,
+                  chart_points=CHART_POINT_BUDGET) -> ExportSnapshot:
+    """Tworzy migawkę eksportu z bieżących danych okna głównego."""
+    return ExportSnapshot(
+        filename=filename,
+        kind=kind,
+        columns={name: readonly_view(values) for name, values in columns.items()},
+        params_header=tuple(params_header),
+        params_rows=tuple(tuple(row) for row in params_rows),
+        deriv_intersections=tuple(deriv_intersections or ()),
+        second_deriv_intersections=tuple(second_deriv_intersections or ()),
+        e_half=e_half,
+        measurement_type=measurement_type,
+        settings=settings,
+        chart_points=chart_points,
+    )
+
+
+class ExportTask(QtCore.QObject):
+    """
+    Zadanie eksportu wykonywane w wątku roboczym.
+
+    Sygnały:
+        progress(int, int, str): zapisane wiersze, wszystkie wiersze, bieżący etap.
+        finished(str): eksport zakończony - ścieżka pliku.
+        failed(str, str): błąd eksportu - ścieżka pliku i opis błędu.
+        cancelled(str): eksport anulowany - ścieżka (usuniętego) pliku.
+    """
+    progress = QtCore.pyqtSignal(int, int, str)
+    finished = QtCore.pyqtSignal(str)
+    failed = QtCore.pyqtSignal(str, str)
+    cancelled = QtCore.pyqtSignal(str)
+
+    def __init__(self, snapshot: ExportSnapshot, parent=None):
+        """
+        Parameters:
+            snapshot (ExportSnapshot): Migawka danych do zapisania.
+        """
+        super().__init__(parent)
+        self.snapshot = snapshot
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Zgłasza żądanie anulowania; zapis przerwie się po bieżącym bloku."""
+        self._cancel_event.set()
+
+    def report_progress(self, rows_written, total_rows, stage):
+        """Przekazuje postęp do GUI i przerywa zapis, jeśli zażądano anulowania."""
+        if self._cancel_event.is_set():
+            raise ExportCancelled()
+        self.progress.emit(int(rows_written), int(total_rows), stage)
+
+    def run(self):
+        """Wykonuje eksport (wywoływane w wątku roboczym)."""
+        snapshot = self.snapshot
+        try:
+            with profiler.stage(f"{snapshot.kind}_export", n_rows=snapshot.n_rows):
+                self.write(snapshot)
+            if self._cancel_event.is_set():
+                raise ExportCancelled()
+        except ExportCancelled:
+            self.remove_partial_file()
+            self.cancelled.emit(snapshot.filename)
+        except Exception as e:
+            self.remove_partial_file()
+            self.failed.emit(snapshot.filename, str(e))
+        else:
+            self.finished.emit(snapshot.filename)
+
+    def write(self, snapshot: ExportSnapshot):
+        """Zapisuje migawkę w formacie wybranym przy jej tworzeniu."""
+        if snapshot.kind == 'excel':
+            export_workbook(
+                snapshot.filename, snapshot.columns,
+                list(snapshot.params_header), [list(row) for row in snapshot.params_rows],
+                list(snapshot.deriv_intersections), list(snapshot.second_deriv_intersections),
+                snapshot.e_half, snapshot.measurement_type,
+                progress=self.report_progress,
+                chart_points=snapshot.chart_points
+            )
+        else:
+            export_columnar(
+                snapshot.filename, snapshot.columns,
+                list(snapshot.params_header), [list(row) for row in snapshot.params_rows],
+                list(snapshot.deriv_intersections), list(snapshot.second_deriv_intersections),
+                snapshot.settings,
+                progress=self.report_progress
+            )
+
+    def remove_partial_file(self):
+        """Usuwa niepełny plik pozostawiony przez przerwany eksport."""
+        try:
+            if os.path.exists(self.snapshot.filename):
+                os.remove(self.snapshot.filename)
+        except OSError:
+            pass
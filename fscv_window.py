@@ -0,0 +1,234 @@
+"""
+Moduł fscv_window.py
+--------------------
+Zawiera okno szybkiej woltamperometrii cyklicznej (FSCV): wykres barwny
+prądu po odjęciu kroczącego tła (czas × próbka fali potencjału) rysowany
+jako pg.ImageItem z automatycznym zmniejszaniem rozdzielczości do rozmiaru
+widoku, przebieg prądu w czasie przy wybranym potencjale i woltamogram
+z wybranej chwili (kliknięcie wykresu barwnego lub przesunięcie linii).
+
+Nagrania tekstowe można zapisać w formacie pliku sesji (.cvfscv), który
+przy ponownym otwarciu jest mapowany w pamięć.
+"""
+
+import os
+
+import numpy as np
+from PyQt6 import QtWidgets, QtGui, QtCore
+import pyqtgraph as pg
+
+from cvcore.fscv import DEFAULT_BACKGROUND_SCANS, DEFAULT_SCAN_FREQUENCY, FSCVData, load_fscv
+from session import load_session, save_session
+
+FSCV_EXTENSION = ".cvfscv"
+FSCV_COLOR_MAP = 'CET-D1'
+
+
+def open_recording(file_name: str, scan_frequency: float) -> FSCVData:
+    """
+    Wczytuje nagranie FSCV z pliku .cvfscv (mapowanego w pamięć), .npy lub tekstowego.
+
+    Parameters:
+        file_name (str): Ścieżka do pliku.
+        scan_frequency (float): Częstotliwość skanów [Hz] (plik .cvfscv zawiera własną).
+    """
+    if file_name.lower().endswith(FSCV_EXTENSION):
+        manifest, arrays = load_session(file_name)
+        return FSCVData(arrays['potential'], arrays['currents'],
+                        manifest.get('scan_frequency', scan_frequency))
+    potential, currents = load_fscv(file_name)
+    return FSCVData(potential, currents, scan_frequency)
+
+
+class FSCVWindow(QtWidgets.QDialog):
+    """
+    Okno nagrań FSCV: wykres barwny z odjętym tłem oraz przekroje w czasie i potencjale.
+    """
+
+    def __init__(self, main_window):
+        """
+        Parameters:
+            main_window (MainWindow): Okno główne.
+        """
+        super().__init__(main_window)
+        self.setWindowTitle("FSCV - wykres barwny")
+        self.resize(1100, 850)
+        self.main_window = main_window
+        self.file_name = None
+        self.data = None
+        self.scan = 0
+        self.sample = 0
+        self.init_ui()
+
+    def init_ui(self):
+        """Tworzy interfejs okna: ustawienia, wykres barwny i przekroje."""
+        layout = QtWidgets.QVBoxLayout(self)
+        controls = QtWidgets.QHBoxLayout()
+        btn_open = QtWidgets.QPushButton("Wczytaj nagranie FSCV")
+        btn_open.clicked.connect(self.open_file)
+        controls.addWidget(btn_open)
+        controls.addWidget(QtWidgets.QLabel("Częstotliwość skanów [Hz]:"))
+        self.frequency_spin = QtWidgets.QDoubleSpinBox()
+        self.frequency_spin.setRange(0.01, 10000.0)
+        self.frequency_spin.setValue(DEFAULT_SCAN_FREQUENCY)
+        self.frequency_spin.valueChanged.connect(self.update_frequency)
+        controls.addWidget(self.frequency_spin)
+        controls.addWidget(QtWidgets.QLabel("Skany tła:"))
+        self.background_spin = QtWidgets.QSpinBox()
+        self.background_spin.setRange(1, 10000)
+        self.background_spin.setValue(DEFAULT_BACKGROUND_SCANS)
+        self.background_spin.setToolTip("Liczba poprzedzających skanów uśrednianych jako tło.")
+        self.background_spin.valueChanged.connect(self.update_image)
+        controls.addWidget(self.background_spin)
+        controls.addStretch()
+        btn_save = QtWidgets.QPushButton("Zapisz jako .cvfscv")
+        btn_save.setToolTip("Zapisuje nagranie w formacie mapowanym w pamięć przy ponownym otwarciu.")
+        btn_save.clicked.connect(self.save_recording)
+        controls.addWidget(btn_save)
+        layout.addLayout(controls)
+
+        self.plots = pg.GraphicsLayoutWidget()
+        self.color_plot = self.plots.addPlot(row=0, col=0, colspan=2, title="Prąd po odjęciu tła")
+        self.color_plot.setLabel('bottom', "Czas [s]")
+        self.color_plot.setLabel('left', "Próbka fali potencjału")
+        self.image = pg.ImageItem(autoDownsample=True)
+        self.color_plot.addItem(self.image)
+        self.color_bar = pg.ColorBarItem(colorMap=pg.colormap.get(FSCV_COLOR_MAP), interactive=True)
+        self.color_bar.setImageItem(self.image, insert_in=self.color_plot)
+        self.time_line = pg.InfiniteLine(angle=90, movable=True, pen=pg.mkPen('k', width=1))
+        self.sample_line = pg.InfiniteLine(angle=0, movable=True, pen=pg.mkPen('k', width=1))
+        self.time_line.sigPositionChangeFinished.connect(self.lines_moved)
+        self.sample_line.sigPositionChangeFinished.connect(self.lines_moved)
+        self.color_plot.addItem(self.time_line)
+        self.color_plot.addItem(self.sample_line)
+        self.trace_plot = self.plots.addPlot(row=1, col=0, title="Prąd w czasie")
+        self.trace_plot.setLabel('bottom', "Czas [s]")
+        self.trace_plot.setXLink(self.color_plot)
+        self.cv_plot = self.plots.addPlot(row=1, col=1, title="Woltamogram")
+        self.cv_plot.setLabel('bottom', "Potencjał")
+        for plot in (self.trace_plot, self.cv_plot):
+            plot.setLabel('left', "Prąd")
+            plot.showGrid(x=True, y=True, alpha=0.3)
+        self.trace_curve = self.trace_plot.plot(pen=pg.mkPen(color='b', width=1))
+        self.trace_curve.setDownsampling(auto=True, method='peak')
+        self.trace_curve.setClipToView(True)
+        self.cv_curve = self.cv_plot.plot(pen=pg.mkPen(color='r', width=1))
+        self.plots.scene().sigMouseClicked.connect(self.on_mouse_click)
+        layout.addWidget(self.plots)
+        self.summary_label = QtWidgets.QLabel(
+            "Wczytaj nagranie: .npy (skany × próbki), plik tekstowy (pierwszy wiersz - potencjał) lub .cvfscv.")
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+
+    def open_file(self):
+        """Wczytuje nagranie FSCV i rysuje wykres barwny."""
+        file_name, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Wybierz nagranie FSCV", "",
+            f"Nagrania FSCV (*{FSCV_EXTENSION} *.npy *.txt *.csv);;All Files (*)")
+        if not file_name:
+            return
+        QtWidgets.QApplication.setOverrideCursor(QtGui.QCursor(QtCore.Qt.CursorShape.WaitCursor))
+        try:
+            self.data = open_recording(file_name, self.frequency_spin.value())
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Błąd", f"Nie udało się wczytać nagrania.\n{str(e)}")
+            return
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+        self.file_name = file_name
+        self.frequency_spin.blockSignals(True)
+        self.frequency_spin.setValue(self.data.scan_frequency)
+        self.frequency_spin.blockSignals(False)
+        self.scan = self.data.n_scans // 2
+        self.sample = int(np.argmax(self.data.potential))
+        self.update_image()
+        self.color_plot.autoRange()
+
+    def update_frequency(self, value: float):
+        """Zmienia częstotliwość skanów (skalę osi czasu)."""
+        if self.data is None:
+            return
+        self.data.scan_frequency = value
+        self.update_image()
+        self.color_plot.autoRange()
+
+    def update_image(self):
+        """Odejmuje tło z bieżącą liczbą skanów i odświeża wykres barwny oraz przekroje."""
+        if self.data is None:
+            return
+        data = self.data
+        window = self.background_spin.value()
+        QtWidgets.QApplication.setOverrideCursor(QtGui.QCursor(QtCore.Qt.CursorShape.WaitCursor))
+        try:
+            subtracted = data.subtracted(window)
+            levels = data.color_levels(window)
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+        # Kolumny obrazu (oś x) to skany, wiersze (oś y) to próbki fali
+        self.image.setImage(subtracted, autoLevels=False, levels=levels)
+        self.image.setRect(QtCore.QRectF(0.0, 0.0, data.n_scans / data.scan_frequency, data.n_samples))
+        self.color_bar.setLevels(levels)
+        self.summary_label.setText(
+            f"{os.path.basename(self.file_name)}: {data.n_scans} skanów × {data.n_samples} próbek, "
+            f"{data.n_scans / data.scan_frequency:.1f} s, tło: średnia z {window} poprzedzających skanów.")
+        self.update_sections()
+
+    def on_mouse_click(self, event):
+        """Kliknięcie wykresu barwnego wybiera chwilę (woltamogram) i potencjał (przebieg w czasie)."""
+        if self.data is None or event.button() != QtCore.Qt.MouseButton.LeftButton:
+            return
+        pos = event.scenePos()
+        if not self.color_plot.vb.sceneBoundingRect().contains(pos):
+            return
+        point = self.color_plot.vb.mapSceneToView(pos)
+        self.select(point.x(), point.y())
+
+    def lines_moved(self):
+        """Po przesunięciu linii wyboru aktualizuje przekroje."""
+        if self.data is not None:
+            self.select(self.time_line.value(), self.sample_line.value())
+
+    def select(self, time: float, sample: float):
+        """
+        Wybiera skan najbliższy chwili time i próbkę fali sample, po czym odświeża przekroje.
+
+        Parameters:
+            time (float): Chwila nagrania [s].
+            sample (float): Pozycja na osi próbek fali.
+        """
+        self.scan = self.data.scan_at(time)
+        self.sample = int(np.clip(np.floor(sample), 0, self.data.n_samples - 1))
+        self.update_sections()
+
+    def update_sections(self):
+        """Rysuje przebieg prądu w czasie i woltamogram dla wybranej próbki i skanu."""
+        data = self.data
+        window = self.background_spin.value()
+        self.time_line.setValue(self.scan / data.scan_frequency)
+        self.sample_line.setValue(self.sample + 0.5)
+        times, trace = data.trace(self.sample, window)
+        self.trace_curve.setData(times, trace)
+        self.trace_plot.setTitle(f"Prąd w czasie przy E = {data.potential[self.sample]:.4g} (próbka {self.sample})")
+        potential, current = data.voltammogram(self.scan, window)
+        self.cv_curve.setData(potential, current)
+        self.cv_plot.setTitle(f"Woltamogram w chwili t = {self.scan / data.scan_frequency:.2f} s (skan {self.scan})")
+
+    def save_recording(self):
+        """Zapisuje nagranie w formacie pliku sesji (.cvfscv) do szybkiego, mapowanego odczytu."""
+        if self.data is None:
+            QtWidgets.QMessageBox.warning(self, "Brak danych", "Najpierw wczytaj nagranie FSCV.")
+            return
+        filename, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Zapisz nagranie FSCV", "",
+                                                            f"Nagranie FSCV (*{FSCV_EXTENSION})")
+        if not filename:
+            return
+        if not filename.lower().endswith(FSCV_EXTENSION):
+            filename += FSCV_EXTENSION
+        try:
+            save_session(filename, {'potential': self.data.potential, 'currents': self.data.currents},
+                         {'fscv': True, 'source_file': self.file_name,
+                          'scan_frequency': self.data.scan_frequency})
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Błąd", f"Nie udało się zapisać nagrania:\n{e}")
+            return
+        QtWidgets.QMessageBox.information(self, "Sukces", f"Nagranie zostało zapisane do pliku {filename}")
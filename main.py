@@ -2,17 +2,86 @@
 Plik main.py
 ------------
 Punkt wejścia do aplikacji. Inicjuje QApplication i wyświetla główne okno.
+
+Przed pierwszym wyświetleniem okna ładowane są tylko Qt, pyqtgraph i NumPy.
+Ciężkie pakiety (SciPy, XlsxWriter) importowane są przy pierwszym użyciu,
+a po pokazaniu okna - dodatkowo w tle, aby pierwsze wygładzanie czy eksport
+nie czekały na import.
+
+Raport czasu uruchomienia:
+    python main.py --startup-report
+wypisuje czas do pierwszego okna, porównuje go z celem STARTUP_TARGET_S,
+sprawdza, czy ciężkie pakiety nie zostały załadowane przed pokazaniem okna,
+i kończy program (kod wyjścia 1, gdy cel nie został osiągnięty).
+Szczegółowy czas importu poszczególnych modułów:
+    python -X importtime main.py --startup-report 2> importtime.log
 """
 
+import time
+
+_START_TIME = time.perf_counter()
+
 import sys
-from PyQt6 import QtWidgets
+import threading
+from PyQt6 import QtWidgets, QtCore
 from main_window import MainWindow
 
+# Docelowy czas od startu interpretera do pierwszego wyświetlenia okna [s]
+STARTUP_TARGET_S = 1.5
+# Pakiety, które nie powinny być ładowane przed pierwszym wyświetleniem okna
+HEAVY_MODULES = ("scipy", "pandas", "xlsxwriter")
+# Moduły importowane w tle po wyświetleniu okna
+WARMUP_MODULES = ("scipy.signal", "xlsxwriter")
+
+
+def warm_up_imports():
+    """Importuje w wątku tle pakiety potrzebne dopiero przy obliczeniach i eksporcie."""
+    def run():
+        for name in WARMUP_MODULES:
+            try:
+                __import__(name)
+            except ImportError:
+                pass
+    threading.Thread(target=run, name="warm-up-imports", daemon=True).start()
+
+
+def startup_report(elapsed: float, loaded_heavy: list) -> bool:
+    """
+    Wypisuje raport uruchomienia na stderr.
+
+    Parameters:
+        elapsed (float): Czas do pierwszego wyświetlenia okna [s].
+        loaded_heavy (list): Ciężkie pakiety załadowane przed wyświetleniem okna.
+
+    Returns:
+        bool: True, jeśli cel czasu został osiągnięty i nie załadowano ciężkich pakietów.
+    """
+    ok = elapsed <= STARTUP_TARGET_S and not loaded_heavy
+    print(f"Czas do pierwszego okna: {elapsed:.3f} s (cel: {STARTUP_TARGET_S:.1f} s)", file=sys.stderr)
+    print(f"Ciężkie pakiety załadowane przed oknem: {', '.join(loaded_heavy) or 'brak'}", file=sys.stderr)
+    print("Wynik: " + ("OK" if ok else "CEL NIEOSIĄGNIĘTY"), file=sys.stderr)
+    return ok
+
+
 def main():
     """Główna funkcja uruchamiająca aplikację."""
-    app = QtWidgets.QApplication(sys.argv)
+    report = "--startup-report" in sys.argv
+    argv = [arg for arg in sys.argv if arg != "--startup-report"]
+    app = QtWidgets.QApplication(argv)
     window = MainWindow()
     window.showMaximized()
+
+    def on_first_window():
+        # Wywoływane z pętli zdarzeń, czyli po pierwszym odrysowaniu okna
+        elapsed = time.perf_counter() - _START_TIME
+        loaded_heavy = [name for name in HEAVY_MODULES if name in sys.modules]
+        if report:
+            ok = startup_report(elapsed, loaded_heavy)
+            app.exit(0 if ok else 1)
+            return
+        warm_up_imports()
+
+    QtCore.QTimer.singleShot(0, on_first_window)
     sys.exit(app.exec())
 
 if __name__ == '__main__':
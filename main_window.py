@@ -5,17 +5,39 @@ Zawiera główną klasę okna aplikacji (MainWindow), w której umieszczona jest
 import danych, obliczeń oraz eksportu wyników do Excela.
 """
 
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
-import pandas as pd
 from PyQt6 import QtWidgets, QtGui, QtCore
 import pyqtgraph as pg
-from scipy.signal import savgol_filter
-import xlsxwriter
 
 from dialogs import AxisSettingsDialog, BaselineSettingsDialog
 from derivative_windows import DerivativeWindow, SecondDerivativeWindow
-from utils import compute_intersections
+from overlay_window import OverlayWindow
+from simulation_window import SimulationWindow
+from degradation_window import DegradationWindow
+from fscv_window import FSCVWindow
+from sensitivity_window import SensitivityWindow
+from noise_window import DEFAULT_FOURIER_SETTINGS, NoiseSpectrumWindow
+from performance_panel import PerformancePanel
+from columnar_export import COLUMNAR_FORMATS, columnar_format
+from excel_export import CHART_POINT_BUDGET
+from export_worker import ExportTask, make_snapshot
+from results_model import RESULT_COLUMNS, ResultsStore, ResultsTableModel
+from session import SESSION_EXTENSION, load_session, save_session
+from watch_folder import RECIPE_EXTENSION, save_recipe
+from workspace import Document, Workspace
+from blank_library import BlankLibrary
+from blank_window import BlankLibraryDialog
+from cvcore import (load_cv, apply_smoothing_pair, default_baseline_settings,
+                    first_derivative, second_derivative, derivatives_at)
+from cvcore.ir_compensation import IRCompensation
+from cvcore.memory import current_rss, dataset_nbytes, readonly
+from cvcore.profiling import profiled, profiler
+from plot_lod import plot_lod
+from crosshair import DataCrosshair
 
 
 class MainWindow(QtWidgets.QMainWindow):
@@ -26,6 +48,23 @@ class MainWindow(QtWidgets.QMainWindow):
         super().__init__()
         self.setWindowTitle("CVision: Analiza woltamogramu cyklicznego")
         self.E_half_line = None
+        self.overlay_window = None
+        self.simulation_window = None
+        self.noise_window = None
+        self.degradation_window = None
+        self.fscv_window = None
+        self.sensitivity_window = None
+        self.performance_panel = None
+        # RSS procesu tuż przed wczytaniem danych - odniesienie raportu pamięci
+        self.rss_before_load = None
+        self.export_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cvision-export")
+        self.export_tasks = {}
+        # Ślepe próby odejmowane od danych surowych przed wygładzaniem ({'name', 'scale'} lub None)
+        self.blank_library = BlankLibrary()
+        self.blank_settings = None
+        self.blank_window = None
+        # Dokumenty (karty) dzielą pulę wątków eksportu i jeden budżet pamięci
+        self.workspace = Workspace(self.export_executor, blank_library=self.blank_library)
         self.plot_widget = pg.PlotWidget(title="Woltamogram")
         self.plot_widget.addLegend()
         self.init_ui()
@@ -40,7 +79,9 @@ class MainWindow(QtWidgets.QMainWindow):
             'x_max': 10,
             'y_min': 0,
             'y_max': 10,
-            'font': QtGui.QFont("Arial", 12)
+            'font': QtGui.QFont("Arial", 12),
+            # Budżet punktów zdecymowanej serii wykresu w eksporcie do Excela (dialog ustawień osi)
+            'chart_points': CHART_POINT_BUDGET,
         }
         self.update_axis_settings()
         self.baseline_settings = {
@@ -60,8 +101,14 @@ class MainWindow(QtWidgets.QMainWindow):
         self.x = None
         self.y1 = None
         self.y2 = None
+        self.file_name = None
         self.measurement_type = 0
-        self.smoothingCheckBox = QtWidgets.QCheckBox("Wygładzanie (Savitzky-Golay)")
+        self.smoothingCheckBox = QtWidgets.QCheckBox("Wygładzanie")
+        self.smoothingMethodCombo = QtWidgets.QComboBox()
+        self.smoothingMethodCombo.addItem("Savitzky-Golay", 'savgol')
+        self.smoothingMethodCombo.addItem("Filtr FFT", 'fft')
+        # Ustawienia filtra FFT edytowane w oknie widma szumu
+        self.fourier_settings = dict(DEFAULT_FOURIER_SETTINGS)
         self.windowSpinBox = QtWidgets.QSpinBox()
         self.windowSpinBox.setRange(3, 101)
         self.windowSpinBox.setSingleStep(2)
@@ -69,18 +116,32 @@ class MainWindow(QtWidgets.QMainWindow):
         self.polySpinBox = QtWidgets.QSpinBox()
         self.polySpinBox.setRange(1, 5)
         self.polySpinBox.setValue(3)
+        # Nieskompensowany opór R_u - korekcja iR pików (E_corr = E - I·R_u)
+        self.ruSpinBox = QtWidgets.QDoubleSpinBox()
+        self.ruSpinBox.setRange(0.0, 1e6)
+        self.ruSpinBox.setDecimals(2)
+        self.ruSpinBox.setSuffix(" Ω")
+        self.ruSpinBox.setToolTip("Nieskompensowany opór R_u: piki i E1/2 wyznaczane na osi E - I·R_u.")
+        self.ir_compensation = None
+        self.ir_curves = []
+        self.peak_rows = {}
         self.raw_y1 = None
         self.raw_y2 = None
         self.smoothingCheckBox.stateChanged.connect(self.update_plot_from_raw_data)
+        self.smoothingMethodCombo.currentIndexChanged.connect(self.update_plot_from_raw_data)
         self.windowSpinBox.valueChanged.connect(self.update_plot_from_raw_data)
         self.polySpinBox.valueChanged.connect(self.update_plot_from_raw_data)
+        self.ruSpinBox.valueChanged.connect(self.update_ir_compensation)
         self.setup_layout()
-        self.resultsTable = QtWidgets.QTableWidget()
-        self.resultsTable.setColumnCount(5)
-        self.resultsTable.setHorizontalHeaderLabels(["Typ", "x_peak", "y_peak", "Baseline", "H/D"])
+        self.results = ResultsStore()
+        self.resultsModel = ResultsTableModel(self.results, self)
+        self.resultsTable = QtWidgets.QTableView()
+        self.resultsTable.setModel(self.resultsModel)
+        self.resultsTable.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Fixed)
         self.centralLayout.addWidget(self.resultsTable)
         self.setStatusBar(QtWidgets.QStatusBar())
-        self.proxy = pg.SignalProxy(self.plot_widget.scene().sigMouseMoved, rateLimit=60, slot=self.mouseMoved)
+        self.crosshair = DataCrosshair(self.plot_widget, self.on_crosshair_moved)
+        self.crosshair.set_selected(self.cursor_curve_combo.currentIndex())
         self.plot_widget.scene().sigMouseClicked.connect(self.on_mouse_click)
 
     def setup_layout(self):
@@ -108,15 +169,46 @@ class MainWindow(QtWidgets.QMainWindow):
         btn_baseline_settings = QtWidgets.QPushButton("Edytuj linię bazową (numerycznie)")
         btn_baseline_settings.clicked.connect(self.edit_baseline_settings)
         top_row1.addWidget(btn_baseline_settings)
+        btn_save_session = QtWidgets.QPushButton("Zapisz sesję")
+        btn_save_session.clicked.connect(self.save_session_file)
+        top_row1.addWidget(btn_save_session)
+        btn_load_session = QtWidgets.QPushButton("Wczytaj sesję")
+        btn_load_session.clicked.connect(self.load_session_file)
+        top_row1.addWidget(btn_load_session)
+        btn_save_recipe = QtWidgets.QPushButton("Zapisz recepturę")
+        btn_save_recipe.clicked.connect(self.save_recipe_file)
+        top_row1.addWidget(btn_save_recipe)
         btn_clear = QtWidgets.QPushButton("Wyczyść wykres")
         btn_clear.clicked.connect(self.clear_plot)
+        btn_clear.clicked.connect(self.update_document_title)
         top_row1.addWidget(btn_clear)
+        btn_new_tab = QtWidgets.QPushButton("Nowa karta")
+        btn_new_tab.clicked.connect(self.new_document)
+        top_row1.addWidget(btn_new_tab)
         btn_axis_settings = QtWidgets.QPushButton("Edytuj ustawienia osi")
         btn_axis_settings.clicked.connect(self.edit_axis_settings)
         top_row1.addWidget(btn_axis_settings)
+        btn_overlay = QtWidgets.QPushButton("Porównaj woltamogramy")
+        btn_overlay.clicked.connect(self.show_overlay_window)
+        top_row1.addWidget(btn_overlay)
+        btn_simulation = QtWidgets.QPushButton("Symulacja CV")
+        btn_simulation.clicked.connect(self.show_simulation_window)
+        top_row1.addWidget(btn_simulation)
+        btn_degradation = QtWidgets.QPushButton("Degradacja (cykle)")
+        btn_degradation.clicked.connect(self.show_degradation_window)
+        top_row1.addWidget(btn_degradation)
+        btn_fscv = QtWidgets.QPushButton("FSCV")
+        btn_fscv.clicked.connect(self.show_fscv_window)
+        top_row1.addWidget(btn_fscv)
+        btn_sensitivity = QtWidgets.QPushButton("Wrażliwość na wygładzanie")
+        btn_sensitivity.clicked.connect(self.show_sensitivity_window)
+        top_row1.addWidget(btn_sensitivity)
         btn_export = QtWidgets.QPushButton("Eksport do Excela")
         btn_export.clicked.connect(self.export_to_excel)
         top_row1.addWidget(btn_export)
+        btn_export_columnar = QtWidgets.QPushButton("Eksport (Parquet/HDF5/CSV)")
+        btn_export_columnar.clicked.connect(self.export_to_columnar)
+        top_row1.addWidget(btn_export_columnar)
         btn_help = QtWidgets.QPushButton("Help")
         btn_help.clicked.connect(self.show_help)
         top_row1.addWidget(btn_help)
@@ -138,6 +230,15 @@ class MainWindow(QtWidgets.QMainWindow):
         btn_second_derivative = QtWidgets.QPushButton("Oblicz drugą pochodną")
         btn_second_derivative.clicked.connect(self.compute_second_derivative)
         top_row2.addWidget(btn_second_derivative)
+        btn_blank = QtWidgets.QPushButton("Ślepe próby")
+        btn_blank.clicked.connect(self.show_blank_window)
+        top_row2.addWidget(btn_blank)
+        btn_noise = QtWidgets.QPushButton("Widmo szumu")
+        btn_noise.clicked.connect(self.show_noise_window)
+        top_row2.addWidget(btn_noise)
+        btn_performance = QtWidgets.QPushButton("Wydajność")
+        btn_performance.clicked.connect(self.show_performance_panel)
+        top_row2.addWidget(btn_performance)
         self.combo_theme = QtWidgets.QComboBox()
         self.combo_theme.addItems(["Ciemny", "Jasny"])
         for i in range(self.combo_theme.count()):
@@ -148,23 +249,48 @@ class MainWindow(QtWidgets.QMainWindow):
             )
         self.combo_theme.currentTextChanged.connect(self.apply_theme)
         top_row2.addWidget(self.combo_theme)
+        top_row2.addWidget(QtWidgets.QLabel("Kursor:"))
+        self.cursor_curve_combo = QtWidgets.QComboBox()
+        self.cursor_curve_combo.addItems(["Utlenianie", "Redukcja"])
+        self.cursor_curve_combo.currentIndexChanged.connect(lambda index: self.crosshair.set_selected(index))
+        top_row2.addWidget(self.cursor_curve_combo)
         top_row2.addWidget(self.smoothingCheckBox)
+        top_row2.addWidget(self.smoothingMethodCombo)
         top_row2.addWidget(QtWidgets.QLabel("Okno:"))
         top_row2.addWidget(self.windowSpinBox)
         top_row2.addWidget(QtWidgets.QLabel("Stopień:"))
         top_row2.addWidget(self.polySpinBox)
+        top_row2.addWidget(QtWidgets.QLabel("R_u:"))
+        top_row2.addWidget(self.ruSpinBox)
         central_widget = QtWidgets.QWidget()
         self.setCentralWidget(central_widget)
         self.centralLayout = QtWidgets.QVBoxLayout(central_widget)
         self.centralLayout.addLayout(top_layout)
+        self.document_tabs = QtWidgets.QTabBar()
+        self.document_tabs.setTabsClosable(True)
+        self.document_tabs.setExpanding(False)
+        self.document_tabs.setDocumentMode(True)
+        self.document_tabs.addTab("Nowy")
+        self.document_tabs.currentChanged.connect(self.switch_document)
+        self.document_tabs.tabCloseRequested.connect(self.close_document)
+        self.centralLayout.addWidget(self.document_tabs)
         self.centralLayout.addWidget(self.plot_widget)
 
-    def mouseMoved(self, evt):
-        """Wyświetla bieżące współrzędne kursora w pasku stanu."""
-        pos = evt[0]
-        if self.plot_widget.sceneBoundingRect().contains(pos):
-            mouse_point = self.plot_widget.getViewBox().mapSceneToView(pos)
+    def on_crosshair_moved(self, index, curve_index, mouse_point):
+        """
+        Wyświetla w pasku stanu wartości danych w punkcie, do którego przyciągnięto kursor:
+        E, I_ox, I_red oraz pierwszą i drugą pochodną wybranej krzywej.
+        """
+        if index is None:
             self.statusBar().showMessage(f"x = {mouse_point.x():.3f}, y = {mouse_point.y():.3f}")
+            return
+        curve = self.y1 if curve_index == 0 else self.y2
+        d1, d2 = derivatives_at(self.x, curve, index)
+        name = "utl." if curve_index == 0 else "red."
+        self.statusBar().showMessage(
+            f"E = {self.x[index]:.3f}, I_ox = {self.y1[index]:.3f}, I_red = {self.y2[index]:.3f}, "
+            f"d1 ({name}) = {d1:.4g}, d2 ({name}) = {d2:.4g}"
+        )
 
     def init_ui(self):
         """Dodatkowa inicjalizacja interfejsu (aktualnie pusta)."""
@@ -186,23 +312,24 @@ class MainWindow(QtWidgets.QMainWindow):
         file_name, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Wybierz plik z danymi", "",
                                                              "Pliki tekstowe (*.txt);;Wszystkie pliki (*)")
         if file_name:
+            measurement_type = self.measurement_type_combo.currentIndex()
+            rss_before_load = current_rss()
             try:
-                data = np.loadtxt(file_name)
-                self.measurement_type = self.measurement_type_combo.currentIndex()
-                if self.measurement_type == 0:
-                    self.x = data[:, 0]
-                    self.raw_y1 = data[:, 1]
-                    self.raw_y2 = data[:, 2]
-                else:
-                    self.x = data[:, 0]
-                    self.raw_y1 = data[:, 2]
-                    self.raw_y2 = data[:, 1]
-                if np.any(np.diff(self.x) < 0):
-                    idx_sort = np.argsort(self.x)
-                    self.x = self.x[idx_sort]
-                    self.raw_y1 = self.raw_y1[idx_sort]
-                    self.raw_y2 = self.raw_y2[idx_sort]
+                data = readonly(*load_cv(file_name, measurement_type))
+            except Exception as e:
+                QtWidgets.QMessageBox.critical(self, "Błąd", f"Nie udało się zaimportować danych z pliku.\n{str(e)}")
+                return
+            if self.x is not None:
+                # Karta zawiera już dane - plik otwierany jest na nowej karcie (dopiero po udanym wczytaniu)
+                self.new_document()
+            try:
+                self.rss_before_load = rss_before_load
+                self.x, self.raw_y1, self.raw_y2 = data
+                self.file_name = file_name
+                self.measurement_type = measurement_type
                 self.update_plot_from_raw_data()
+                self.update_document_title()
+                self.enforce_memory_budget()
             except Exception as e:
                 QtWidgets.QMessageBox.critical(self, "Błąd", f"Nie udało się zaimportować danych z pliku.\n{str(e)}")
 
@@ -210,40 +337,49 @@ class MainWindow(QtWidgets.QMainWindow):
         """Aktualizuje wykres główny na podstawie danych surowych i opcjonalnie stosuje wygładzanie."""
         if self.x is None or self.raw_y1 is None or self.raw_y2 is None:
             return
-        if self.smoothingCheckBox.isChecked():
-            window_length = self.windowSpinBox.value()
-            polyorder = self.polySpinBox.value()
-            if window_length % 2 == 0:
-                window_length += 1
-            if window_length > len(self.raw_y1):
-                window_length = len(self.raw_y1) if len(self.raw_y1) % 2 == 1 else len(self.raw_y1) - 1
-            self.y1 = savgol_filter(self.raw_y1, window_length, polyorder)
-            self.y2 = savgol_filter(self.raw_y2, window_length, polyorder)
-        else:
-            self.y1 = self.raw_y1.copy()
-            self.y2 = self.raw_y2.copy()
+        with profiler.stage("update_plot_from_raw_data", n_points=len(self.x)):
+            source_y1, source_y2 = self.background_corrected()
+            # Bez wygładzania (i bez ślepej próby) krzywe wskazują na dane surowe (tylko do odczytu) - bez kopii
+            y1, y2 = source_y1, source_y2
+            if self.smoothingCheckBox.isChecked():
+                try:
+                    y1, y2 = apply_smoothing_pair(self.x, source_y1, source_y2, self.smoothing_settings())
+                except ValueError as e:
+                    QtWidgets.QMessageBox.warning(self, "Błąd wygładzania",
+                                                  f"Nie udało się wygładzić danych.\n{str(e)}")
+                    if self.y1 is not None and self.y2 is not None:
+                        # Poprzednie krzywe i wykres pozostają bez zmian
+                        return
+            # Zwolnienie poprzednich krzywych i ich piramid LOD dopiero po udanym wyznaczeniu nowych
+            self.plot_widget.clear()
+            self.y1, self.y2 = y1, y2
+            self.redraw_curves()
+            self.axis_settings['x_min'] = np.min(self.x)
+            self.axis_settings['x_max'] = np.max(self.x)
+            self.axis_settings['y_min'] = min(np.min(self.y1), np.min(self.y2))
+            self.axis_settings['y_max'] = max(np.max(self.y1), np.max(self.y2))
+            self.update_axis_settings()
+            self.baseline_settings = default_baseline_settings(self.x, self.y1, self.y2)
+            self.update_baseline_lines()
+
+    @profiled("redraw_curves")
+    def redraw_curves(self):
+        """Rysuje od nowa krzywe utleniania i redukcji (bez ponownego wygładzania)."""
         self.plot_widget.clear()
         self.plot_widget.addLegend()
-        self.plot_widget.plot(self.x, self.y1, pen=pg.mkPen(color='b', width=2), name='Utlenianie')
-        self.plot_widget.plot(self.x, self.y2, pen=pg.mkPen(color='r', width=2), name='Redukcja')
-        new_x_min = np.min(self.x)
-        new_x_max = np.max(self.x)
-        new_y_min = min(np.min(self.y1), np.min(self.y2))
-        new_y_max = max(np.max(self.y1), np.max(self.y2))
-        self.axis_settings['x_min'] = new_x_min
-        self.axis_settings['x_max'] = new_x_max
-        self.axis_settings['y_min'] = new_y_min
-        self.axis_settings['y_max'] = new_y_max
-        self.update_axis_settings()
-        mid_x = (new_x_min + new_x_max) / 2
-        self.baseline_settings['oxidation'] = {'x1': new_x_min, 'y1': new_y_min, 'x2': mid_x, 'y2': new_y_min}
-        self.baseline_settings['reduction'] = {'x1': mid_x, 'y1': new_y_min, 'x2': new_x_max, 'y2': new_y_min}
-        self.update_baseline_lines()
+        plot_lod(self.plot_widget, self.x, self.y1, pen=pg.mkPen(color='b', width=2), name='Utlenianie')
+        plot_lod(self.plot_widget, self.x, self.y2, pen=pg.mkPen(color='r', width=2), name='Redukcja')
+        self.crosshair.attach()
+        self.crosshair.set_data(self.x, [self.y1, self.y2])
+        self.ir_curves = []
+        self.draw_ir_curves()
 
     def clear_plot(self):
         """Czyści wykres oraz resetuje wszystkie dane i elementy graficzne."""
         self.plot_widget.clear()
         self.plot_widget.addLegend()
+        self.crosshair.attach()
+        self.crosshair.set_data(None, None)
         self.update_axis_settings()
         for item in [self.baseline_region_oxidation, self.baseline_region_reduction,
                      self.baseline_line_oxidation, self.baseline_line_reduction,
@@ -264,13 +400,17 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ip_c_line = None
         self.peak_curve_oxidation = None
         self.peak_curve_reduction = None
-        self.resultsTable.setRowCount(0)
+        self.resultsModel.clear()
+        self.peak_rows = {}
+        self.ir_curves = []
+        self.ir_compensation = None
 
         self.x = None
         self.raw_y1 = None
         self.raw_y2 = None
         self.y1 = None
         self.y2 = None
+        self.file_name = None
         if hasattr(self, "deriv_y1"):
             self.deriv_y1 = None
         if hasattr(self, "deriv_y2"):
@@ -281,6 +421,63 @@ class MainWindow(QtWidgets.QMainWindow):
             self.second_deriv_y2 = None
         self.measurement_type = 0
 
+    def show_overlay_window(self):
+        """Otwiera (niemodalnie) okno porównania wielu woltamogramów."""
+        if self.overlay_window is None:
+            self.overlay_window = OverlayWindow(self)
+        self.overlay_window.show()
+        self.overlay_window.raise_()
+
+    def show_blank_window(self):
+        """Otwiera (niemodalnie) okno biblioteki ślepych prób."""
+        if self.blank_window is None:
+            self.blank_window = BlankLibraryDialog(self)
+        self.blank_window.refresh()
+        self.blank_window.show()
+        self.blank_window.raise_()
+
+    def show_noise_window(self):
+        """Otwiera (niemodalnie) okno widma szumu i filtra FFT."""
+        if self.noise_window is None:
+            self.noise_window = NoiseSpectrumWindow(self)
+        self.noise_window.show()
+        self.noise_window.raise_()
+
+    def show_degradation_window(self):
+        """Otwiera (niemodalnie) okno trendów parametrów pików w kolejnych cyklach."""
+        if self.degradation_window is None:
+            self.degradation_window = DegradationWindow(self)
+        self.degradation_window.show()
+        self.degradation_window.raise_()
+
+    def show_fscv_window(self):
+        """Otwiera (niemodalnie) okno nagrań FSCV z wykresem barwnym."""
+        if self.fscv_window is None:
+            self.fscv_window = FSCVWindow(self)
+        self.fscv_window.show()
+        self.fscv_window.raise_()
+
+    def show_sensitivity_window(self):
+        """Otwiera (niemodalnie) okno map wrażliwości wyników pików na parametry wygładzania."""
+        if self.sensitivity_window is None:
+            self.sensitivity_window = SensitivityWindow(self)
+        self.sensitivity_window.show()
+        self.sensitivity_window.raise_()
+
+    def show_simulation_window(self):
+        """Otwiera (niemodalnie) okno symulacji teoretycznych woltamogramów."""
+        if self.simulation_window is None:
+            self.simulation_window = SimulationWindow(self)
+        self.simulation_window.show()
+        self.simulation_window.raise_()
+
+    def show_performance_panel(self):
+        """Otwiera (niemodalnie) panel czasów etapów analizy i rysowania."""
+        if self.performance_panel is None:
+            self.performance_panel = PerformancePanel(self)
+        self.performance_panel.show()
+        self.performance_panel.raise_()
+
     def edit_axis_settings(self):
         """Otwiera dialog edycji ustawień osi."""
         dialog = AxisSettingsDialog(self.axis_settings, self)
@@ -388,6 +585,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.plot_widget.setXRange(x_min, x_max)
         self.plot_widget.setYRange(y_min, y_max)
 
+    @profiled("update_baseline_lines")
     def update_baseline_lines(self):
         """Rysuje na wykresie linie bazowe oraz regiony interaktywne dla utlenienia i redukcji."""
         self.is_updating_baseline = True
@@ -462,6 +660,39 @@ class MainWindow(QtWidgets.QMainWindow):
         if self.x is None:
             QtWidgets.QMessageBox.warning(self, "Brak danych", "Najpierw zaimportuj dane.")
             return
+        analysis = self.peak_analysis()
+        results = self.draw_peak_analysis(analysis)
+        # Wiersze tabeli tych wyników - aktualizowane w miejscu przy zmianie R_u
+        self.peak_rows = {}
+        for name, peak in (("Utlenienie", analysis.oxidation), ("Redukcja", analysis.reduction)):
+            if peak is not None:
+                self.peak_rows[name] = len(self.results)
+                self.insert_result_row(name, peak.x_peak, peak.y_peak, peak.baseline, peak.height)
+        if analysis.e_half is not None:
+            self.peak_rows["E1/2"] = len(self.results)
+            self.insert_result_row("E1/2", analysis.e_half, "", "", "")
+        QtWidgets.QMessageBox.information(self, "Parametry piku", results)
+
+    def peak_analysis(self):
+        """
+        Wyznacza piki bieżących krzywych; przy R_u > 0 na osiach skorygowanych
+        o spadek omowy (leniwa korekcja z pamięcią podręczną, bez ponownego wygładzania).
+
+        Returns:
+            PeakAnalysis: Wyniki obu gałęzi oraz E1/2.
+        """
+        if self.ir_compensation is None or not self.ir_compensation.matches(self.x, self.y1, self.y2):
+            self.ir_compensation = IRCompensation(self.x, self.y1, self.y2)
+        return self.ir_compensation.peaks(self.ruSpinBox.value(), self.baseline_settings)
+
+    def draw_peak_analysis(self, analysis):
+        """
+        Rysuje opisy, linie Ip i krzywe wysokości pików oraz linię E1/2
+        (zastępując poprzednie).
+
+        Returns:
+            str: Opis wyników do okna komunikatu.
+        """
         for item in [self.peak_text_oxidation, self.peak_text_reduction, self.ip_a_line, self.ip_c_line,
                      self.peak_curve_oxidation, self.peak_curve_reduction]:
             if item is not None:
@@ -473,82 +704,94 @@ class MainWindow(QtWidgets.QMainWindow):
         self.peak_curve_oxidation = None
         self.peak_curve_reduction = None
         results = ""
-        ox = self.baseline_settings['oxidation']
-        ox_x1, ox_y1, ox_x2, ox_y2 = ox['x1'], ox['y1'], ox['x2'], ox['y2']
-        region_min = min(ox_x1, ox_x2)
-        region_max = max(ox_x1, ox_x2)
-        mask = (self.x >= region_min) & (self.x <= region_max)
-        if np.any(mask):
-            x_region = self.x[mask]
-            y_region = self.y1[mask]
-            idx_peak = np.argmax(y_region)
-            x_peak = x_region[idx_peak]
-            y_peak = y_region[idx_peak]
-            baseline_val = ox_y1 + (ox_y2 - ox_y1) * (x_peak - ox_x1) / (ox_x2 - ox_x1) if ox_x2 != ox_x1 else ox_y1
-            height = y_peak - baseline_val
+        ox = analysis.oxidation
+        if ox is not None:
             text = (f"Utlenienie:\n"
-                    f"x_peak = {x_peak:.3f}\n"
-                    f"y_peak = {y_peak:.3f}\n"
-                    f"baseline = {baseline_val:.3f}\n"
-                    f"height = {height:.3f}")
+                    f"x_peak = {ox.x_peak:.3f}\n"
+                    f"y_peak = {ox.y_peak:.3f}\n"
+                    f"baseline = {ox.baseline:.3f}\n"
+                    f"height = {ox.height:.3f}")
             self.peak_text_oxidation = pg.TextItem(text=text, color='b', anchor=(0.5, -1.0))
-            self.peak_text_oxidation.setPos(x_peak, y_peak)
+            self.peak_text_oxidation.setPos(ox.x_peak, ox.y_peak)
             self.plot_widget.addItem(self.peak_text_oxidation)
-            results += f"Utlenienie: x_peak={x_peak:.3f}, y_peak={y_peak:.3f}, baseline={baseline_val:.3f}, height={height:.3f}\n"
-            self.ip_a_line = self.plot_widget.plot([x_peak, x_peak], [baseline_val, y_peak],
+            results += f"Utlenienie: x_peak={ox.x_peak:.3f}, y_peak={ox.y_peak:.3f}, baseline={ox.baseline:.3f}, height={ox.height:.3f}\n"
+            self.ip_a_line = self.plot_widget.plot([ox.x_peak, ox.x_peak], [ox.baseline, ox.y_peak],
                                                    pen=pg.mkPen(color='b', width=2, style=QtCore.Qt.PenStyle.DashLine),
                                                    name="Ip,a")
-            baseline_curve = ox_y1 + (ox_y2 - ox_y1) * (x_region - ox_x1) / (ox_x2 - ox_x1)
-            peak_height_curve = self.y1[mask] - baseline_curve
-            self.peak_curve_oxidation = self.plot_widget.plot(x_region, peak_height_curve,
-                                                              pen=pg.mkPen(color='c', width=2),
-                                                              name="Peak Height Ox")
-            self.insert_result_row("Utlenienie", x_peak, y_peak, baseline_val, height)
+            self.peak_curve_oxidation = plot_lod(self.plot_widget, ox.x_region, ox.height_curve,
+                                                 pen=pg.mkPen(color='c', width=2),
+                                                 name="Peak Height Ox")
         else:
             results += "Utlenienie: brak danych w zadanym zakresie.\n\n"
-        red = self.baseline_settings['reduction']
-        red_x1, red_y1, red_x2, red_y2 = red['x1'], red['y1'], red['x2'], red['y2']
-        region_min = min(red_x1, red_x2)
-        region_max = max(red_x1, red_x2)
-        mask = (self.x >= region_min) & (self.x <= region_max)
-        if np.any(mask):
-            x_region = self.x[mask]
-            y_region = self.y2[mask]
-            idx_peak = np.argmin(y_region)
-            x_peak = x_region[idx_peak]
-            y_peak = y_region[idx_peak]
-            baseline_val = red_y1 + (red_y2 - red_y1) * (x_peak - red_x1) / (red_x2 - red_x1) if red_x2 != red_x1 else red_y1
-            depth = baseline_val - y_peak
+        red = analysis.reduction
+        if red is not None:
             text = (f"Redukcja:\n"
-                    f"x_peak = {x_peak:.3f}\n"
-                    f"y_peak = {y_peak:.3f}\n"
-                    f"baseline = {baseline_val:.3f}\n"
-                    f"depth = {depth:.3f}")
+                    f"x_peak = {red.x_peak:.3f}\n"
+                    f"y_peak = {red.y_peak:.3f}\n"
+                    f"baseline = {red.baseline:.3f}\n"
+                    f"depth = {red.height:.3f}")
             self.peak_text_reduction = pg.TextItem(text=text, color='r', anchor=(0.5, -1.0))
-            self.peak_text_reduction.setPos(x_peak, y_peak)
+            self.peak_text_reduction.setPos(red.x_peak, red.y_peak)
             self.plot_widget.addItem(self.peak_text_reduction)
-            results += f"Redukcja: x_peak={x_peak:.3f}, y_peak={y_peak:.3f}, baseline={baseline_val:.3f}, depth={depth:.3f}\n"
-            self.ip_c_line = self.plot_widget.plot([x_peak, x_peak], [y_peak, baseline_val],
+            results += f"Redukcja: x_peak={red.x_peak:.3f}, y_peak={red.y_peak:.3f}, baseline={red.baseline:.3f}, depth={red.height:.3f}\n"
+            self.ip_c_line = self.plot_widget.plot([red.x_peak, red.x_peak], [red.y_peak, red.baseline],
                                                    pen=pg.mkPen(color='r', width=2, style=QtCore.Qt.PenStyle.DashLine),
                                                    name="Ip,c")
-            baseline_curve = red_y1 + (red_y2 - red_y1) * (x_region - red_x1) / (red_x2 - red_x1)
-            peak_height_curve = self.y2[mask] - baseline_curve
-            self.peak_curve_reduction = self.plot_widget.plot(x_region, peak_height_curve,
-                                                              pen=pg.mkPen(color='m', width=2),
-                                                              name="Peak Height Red")
-            self.insert_result_row("Redukcja", x_peak, y_peak, baseline_val, depth)
+            self.peak_curve_reduction = plot_lod(self.plot_widget, red.x_region, red.height_curve,
+                                                 pen=pg.mkPen(color='m', width=2),
+                                                 name="Peak Height Red")
         else:
             results += "Redukcja: brak danych w zadanym zakresie.\n"
-        if self.peak_text_oxidation is not None and self.peak_text_reduction is not None:
-            E_half = (self.peak_text_oxidation.pos().x() + self.peak_text_reduction.pos().x()) / 2.0
-            self.insert_result_row("E1/2", E_half, "", "", "")
-            if self.E_half_line is not None:
-                self.plot_widget.removeItem(self.E_half_line)
+        E_half = analysis.e_half
+        if self.E_half_line is not None:
+            self.plot_widget.removeItem(self.E_half_line)
+            self.E_half_line = None
+        if E_half is not None:
             self.E_half_line = pg.InfiniteLine(pos=E_half, angle=90,
                                                pen=pg.mkPen(color='g', width=2, style=QtCore.Qt.PenStyle.DashLine))
             self.plot_widget.addItem(self.E_half_line)
             results += f"E1/2: {E_half:.3f}\n"
-        QtWidgets.QMessageBox.information(self, "Parametry piku", results)
+        return results
+
+    def update_ir_compensation(self):
+        """
+        Po zmianie R_u przerysowuje krzywe skorygowane o spadek omowy oraz
+        przelicza ostatnio wyznaczone piki i E1/2 (wiersze tabeli zmieniane w miejscu).
+        """
+        if self.x is None or self.y1 is None:
+            return
+        with profiler.stage("update_ir_compensation", n_points=len(self.x)):
+            self.draw_ir_curves()
+            if not self.peak_rows:
+                return
+            analysis = self.peak_analysis()
+            self.draw_peak_analysis(analysis)
+            peaks = {"Utlenienie": analysis.oxidation, "Redukcja": analysis.reduction}
+            for name, row in self.peak_rows.items():
+                if name == "E1/2":
+                    values = [np.nan if analysis.e_half is None else analysis.e_half, np.nan, np.nan, np.nan]
+                else:
+                    peak = peaks[name]
+                    values = ([np.nan] * 4 if peak is None
+                              else [peak.x_peak, peak.y_peak, peak.baseline, peak.height])
+                self.resultsModel.update_row(row, values)
+
+    def draw_ir_curves(self):
+        """Rysuje (linią przerywaną) gałęzie na osiach skorygowanych o spadek omowy, gdy R_u > 0."""
+        for item in self.ir_curves:
+            self.plot_widget.removeItem(item)
+        self.ir_curves = []
+        r_u = self.ruSpinBox.value()
+        if not r_u or self.x is None or self.y1 is None:
+            return
+        if self.ir_compensation is None or not self.ir_compensation.matches(self.x, self.y1, self.y2):
+            self.ir_compensation = IRCompensation(self.x, self.y1, self.y2)
+        style = QtCore.Qt.PenStyle.DashLine
+        for branch, color, name in zip(self.ir_compensation.branches(r_u), ('b', 'r'),
+                                       ('Utlenianie (iR)', 'Redukcja (iR)')):
+            axis, y = branch.sorted_view()
+            self.ir_curves.append(plot_lod(self.plot_widget, axis, y,
+                                           pen=pg.mkPen(color=color, width=1, style=style), name=name))
 
     def insert_result_row(self, peak_type, x_peak, y_peak, baseline, h_or_d):
         """
@@ -561,13 +804,8 @@ class MainWindow(QtWidgets.QMainWindow):
             baseline (float): Wartość linii bazowej.
             h_or_d (float): Wysokość lub głębokość piku.
         """
-        row_position = self.resultsTable.rowCount()
-        self.resultsTable.insertRow(row_position)
-        self.resultsTable.setItem(row_position, 0, QtWidgets.QTableWidgetItem(str(peak_type)))
-        self.resultsTable.setItem(row_position, 1, QtWidgets.QTableWidgetItem(f"{x_peak:.3f}" if x_peak != "" else ""))
-        self.resultsTable.setItem(row_position, 2, QtWidgets.QTableWidgetItem(f"{y_peak:.3f}" if y_peak != "" else ""))
-        self.resultsTable.setItem(row_position, 3, QtWidgets.QTableWidgetItem(f"{baseline:.3f}" if baseline != "" else ""))
-        self.resultsTable.setItem(row_position, 4, QtWidgets.QTableWidgetItem(f"{h_or_d:.3f}" if h_or_d != "" else ""))
+        values = [np.nan if isinstance(v, str) else v for v in (x_peak, y_peak, baseline, h_or_d)]
+        self.resultsModel.append_rows([peak_type], [values])
 
     def compute_derivative(self):
         """Oblicza pierwsze pochodne i otwiera okno analizy pochodnych."""
@@ -575,8 +813,8 @@ class MainWindow(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.warning(self, "Brak danych", "Najpierw zaimportuj dane.")
             return
         # 1) Obliczamy pierwsze pochodne
-        self.deriv_y1 = np.gradient(self.y1, self.x)
-        self.deriv_y2 = np.gradient(self.y2, self.x)
+        self.deriv_y1 = first_derivative(self.x, self.y1)
+        self.deriv_y2 = first_derivative(self.x, self.y2)
         # 2) Otwieramy okno, by je wizualnie zbadać i odczytać miejsca zerowe
         derivative_window = DerivativeWindow(self.x, self.deriv_y1, self.deriv_y2, self)
         derivative_window.exec()
@@ -600,23 +838,161 @@ class MainWindow(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.warning(self, "Brak danych", "Najpierw zaimportuj dane.")
             return
         # 1) Obliczamy drugą pochodną
-        first_deriv_y1 = np.gradient(self.y1, self.x)
-        first_deriv_y2 = np.gradient(self.y2, self.x)
-        self.second_deriv_y1 = np.gradient(first_deriv_y1, self.x)
-        self.second_deriv_y2 = np.gradient(first_deriv_y2, self.x)
+        self.second_deriv_y1 = second_derivative(self.x, self.y1)
+        self.second_deriv_y2 = second_derivative(self.x, self.y2)
         # 2) Pokaż okno analizy i zbierz miejsca zerowe
         second_derivative_window = SecondDerivativeWindow(self.x, self.second_deriv_y1, self.second_deriv_y2, self)
         second_derivative_window.exec()
         zeros2 = second_derivative_window.intersections
         # 3) Wstaw je do tabeli wyników
         if zeros2:
-            for x0, y0 in zeros2:
-                # Przykładowa etykieta w tabeli: "Zero crossing 2nd"
-                self.insert_result_row("Zero crossing 2nd", x0, y0, "", "")
+            # Wszystkie miejsca zerowe dodajemy jedną paczką
+            values = np.full((len(zeros2), 4), np.nan)
+            values[:, :2] = zeros2
+            self.resultsModel.append_rows(["Zero crossing 2nd"] * len(zeros2), values)
         # 4) Zapisz na przyszłość
         self.second_deriv_intersections = zeros2
 
 
+    def collect_export_columns(self):
+        """
+        Zbiera kolumny danych do eksportu: dane surowe, wygładzone oraz pochodne.
+
+        Returns:
+            dict: Słownik nazwa kolumny -> tablica wartości.
+        """
+        columns = {
+            "x": self.x,
+            "y_ox": self.raw_y1 if self.raw_y1 is not None else np.full(len(self.x), np.nan),
+            "y_red": self.raw_y2 if self.raw_y2 is not None else np.full(len(self.x), np.nan),
+        }
+
+        if self.smoothingCheckBox.isChecked():
+            columns["smoothed_y_ox"] = self.y1
+            columns["smoothed_y_red"] = self.y2
+        elif self.blank_settings:
+            columns["corrected_y_ox"] = self.y1
+            columns["corrected_y_red"] = self.y2
+
+        if hasattr(self, "deriv_y1") and self.deriv_y1 is not None:
+            columns["deriv_ox"] = self.deriv_y1
+        if hasattr(self, "deriv_y2") and self.deriv_y2 is not None:
+            columns["deriv_red"] = self.deriv_y2
+        if hasattr(self, "second_deriv_y1") and self.second_deriv_y1 is not None:
+            columns["second_deriv_ox"] = self.second_deriv_y1
+        if hasattr(self, "second_deriv_y2") and self.second_deriv_y2 is not None:
+            columns["second_deriv_red"] = self.second_deriv_y2
+        return columns
+
+    def collect_result_rows(self):
+        """
+        Odczytuje wiersze wyników oraz wartość E1/2 bezpośrednio z magazynu wyników.
+
+        Returns:
+            tuple: (nagłówek, wiersze, E1/2).
+        """
+        row = self.results.find("E1/2")
+        e_half = self.results.value(row, "x_peak") if row is not None else 0.0
+        return list(RESULT_COLUMNS), self.results.export_rows(), e_half
+
+    def memory_arrays(self):
+        """
+        Zwraca tablice bieżącego zbioru danych do raportu pamięci (cvcore.memory.dataset_report).
+
+        Returns:
+            dict: Nazwa -> tablica (None, gdy nie obliczono).
+        """
+        return {
+            'x': self.x, 'raw_y1': self.raw_y1, 'raw_y2': self.raw_y2,
+            'y1': self.y1, 'y2': self.y2,
+            'deriv_y1': getattr(self, 'deriv_y1', None), 'deriv_y2': getattr(self, 'deriv_y2', None),
+            'second_deriv_y1': getattr(self, 'second_deriv_y1', None),
+            'second_deriv_y2': getattr(self, 'second_deriv_y2', None),
+        }
+
+    def background_corrected(self):
+        """
+        Zwraca dane surowe po odjęciu wybranej ślepej próby (lub dane surowe,
+        gdy odejmowanie jest wyłączone). Ślepa próba, której nie da się wczytać,
+        jest wyłączana z ostrzeżeniem.
+
+        Returns:
+            tuple: (prąd utleniania, prąd redukcji).
+        """
+        try:
+            return self.workspace.background_corrected(self.blank_settings, self.x, self.raw_y1, self.raw_y2)
+        except (OSError, KeyError, ValueError) as e:
+            QtWidgets.QMessageBox.warning(self, "Ślepa próba",
+                                          f"Nie udało się odjąć ślepej próby {self.blank_settings['name']}.\n{str(e)}")
+            self.blank_settings = None
+            return self.raw_y1, self.raw_y2
+
+    def set_blank(self, settings):
+        """
+        Ustawia odejmowaną ślepą próbę i przelicza krzywe.
+
+        Parameters:
+            settings (dict): {'name', 'scale'} lub None (bez odejmowania).
+        """
+        self.blank_settings = dict(settings) if settings else None
+        self.update_plot_from_raw_data()
+        if self.blank_window is not None:
+            self.blank_window.refresh()
+
+    def smoothing_settings(self):
+        """
+        Zwraca ustawienia wygładzania (cvcore.apply_smoothing): metodę, parametry
+        filtra Savitzky'ego-Golaya i parametry filtra FFT.
+
+        Returns:
+            dict: Ustawienia wygładzania.
+        """
+        return {
+            'enabled': self.smoothingCheckBox.isChecked(),
+            'method': self.smoothingMethodCombo.currentData(),
+            'window_length': self.windowSpinBox.value(),
+            'polyorder': self.polySpinBox.value(),
+            **self.fourier_settings,
+        }
+
+    def set_fourier_smoothing(self, settings):
+        """
+        Włącza wygładzanie filtrem FFT z podanymi ustawieniami i przelicza krzywe.
+
+        Parameters:
+            settings (dict): Ustawienia filtra (scan_rate, lowpass, notch, harmonics, notch_width).
+        """
+        self.fourier_settings.update(settings)
+        for widget in (self.smoothingCheckBox, self.smoothingMethodCombo):
+            widget.blockSignals(True)
+        self.smoothingCheckBox.setChecked(True)
+        self.smoothingMethodCombo.setCurrentIndex(self.smoothingMethodCombo.findData('fft'))
+        for widget in (self.smoothingCheckBox, self.smoothingMethodCombo):
+            widget.blockSignals(False)
+        self.update_plot_from_raw_data()
+
+    def analysis_settings(self):
+        """
+        Zwraca ustawienia analizy (plik źródłowy, wygładzanie, linie bazowe, osie)
+        w postaci możliwej do zapisania jako JSON.
+
+        Returns:
+            dict: Ustawienia analizy.
+        """
+        return {
+            'source_file': self.file_name,
+            'measurement_type': self.measurement_type,
+            'smoothing': self.smoothing_settings(),
+            'blank': self.blank_settings,
+            'r_u': self.ruSpinBox.value(),
+            'baseline_settings': {key: {k: float(v) for k, v in values.items()}
+                                  for key, values in self.baseline_settings.items()},
+            'axis': {
+                'x_label': self.axis_settings.get('x_label', 'E [mV]'),
+                'y_label': self.axis_settings.get('y_label', 'I [μA]'),
+            },
+        }
+
     def export_to_excel(self):
         """Eksportuje dane, parametry i wykres do pliku Excel."""
         if self.x is None:
@@ -626,114 +1002,325 @@ class MainWindow(QtWidgets.QMainWindow):
         if not filename:
             return
 
-        df = pd.DataFrame({
-            "x": self.x,
-            "y_ox": self.raw_y1 if self.raw_y1 is not None else np.nan,
-            "y_red": self.raw_y2 if self.raw_y2 is not None else np.nan,
-        })
+        with profiler.stage("export_snapshot", n_points=len(self.x)):
+            columns = self.collect_export_columns()
+            params_header, params_rows, self.E_half = self.collect_result_rows()
+            snapshot = make_snapshot(
+                filename, 'excel', columns, params_header, params_rows,
+                getattr(self, "deriv_intersections", None),
+                getattr(self, "second_deriv_intersections", None),
+                self.E_half, self.measurement_type, self.analysis_settings(),
+                chart_points=int(self.axis_settings.get('chart_points', CHART_POINT_BUDGET))
+            )
+        self.start_export(snapshot)
 
-        if self.smoothingCheckBox.isChecked():
-            df["smoothed_y_ox"] = self.y1
-            df["smoothed_y_red"] = self.y2
+    def export_to_columnar(self):
+        """Eksportuje dane i wyniki do formatu Parquet, HDF5 lub skompresowanego CSV."""
+        if self.x is None:
+            QtWidgets.QMessageBox.warning(self, "Brak danych", "Brak danych do eksportu.")
+            return
+        filters = ";;".join(f"{name} (*{extension})" for extension, name in COLUMNAR_FORMATS.items())
+        filename, selected_filter = QtWidgets.QFileDialog.getSaveFileName(self, "Eksport danych", "", filters)
+        if not filename:
+            return
+        if columnar_format(filename) is None:
+            for extension, name in COLUMNAR_FORMATS.items():
+                if selected_filter.startswith(name):
+                    filename += extension
+                    break
 
-        if hasattr(self, "deriv_y1") and self.deriv_y1 is not None:
-            df["deriv_ox"] = self.deriv_y1
-        if hasattr(self, "deriv_y2") and self.deriv_y2 is not None:
-            df["deriv_red"] = self.deriv_y2
-        if hasattr(self, "second_deriv_y1") and self.second_deriv_y1 is not None:
-            df["second_deriv_ox"] = self.second_deriv_y1
-        if hasattr(self, "second_deriv_y2") and self.second_deriv_y2 is not None:
-            df["second_deriv_red"] = self.second_deriv_y2
-
-        table_rows = self.resultsTable.rowCount()
-        table_data = []
-        for row in range(table_rows):
-            row_data = {}
-            for col in range(self.resultsTable.columnCount()):
-                header = self.resultsTable.horizontalHeaderItem(col).text()
-                item = self.resultsTable.item(row, col)
-                row_data[header] = item.text() if item is not None else ""
-            table_data.append(row_data)
-        df_params = pd.DataFrame(table_data)
+        columns = self.collect_export_columns()
+        params_header, params_rows, e_half = self.collect_result_rows()
+        self.start_export(make_snapshot(
+            filename, 'columnar', columns, params_header, params_rows,
+            getattr(self, "deriv_intersections", None),
+            getattr(self, "second_deriv_intersections", None),
+            e_half, self.measurement_type, self.analysis_settings()
+        ))
+
+    def start_export(self, snapshot):
+        """
+        Uruchamia eksport migawki danych w wątku roboczym i pokazuje
+        niemodalne okno postępu z możliwością anulowania.
+
+        Parameters:
+            snapshot (ExportSnapshot): Migawka danych do zapisania.
+        """
+        task = ExportTask(snapshot, self)
+        dialog = QtWidgets.QProgressDialog(f"Eksport: {os.path.basename(snapshot.filename)}", "Anuluj",
+                                           0, max(snapshot.n_rows, 1), self)
+        dialog.setWindowTitle("Eksport w tle")
+        dialog.setWindowModality(QtCore.Qt.WindowModality.NonModal)
+        dialog.setAutoClose(False)
+        dialog.setAutoReset(False)
+        dialog.setMinimumDuration(0)
+        dialog.canceled.connect(task.cancel)
+        task.progress.connect(lambda done, total, stage: self.on_export_progress(dialog, done, total, stage))
+        task.finished.connect(lambda filename: self.on_export_finished(task, filename))
+        task.failed.connect(lambda filename, error: self.on_export_failed(task, filename, error))
+        task.cancelled.connect(lambda filename: self.on_export_cancelled(task, filename))
+        self.export_tasks[task] = dialog
+        dialog.show()
+        self.export_executor.submit(task.run)
+
+    def on_export_progress(self, dialog, done, total, stage):
+        """Aktualizuje okno postępu eksportu."""
+        dialog.setMaximum(max(total, 1))
+        dialog.setValue(min(done, max(total, 1)))
+        dialog.setLabelText(f"{stage}: zapisano {done} z {total} wierszy")
+
+    def finish_export_task(self, task):
+        """Zamyka okno postępu i zwalnia zakończone zadanie eksportu."""
+        dialog = self.export_tasks.pop(task, None)
+        if dialog is not None:
+            dialog.canceled.disconnect()
+            dialog.close()
+            dialog.deleteLater()
+        task.deleteLater()
 
+    def on_export_finished(self, task, filename):
+        """Obsługuje poprawne zakończenie eksportu."""
+        self.finish_export_task(task)
+        QtWidgets.QMessageBox.information(self, "Sukces", f"Dane zostały zapisane do pliku {filename}")
+
+    def on_export_failed(self, task, filename, error):
+        """Obsługuje błąd eksportu."""
+        self.finish_export_task(task)
+        QtWidgets.QMessageBox.critical(self, "Błąd", f"Wystąpił błąd podczas zapisu do pliku:\n{error}")
+
+    def on_export_cancelled(self, task, filename):
+        """Obsługuje anulowanie eksportu (niepełny plik został usunięty)."""
+        self.finish_export_task(task)
+        self.statusBar().showMessage(f"Eksport do pliku {filename} został anulowany.", 5000)
+
+    def new_document(self):
+        """Zapamiętuje bieżącą kartę i otwiera nową, pustą kartę."""
+        self.store_active_document()
+        index = self.workspace.add(Document())
+        self.document_tabs.blockSignals(True)
+        self.document_tabs.addTab("Nowy")
+        self.document_tabs.setCurrentIndex(index)
+        self.document_tabs.blockSignals(False)
+        self.workspace.active = index
+        self.workspace.touch(self.workspace.current)
+        self.clear_plot()
+
+    def store_active_document(self):
+        """Przenosi stan okna (dane, ustawienia, wyniki) do aktywnego dokumentu obszaru roboczego."""
+        document = self.workspace.current
+        if self.x is None:
+            document.manifest, document.arrays = None, {}
+        else:
+            document.manifest, document.arrays = self.session_state()
+        document.evicted.clear()
+        document.title = self.document_title()
+
+    def switch_document(self, index):
+        """Przełącza okno na dokument z karty o podanym indeksie."""
+        if index < 0 or index == self.workspace.active:
+            return
+        self.store_active_document()
+        self.workspace.active = index
+        self.activate_document()
+
+    def activate_document(self):
+        """Odtwarza w oknie aktywny dokument (przeliczając usunięte tablice pochodne)."""
+        document = self.workspace.current
+        self.workspace.touch(document)
+        if document.empty:
+            self.clear_plot()
+        else:
+            self.workspace.ensure_derived(document)
+            self.restore_session(document.manifest, document.arrays, announce=False)
+        # Tablice aktywnego dokumentu przechowuje okno - dokument nie trzyma nieaktualnych kopii
+        document.arrays = {}
+        self.enforce_memory_budget()
+
+    def close_document(self, index):
+        """Zamyka kartę (dane dokumentu są usuwane)."""
+        closing_active = index == self.workspace.active
+        if not closing_active:
+            self.store_active_document()
+        self.workspace.remove(index)
+        self.document_tabs.blockSignals(True)
+        self.document_tabs.removeTab(index)
+        if self.document_tabs.count() == 0:
+            self.document_tabs.addTab("Nowy")
+        self.document_tabs.setCurrentIndex(self.workspace.active)
+        self.document_tabs.blockSignals(False)
+        if closing_active:
+            self.activate_document()
+
+    def document_title(self):
+        """Zwraca tytuł karty bieżących danych (nazwa pliku)."""
+        return os.path.basename(self.file_name) if self.file_name else ("Sesja" if self.x is not None else "Nowy")
+
+    def update_document_title(self):
+        """Ustawia tytuł aktywnej karty."""
+        title = self.document_title()
+        self.workspace.current.title = title
+        self.document_tabs.setTabText(self.workspace.active, title)
+        self.document_tabs.setTabToolTip(self.workspace.active, self.file_name or "")
+
+    def enforce_memory_budget(self):
+        """Usuwa tablice pochodne nieaktywnych kart (LRU), gdy przekroczony jest budżet pamięci."""
+        evicted = self.workspace.enforce_budget(dataset_nbytes(self.memory_arrays()))
+        if evicted:
+            names = ", ".join(document.title for document in evicted)
+            self.statusBar().showMessage(f"Budżet pamięci: zwolniono tablice pochodne kart: {names}", 5000)
+
+    def session_state(self):
+        """
+        Zwraca stan bieżących danych w postaci sesji (używany przy zapisie
+        sesji i przy przełączaniu kart).
+
+        Returns:
+            tuple: (manifest, tablice).
+        """
+        arrays = self.memory_arrays()
+        # Bez wygładzania krzywe są danymi surowymi - zapisywane raz (restore_session odtwarza je z raw_*)
+        for name, raw in (('y1', 'raw_y1'), ('y2', 'raw_y2')):
+            if arrays[name] is arrays[raw]:
+                del arrays[name]
+        axis = {k: v if isinstance(v, str) else float(v)
+                for k, v in self.axis_settings.items() if k != 'font'}
+        axis['font'] = self.axis_settings['font'].toString()
+        manifest = {
+            'settings': self.analysis_settings(),
+            'axis_settings': axis,
+            'results': {
+                'types': list(self.results.types),
+                'values': [[None if np.isnan(v) else v for v in row] for row in self.results.values.tolist()],
+                # Wiersze ostatnio wyznaczonych pików - aktualizowane w miejscu przy zmianie R_u
+                'peak_rows': dict(self.peak_rows),
+            },
+            'deriv_intersections': [[float(x), float(y)] for x, y in getattr(self, 'deriv_intersections', None) or []],
+            'second_deriv_intersections': [[float(x), float(y)]
+                                           for x, y in getattr(self, 'second_deriv_intersections', None) or []],
+        }
+        return manifest, arrays
+
+    def save_session_file(self):
+        """Zapisuje bieżące dane, ustawienia i wyniki do pliku sesji."""
+        if self.x is None:
+            QtWidgets.QMessageBox.warning(self, "Brak danych", "Brak danych do zapisania.")
+            return
+        filename, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Zapisz sesję", "",
+                                                            f"Sesja CVision (*{SESSION_EXTENSION})")
+        if not filename:
+            return
+        if not filename.endswith(SESSION_EXTENSION):
+            filename += SESSION_EXTENSION
+        manifest, arrays = self.session_state()
         try:
-            writer = pd.ExcelWriter(filename, engine='xlsxwriter')
-            df.to_excel(writer, sheet_name="Dane", index=False)
-            df_params.to_excel(writer, sheet_name="Parametry", index=False)
-            if hasattr(self, "deriv_intersections") and self.deriv_intersections:
-                df_deriv = pd.DataFrame(self.deriv_intersections, columns=["x", "y"])
-                df_deriv.to_excel(writer, sheet_name="Przecięcia Pochodnej", index=False)
-            if hasattr(self, "second_deriv_intersections") and self.second_deriv_intersections:
-                df_second_deriv = pd.DataFrame(self.second_deriv_intersections, columns=["x", "y"])
-                df_second_deriv.to_excel(writer, sheet_name="Przecięcia Drugiej Pochodnej", index=False)
-
-            row_E_half = df_params[df_params["Typ"] == "E1/2"]
-            if not row_E_half.empty:
-                e_half_str = row_E_half["x_peak"].values[0]
-                try:
-                    self.E_half = float(e_half_str)
-                except:
-                    self.E_half = 0.0
-            else:
-                self.E_half = 0.0
-
-            workbook = writer.book
-            worksheet = writer.sheets["Dane"]
-
-            chart = workbook.add_chart({'type': 'line'})
-            chart.add_series({
-                'name': '=Dane!$B$1',
-                'categories': f"=Dane!$A$2:$A${len(self.x) + 1}",
-                'values': f"=Dane!$B$2:$B${len(self.x) + 1}",
-                'line': {'color': 'red'},
-            })
-            chart.add_series({
-                'name': '=Dane!$C$1',
-                'categories': f"=Dane!$A$2:$A${len(self.x) + 1}",
-                'values': f"=Dane!$C$2:$C${len(self.x) + 1}",
-                'line': {'color': 'blue'},
-            })
-
-            y_min = df[["y_ox", "y_red"]].min().min()
-            y_max = df[["y_ox", "y_red"]].max().max()
-            worksheet.write(len(self.x) + 1, 3, self.E_half)
-            worksheet.write(len(self.x) + 1, 4, y_min)
-            worksheet.write(len(self.x) + 2, 3, self.E_half)
-            worksheet.write(len(self.x) + 2, 4, y_max)
-            chart.add_series({
-                'name': 'E1/2',
-                'categories': f"=Dane!$D${len(self.x) + 2}:$D${len(self.x) + 3}",
-                'values': f"=Dane!$E${len(self.x) + 2}:$E${len(self.x) + 3}",
-                'line': {'color': 'green', 'dash_type': 'dash'},
-            })
-
-            if self.measurement_type == 0:
-                chart.set_x_axis({
-                    'name': 'E [mV]',
-                    'name_font': {'name': 'Verdana', 'bold': True, 'size': 14},
-                    'num_font': {'name': 'Calibri', 'size': 10},
-                    'crossing': 'min',
-                })
-            else:
-                chart.set_x_axis({
-                    'name': 'E [mV]',
-                    'name_font': {'name': 'Verdana', 'bold': True, 'size': 14},
-                    'num_font': {'name': 'Calibri', 'size': 10},
-                    'crossing': 'max',
-                })
-            chart.set_y_axis({
-                'name': 'I [μA]',
-                'name_font': {'name': 'Verdana', 'bold': True, 'size': 14},
-                'num_font': {'name': 'Calibri', 'size': 10},
-            })
-            chart.set_size({'width': 600, 'height': 600})
-            worksheet.insert_chart('G2', chart)
-
-            writer.close()
-            QtWidgets.QMessageBox.information(self, "Sukces", f"Dane oraz wykres zostały zapisane do pliku {filename}")
+            save_session(filename, arrays, manifest)
+            self.statusBar().showMessage(f"Sesja zapisana do pliku {filename}", 5000)
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Błąd", f"Nie udało się zapisać sesji.\n{str(e)}")
+
+    def load_session_file(self):
+        """Wczytuje plik sesji i odtwarza dane, ustawienia oraz wyniki bez ponownych obliczeń."""
+        filename, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Wczytaj sesję", "",
+                                                            f"Sesja CVision (*{SESSION_EXTENSION});;Wszystkie pliki (*)")
+        if not filename:
+            return
+        try:
+            manifest, arrays = load_session(filename)
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Błąd", f"Nie udało się wczytać sesji.\n{str(e)}")
+            return
+        if self.x is not None:
+            self.new_document()
+        self.restore_session(manifest, arrays)
+        self.enforce_memory_budget()
+
+    def restore_session(self, manifest, arrays, announce=True):
+        """
+        Odtwarza stan okna z manifestu i tablic sesji.
+
+        Parameters:
+            manifest (dict): Manifest sesji.
+            arrays (dict): Tablice sesji (zwykle zmapowane w pamięć).
+            announce (bool): Czy pokazać komunikat o wczytaniu sesji (przy przełączaniu kart - nie).
+        """
+        self.clear_plot()
+        settings = manifest.get('settings', {})
+        self.x = arrays['x']
+        self.raw_y1 = arrays['raw_y1']
+        self.raw_y2 = arrays['raw_y2']
+        self.y1 = arrays.get('y1', self.raw_y1)
+        self.y2 = arrays.get('y2', self.raw_y2)
+        self.deriv_y1 = arrays.get('deriv_y1')
+        self.deriv_y2 = arrays.get('deriv_y2')
+        self.second_deriv_y1 = arrays.get('second_deriv_y1')
+        self.second_deriv_y2 = arrays.get('second_deriv_y2')
+        self.deriv_intersections = [tuple(p) for p in manifest.get('deriv_intersections', [])]
+        self.second_deriv_intersections = [tuple(p) for p in manifest.get('second_deriv_intersections', [])]
+        self.file_name = settings.get('source_file')
+        self.measurement_type = settings.get('measurement_type', 0)
+        self.measurement_type_combo.setCurrentIndex(self.measurement_type)
+
+        # Ustawienia wygładzania odtwarzamy bez wyzwalania ponownego wygładzania
+        smoothing = settings.get('smoothing', {})
+        widgets = (self.smoothingCheckBox, self.smoothingMethodCombo, self.windowSpinBox, self.polySpinBox)
+        for widget in widgets:
+            widget.blockSignals(True)
+        self.smoothingCheckBox.setChecked(smoothing.get('enabled', False))
+        self.smoothingMethodCombo.setCurrentIndex(max(self.smoothingMethodCombo.findData(smoothing.get('method', 'savgol')), 0))
+        self.windowSpinBox.setValue(smoothing.get('window_length', 15))
+        self.polySpinBox.setValue(smoothing.get('polyorder', 3))
+        self.fourier_settings = {key: smoothing.get(key, value) for key, value in DEFAULT_FOURIER_SETTINGS.items()}
+        self.blank_settings = settings.get('blank')
+        self.ruSpinBox.blockSignals(True)
+        self.ruSpinBox.setValue(float(settings.get('r_u') or 0.0))
+        self.ruSpinBox.blockSignals(False)
+        for widget in widgets:
+            widget.blockSignals(False)
 
+        axis = dict(manifest.get('axis_settings', {}))
+        font = QtGui.QFont()
+        if not font.fromString(axis.pop('font', '')):
+            font = QtGui.QFont("Arial", 12)
+        axis['font'] = font
+        self.axis_settings.update(axis)
+        self.baseline_settings = settings.get('baseline_settings', self.baseline_settings)
+
+        self.redraw_curves()
+        self.update_axis_settings()
+        self.update_baseline_lines()
+
+        results = manifest.get('results', {})
+        types = results.get('types', [])
+        values = np.array([[np.nan if v is None else v for v in row] for row in results.get('values', [])],
+                          dtype=float).reshape(len(types), len(RESULT_COLUMNS) - 1)
+        self.resultsModel.append_rows(types, values)
+        self.peak_rows = {name: int(row) for name, row in (results.get('peak_rows') or {}).items()
+                          if 0 <= int(row) < len(self.results) and self.results.types[int(row)] == name}
+        row = self.results.find("E1/2")
+        if self.peak_rows:
+            # Opisy, linie Ip, krzywe wysokości i E1/2 dla bieżącego R_u
+            self.draw_peak_analysis(self.peak_analysis())
+        elif row is not None:
+            self.E_half_line = pg.InfiniteLine(pos=self.results.value(row, "x_peak"), angle=90,
+                                               pen=pg.mkPen(color='g', width=2, style=QtCore.Qt.PenStyle.DashLine))
+            self.plot_widget.addItem(self.E_half_line)
+        self.update_document_title()
+        if announce:
+            self.statusBar().showMessage("Sesja została wczytana.", 5000)
+
+    def save_recipe_file(self):
+        """Zapisuje bieżące ustawienia wygładzania i linii bazowych jako recepturę trybu obserwacji folderu."""
+        filename, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Zapisz recepturę", "",
+                                                            f"Receptura CVision (*{RECIPE_EXTENSION})")
+        if not filename:
+            return
+        if not filename.endswith(RECIPE_EXTENSION):
+            filename += RECIPE_EXTENSION
+        try:
+            save_recipe(filename, self.analysis_settings())
+            self.statusBar().showMessage(f"Receptura zapisana do pliku {filename}", 5000)
         except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Błąd", f"Wystąpił błąd podczas zapisu do pliku:\n{str(e)}")
+            QtWidgets.QMessageBox.critical(self, "Błąd", f"Nie udało się zapisać receptury.\n{str(e)}")
 
     def show_help(self):
         help_text = """
@@ -0,0 +1,184 @@
+"""
+Moduł noise_window.py
+---------------------
+Zawiera okno analizy szumu: widmo mocy prądu utleniania i redukcji
+(cvcore.spectrum.power_spectrum) z listą najsilniejszych składowych oraz
+ustawienia filtra FFT (dolnoprzepustowy, wycinający 50/60 Hz z harmonicznymi),
+który można zastosować w oknie głównym zamiast wygładzania Savitzky'ego-Golaya.
+"""
+
+import numpy as np
+from PyQt6 import QtWidgets, QtGui, QtCore
+import pyqtgraph as pg
+
+from cvcore.spectrum import (DEFAULT_NOTCH_WIDTH, MAINS_FREQUENCIES, dominant_frequencies, fourier_filter,
+                             power_spectrum, sampling_step)
+from plot_lod import plot_lod
+
+# Domyślne ustawienia filtra FFT okna głównego (przydźwięk 50 Hz z harmonicznymi)
+DEFAULT_FOURIER_SETTINGS = {'scan_rate': 100.0, 'lowpass': None, 'notch': 50.0, 'harmonics': 3,
+                            'notch_width': DEFAULT_NOTCH_WIDTH}
+# Liczba najsilniejszych składowych widma wypisywanych pod wykresem
+DOMINANT_COUNT = 5
+
+
+class NoiseSpectrumWindow(QtWidgets.QDialog):
+    """
+    Okno widma szumu i ustawień filtrowania w dziedzinie częstotliwości.
+    """
+
+    def __init__(self, main_window):
+        """
+        Parameters:
+            main_window (MainWindow): Okno główne (dane surowe i ustawienia filtra FFT).
+        """
+        super().__init__(main_window)
+        self.setWindowTitle("Widmo szumu (FFT)")
+        self.resize(900, 600)
+        self.main_window = main_window
+        self.init_ui()
+
+    def init_ui(self):
+        """Tworzy interfejs okna: wykres widma i ustawienia filtra."""
+        layout = QtWidgets.QVBoxLayout(self)
+        self.plot_widget = pg.PlotWidget(title="Gęstość widmowa mocy")
+        self.plot_widget.addLegend()
+        self.plot_widget.setLabel('left', "log10 PSD")
+        layout.addWidget(self.plot_widget)
+        self.peaks_label = QtWidgets.QLabel("")
+        self.peaks_label.setWordWrap(True)
+        layout.addWidget(self.peaks_label)
+
+        settings = self.main_window.fourier_settings
+        form = QtWidgets.QFormLayout()
+        self.scan_rate_spin = self.spin_box(0.0, 1e6, settings.get('scan_rate') or 0.0, " mV/s")
+        self.scan_rate_spin.setToolTip("0 - częstotliwości w cyklach/mV zamiast Hz.")
+        form.addRow("Szybkość skanu:", self.scan_rate_spin)
+        self.lowpass_spin = self.spin_box(0.0, 1e9, settings.get('lowpass') or 0.0)
+        self.lowpass_spin.setToolTip("Częstotliwość odcięcia filtra dolnoprzepustowego (0 - wyłączony).")
+        form.addRow("Dolnoprzepustowy do:", self.lowpass_spin)
+        self.notch_spin = self.spin_box(0.0, 1e9, settings.get('notch') or 0.0)
+        self.notch_spin.setToolTip("Częstotliwość filtra wycinającego, np. 50 lub 60 Hz (0 - wyłączony).")
+        form.addRow("Wycinanie:", self.notch_spin)
+        self.harmonics_spin = QtWidgets.QSpinBox()
+        self.harmonics_spin.setRange(1, 50)
+        self.harmonics_spin.setValue(int(settings.get('harmonics') or 1))
+        form.addRow("Liczba harmonicznych:", self.harmonics_spin)
+        self.notch_width_spin = self.spin_box(0.0, 1e9, settings.get('notch_width') or 0.0)
+        form.addRow("Szerokość wycinania:", self.notch_width_spin)
+        layout.addLayout(form)
+
+        buttons = QtWidgets.QHBoxLayout()
+        btn_spectrum = QtWidgets.QPushButton("Oblicz widmo")
+        btn_spectrum.clicked.connect(self.update_spectrum)
+        buttons.addWidget(btn_spectrum)
+        btn_apply = QtWidgets.QPushButton("Zastosuj jako wygładzanie")
+        btn_apply.clicked.connect(self.apply_filter)
+        buttons.addWidget(btn_apply)
+        layout.addLayout(buttons)
+
+    @staticmethod
+    def spin_box(minimum: float, maximum: float, value: float, suffix: str = "") -> QtWidgets.QDoubleSpinBox:
+        """Pole liczbowe ustawień filtra."""
+        spin = QtWidgets.QDoubleSpinBox()
+        spin.setRange(minimum, maximum)
+        spin.setDecimals(4)
+        spin.setSuffix(suffix)
+        spin.setValue(float(value))
+        return spin
+
+    def settings(self) -> dict:
+        """Zwraca ustawienia filtra FFT z pól okna (0 oznacza wyłączony element)."""
+        return {
+            'scan_rate': self.scan_rate_spin.value() or None,
+            'lowpass': self.lowpass_spin.value() or None,
+            'notch': self.notch_spin.value() or None,
+            'harmonics': self.harmonics_spin.value(),
+            'notch_width': self.notch_width_spin.value() or None,
+        }
+
+    def showEvent(self, event):
+        """Przelicza widmo przy otwarciu okna."""
+        super().showEvent(event)
+        self.update_spectrum()
+
+    def update_spectrum(self):
+        """Oblicza i rysuje widmo mocy danych surowych oraz (przy ustawionym filtrze) po filtrowaniu."""
+        mw = self.main_window
+        self.plot_widget.clear()
+        self.plot_widget.addLegend()
+        if mw.x is None or mw.raw_y1 is None or mw.raw_y2 is None:
+            self.peaks_label.setText("Brak danych - najpierw zaimportuj plik.")
+            return
+        settings = self.settings()
+        unit = "Hz" if settings['scan_rate'] else "1/mV"
+        self.plot_widget.setLabel('bottom', f"Częstotliwość [{unit}]")
+        filtering = settings['lowpass'] or settings['notch']
+        QtWidgets.QApplication.setOverrideCursor(QtGui.QCursor(QtCore.Qt.CursorShape.WaitCursor))
+        try:
+            lines = []
+            for raw, name, color in ((mw.raw_y1, "Utlenianie", 'b'), (mw.raw_y2, "Redukcja", 'r')):
+                freq, power = power_spectrum(mw.x, raw, settings['scan_rate'])
+                plot_lod(self.plot_widget, freq, self._log_power(power), pen=pg.mkPen(color=color, width=1), name=name)
+                if filtering:
+                    filtered = fourier_filter(mw.x, raw, **self._filter_kwargs(settings))
+                    _, filtered_power = power_spectrum(mw.x, filtered, settings['scan_rate'])
+                    plot_lod(self.plot_widget, freq, self._log_power(filtered_power),
+                             pen=pg.mkPen(color=color, width=1, style=QtCore.Qt.PenStyle.DotLine),
+                             name=f"{name} (po filtrze)")
+                peaks = ", ".join(f"{f:.4g}" for f, _ in dominant_frequencies(freq, power, DOMINANT_COUNT))
+                line = f"{name} - najsilniejsze składowe [{unit}]: {peaks}"
+                if settings['scan_rate']:
+                    mains = ", ".join(f"{f:g} Hz: {ratio:.1f}x tła" for f, ratio in self.mains_levels(freq, power))
+                    line += f"; przydźwięk sieci: {mains or 'poza zakresem (powyżej częstotliwości Nyquista)'}"
+                lines.append(line)
+        except ValueError as e:
+            self.peaks_label.setText(str(e))
+            return
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+        if settings['scan_rate']:
+            lines.append(f"Częstotliwość Nyquista: {0.5 / sampling_step(mw.x, settings['scan_rate']):.4g} Hz")
+        self.peaks_label.setText("\n".join(lines))
+
+    @staticmethod
+    def mains_levels(freq: np.ndarray, power: np.ndarray) -> list[tuple[float, float]]:
+        """
+        Zwraca poziom składowych sieci 50/60 Hz względem tła widma (mediana
+        mocy w paśmie ±20% wokół częstotliwości); pomija częstotliwości
+        powyżej zakresu widma.
+        """
+        levels = []
+        for mains in MAINS_FREQUENCIES:
+            if mains > freq[-1]:
+                continue
+            lo, hi = np.searchsorted(freq, (0.8 * mains, 1.2 * mains))
+            index = min(int(np.searchsorted(freq, mains)), len(freq) - 1)
+            background = np.median(power[lo:hi]) if hi > lo else 0.0
+            peak = power[max(index - 1, 0):index + 2].max()
+            levels.append((mains, peak / background if background > 0 else np.inf))
+        return levels
+
+    @staticmethod
+    def _log_power(power: np.ndarray) -> np.ndarray:
+        """Logarytm mocy (zera zastępowane najmniejszą dodatnią wartością)."""
+        positive = power[power > 0]
+        floor = positive.min() if len(positive) else 1.0
+        return np.log10(np.maximum(power, floor))
+
+    @staticmethod
+    def _filter_kwargs(settings: dict) -> dict:
+        """Argumenty fourier_filter z ustawień okna."""
+        kwargs = {key: settings[key] for key in ('lowpass', 'notch', 'harmonics', 'scan_rate')}
+        if settings['notch_width']:
+            kwargs['notch_width'] = settings['notch_width']
+        return kwargs
+
+    def apply_filter(self):
+        """Ustawia filtr FFT jako metodę wygładzania okna głównego."""
+        settings = self.settings()
+        if not (settings['lowpass'] or settings['notch']):
+            QtWidgets.QMessageBox.warning(self, "Filtr FFT", "Ustaw częstotliwość odcięcia lub wycinania.")
+            return
+        self.main_window.set_fourier_smoothing(settings)
+        self.update_spectrum()
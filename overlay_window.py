@@ -0,0 +1,278 @@
+"""
+Moduł overlay_window.py
+-----------------------
+Zawiera okno porównawcze, w którym można nałożyć na siebie setki woltamogramów.
+Krzywe jednej grupy kolorów są spakowane w jeden bufor wierzchołków
+rozdzielany tablicą `connect`, dzięki czemu wykres zawiera tylko kilka
+elementów niezależnie od liczby plików.
+"""
+
+import os
+
+import numpy as np
+from PyQt6 import QtWidgets, QtCore
+import pyqtgraph as pg
+
+from cvcore import load_cv
+
+# Paleta kolorów grup; plik i trafia do grupy i % len(OVERLAY_PALETTE)
+OVERLAY_PALETTE = [
+    (31, 119, 180), (255, 127, 14), (44, 160, 44), (214, 39, 40),
+    (148, 103, 189), (140, 86, 75), (227, 119, 194), (188, 189, 34),
+]
+
+
+def load_cv_loop(file_name: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Wczytuje plik z trzema kolumnami (E, I_utlenianie, I_redukcja) i zwraca
+    zamkniętą pętlę woltamogramu: gałąź utleniania z rosnącym E oraz gałąź
+    redukcji z malejącym E.
+
+    Parameters:
+        file_name (str): Ścieżka do pliku tekstowego.
+
+    Returns:
+        tuple: (x, y) - współrzędne pętli o długości 2n.
+    """
+    x, y_ox, y_red = load_cv(file_name)
+    x_loop = np.concatenate([x, x[::-1]])
+    y_loop = np.concatenate([y_ox, y_red[::-1]])
+    return x_loop, y_loop
+
+
+class PackedCurves:
+    """
+    Bufor wierzchołków wielu krzywych jednej grupy kolorów.
+
+    Krzywe są sklejone w jedną tablicę x i y; tablica `connect` przerywa
+    linię między kolejnymi krzywymi oraz ukrywa krzywe wyłączone,
+    bez przebudowywania samego bufora.
+    """
+
+    def __init__(self, curves: list[tuple[np.ndarray, np.ndarray]]):
+        """
+        Parameters:
+            curves (list): Lista krotek (x, y) kolejnych krzywych.
+        """
+        lengths = np.array([len(x) for x, _ in curves], dtype=np.intp)
+        self.offsets = np.concatenate([[0], np.cumsum(lengths)])
+        self.x = np.concatenate([x for x, _ in curves]) if curves else np.empty(0)
+        self.y = np.concatenate([y for _, y in curves]) if curves else np.empty(0)
+        self.connect = np.ones(len(self.x), dtype=bool)
+        self.connect[self.offsets[1:] - 1] = False
+        self.visible = np.ones(len(curves), dtype=bool)
+
+    def __len__(self):
+        return len(self.visible)
+
+    def set_visible(self, index: int, visible: bool):
+        """Włącza lub wyłącza rysowanie krzywej o podanym indeksie."""
+        start, end = self.offsets[index], self.offsets[index + 1]
+        self.connect[start:end - 1] = visible
+        self.visible[index] = visible
+
+    def segment(self, index: int) -> tuple[np.ndarray, np.ndarray]:
+        """Zwraca widoki (bez kopiowania) na dane krzywej o podanym indeksie."""
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.x[start:end], self.y[start:end]
+
+    def distance_at(self, x_pos: float, y_pos: float) -> np.ndarray:
+        """
+        Zwraca odległość w osi y każdej widocznej krzywej od punktu (x_pos, y_pos).
+        Krzywe ukryte lub nieobejmujące x_pos otrzymują wartość inf.
+        """
+        distances = np.full(len(self), np.inf)
+        for i in np.flatnonzero(self.visible):
+            x, y = self.segment(i)
+            half = len(x) // 2
+            for x_branch, y_branch in ((x[:half], y[:half]), (x[half:][::-1], y[half:][::-1])):
+                if len(x_branch) == 0 or not (x_branch[0] <= x_pos <= x_branch[-1]):
+                    continue
+                y_at = np.interp(x_pos, x_branch, y_branch)
+                distances[i] = min(distances[i], abs(y_at - y_pos))
+        return distances
+
+
+class OverlayWindow(QtWidgets.QDialog):
+    """
+    Okno do nakładania wielu woltamogramów na jeden wykres w celu porównania.
+    """
+
+    def __init__(self, parent=None):
+        """Inicjalizacja okna porównawczego."""
+        super().__init__(parent)
+        self.setWindowTitle("Porównanie woltamogramów")
+        self.resize(1000, 700)
+        self.file_names = []
+        self.groups: list[PackedCurves] = []
+        self.group_items: list[pg.PlotCurveItem] = []
+        self.entries: list[tuple[int, int]] = []  # (grupa, indeks w grupie) dla każdego pliku
+        self.hovered = None
+        self.init_ui()
+
+    def init_ui(self):
+        """Buduje interfejs okna: listę plików oraz obszar wykresu."""
+        main_layout = QtWidgets.QHBoxLayout(self)
+
+        side_layout = QtWidgets.QVBoxLayout()
+        btn_add = QtWidgets.QPushButton("Dodaj pliki")
+        btn_add.clicked.connect(self.add_files)
+        side_layout.addWidget(btn_add)
+        btn_clear = QtWidgets.QPushButton("Wyczyść")
+        btn_clear.clicked.connect(self.clear_curves)
+        side_layout.addWidget(btn_clear)
+        btn_all = QtWidgets.QPushButton("Pokaż wszystkie")
+        btn_all.clicked.connect(lambda: self.set_all_visible(True))
+        side_layout.addWidget(btn_all)
+        btn_none = QtWidgets.QPushButton("Ukryj wszystkie")
+        btn_none.clicked.connect(lambda: self.set_all_visible(False))
+        side_layout.addWidget(btn_none)
+        self.fileList = QtWidgets.QListWidget()
+        self.fileList.itemChanged.connect(self.on_item_changed)
+        self.fileList.currentRowChanged.connect(self.highlight_curve)
+        side_layout.addWidget(self.fileList)
+        main_layout.addLayout(side_layout, 1)
+
+        plot_layout = QtWidgets.QVBoxLayout()
+        self.cursorLabel = QtWidgets.QLabel("Najedź kursorem na krzywą")
+        plot_layout.addWidget(self.cursorLabel)
+        self.plot_widget = pg.PlotWidget(title="Nałożone woltamogramy")
+        self.plot_widget.setLabel('bottom', 'E [mV]')
+        self.plot_widget.setLabel('left', 'I [μA]')
+        plot_layout.addWidget(self.plot_widget)
+        main_layout.addLayout(plot_layout, 3)
+
+        self.highlight_item = pg.PlotCurveItem(pen=pg.mkPen(color='y', width=3))
+        self.highlight_item.setZValue(10)
+        self.plot_widget.addItem(self.highlight_item)
+        self.proxy = pg.SignalProxy(self.plot_widget.scene().sigMouseMoved, rateLimit=30, slot=self.mouseMoved)
+
+    def add_files(self):
+        """Wczytuje wybrane pliki i przebudowuje bufory grup kolorów."""
+        file_names, _ = QtWidgets.QFileDialog.getOpenFileNames(self, "Wybierz pliki z danymi", "",
+                                                               "Pliki tekstowe (*.txt);;Wszystkie pliki (*)")
+        if not file_names:
+            return
+        curves = [self.segment_of(i) for i in range(len(self.file_names))]
+        failed = []
+        for file_name in file_names:
+            try:
+                curves.append(load_cv_loop(file_name))
+                self.file_names.append(file_name)
+            except Exception as e:
+                failed.append(f"{os.path.basename(file_name)}: {str(e)}")
+        visible = [self.groups[g].visible[k] for g, k in self.entries]
+        self.rebuild(curves, visible + [True] * (len(curves) - len(visible)))
+        if failed:
+            QtWidgets.QMessageBox.warning(self, "Błąd",
+                                          "Nie udało się zaimportować części plików:\n" + "\n".join(failed))
+
+    def segment_of(self, index: int) -> tuple[np.ndarray, np.ndarray]:
+        """Zwraca dane krzywej pliku o podanym indeksie."""
+        group, local = self.entries[index]
+        return self.groups[group].segment(local)
+
+    def rebuild(self, curves, visible):
+        """
+        Pakuje krzywe w bufory grup kolorów i odtwarza listę plików.
+
+        Parameters:
+            curves (list): Lista krotek (x, y) wszystkich plików.
+            visible (list): Widoczność kolejnych krzywych.
+        """
+        for item in self.group_items:
+            self.plot_widget.removeItem(item)
+        n_groups = min(len(OVERLAY_PALETTE), len(curves))
+        self.groups = [PackedCurves(curves[g::n_groups]) for g in range(n_groups)]
+        self.entries = [(i % n_groups, i // n_groups) for i in range(len(curves))]
+        for i, flag in enumerate(visible):
+            group, local = self.entries[i]
+            self.groups[group].set_visible(local, flag)
+        self.group_items = []
+        for g, packed in enumerate(self.groups):
+            item = pg.PlotCurveItem(packed.x, packed.y, connect=packed.connect,
+                                    pen=pg.mkPen(color=OVERLAY_PALETTE[g], width=1), skipFiniteCheck=True)
+            self.plot_widget.addItem(item)
+            self.group_items.append(item)
+
+        self.fileList.blockSignals(True)
+        self.fileList.clear()
+        for i, file_name in enumerate(self.file_names):
+            item = QtWidgets.QListWidgetItem(os.path.basename(file_name))
+            item.setFlags(item.flags() | QtCore.Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(QtCore.Qt.CheckState.Checked if visible[i] else QtCore.Qt.CheckState.Unchecked)
+            item.setForeground(pg.mkColor(OVERLAY_PALETTE[self.entries[i][0]]))
+            item.setToolTip(file_name)
+            self.fileList.addItem(item)
+        self.fileList.blockSignals(False)
+        self.highlight_curve(None)
+
+    def clear_curves(self):
+        """Usuwa wszystkie krzywe z okna."""
+        self.file_names = []
+        self.rebuild([], [])
+
+    def on_item_changed(self, item):
+        """Przełącza widoczność krzywej po zmianie stanu pola wyboru na liście."""
+        index = self.fileList.row(item)
+        self.set_visible(index, item.checkState() == QtCore.Qt.CheckState.Checked)
+
+    def set_visible(self, index, visible, refresh=True):
+        """Ustawia widoczność krzywej, modyfikując jedynie tablicę connect jej grupy."""
+        group, local = self.entries[index]
+        self.groups[group].set_visible(local, visible)
+        if refresh:
+            self.refresh_group(group)
+        if not visible and self.hovered == index:
+            self.highlight_curve(None)
+
+    def set_all_visible(self, visible):
+        """Ustawia widoczność wszystkich krzywych."""
+        self.fileList.blockSignals(True)
+        state = QtCore.Qt.CheckState.Checked if visible else QtCore.Qt.CheckState.Unchecked
+        for i in range(self.fileList.count()):
+            self.fileList.item(i).setCheckState(state)
+            self.set_visible(i, visible, refresh=False)
+        self.fileList.blockSignals(False)
+        for group in range(len(self.groups)):
+            self.refresh_group(group)
+
+    def refresh_group(self, group):
+        """Przekazuje do wykresu ten sam bufor grupy z aktualną tablicą connect."""
+        packed = self.groups[group]
+        self.group_items[group].setData(packed.x, packed.y, connect=packed.connect, skipFiniteCheck=True)
+
+    def highlight_curve(self, index):
+        """Wyróżnia krzywą o podanym indeksie (None lub -1 usuwa wyróżnienie)."""
+        if index is None or index < 0 or index >= len(self.entries):
+            self.hovered = None
+            self.highlight_item.setData([], [])
+            return
+        if index == self.hovered:
+            return
+        self.hovered = index
+        x, y = self.segment_of(index)
+        self.highlight_item.setData(x, y, skipFiniteCheck=True)
+
+    def mouseMoved(self, evt):
+        """Wyróżnia krzywą najbliższą kursorowi i wyświetla nazwę jej pliku."""
+        pos = evt[0]
+        if not self.groups or not self.plot_widget.sceneBoundingRect().contains(pos):
+            return
+        mouse_point = self.plot_widget.getViewBox().mapSceneToView(pos)
+        x_pos, y_pos = mouse_point.x(), mouse_point.y()
+        best, best_distance = None, np.inf
+        for g, packed in enumerate(self.groups):
+            distances = packed.distance_at(x_pos, y_pos)
+            local = int(np.argmin(distances))
+            if distances[local] < best_distance:
+                best_distance = distances[local]
+                best = local * len(self.groups) + g
+        # Wyróżniamy tylko krzywe leżące w pobliżu kursora (2% wysokości widoku)
+        (_, _), (y_min, y_max) = self.plot_widget.getViewBox().viewRange()
+        if best is None or best_distance > 0.02 * (y_max - y_min):
+            self.highlight_curve(None)
+            self.cursorLabel.setText(f"x = {x_pos:.3f}, y = {y_pos:.3f}")
+            return
+        self.highlight_curve(best)
+        self.cursorLabel.setText(f"{os.path.basename(self.file_names[best])}: x = {x_pos:.3f}, y = {y_pos:.3f}")
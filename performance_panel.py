@@ -0,0 +1,212 @@
+"""
+Moduł performance_panel.py
+--------------------------
+Zawiera panel wydajności: tabelę czasów etapów analizy i rysowania
+(ostatni czas, średnia krocząca, maksimum, rozmiary danych, opcjonalnie
+zmiana RSS), liczniki pamięci podręcznej, raport pamięci bieżącego zbioru
+danych (także łącznie dla kart obszaru roboczego) oraz eksport śladu w formacie Chrome Trace / JSON, który można
+dołączyć do zgłoszenia błędu.
+"""
+
+from PyQt6 import QtWidgets, QtCore
+
+from cvcore.memory import current_rss, dataset_report, peak_rss
+from cvcore.profiling import PROFILE_ENV, PROFILE_MEMORY_ENV, ROLLING_WINDOW, profiler
+
+# Odstęp odświeżania tabeli przy otwartym panelu [ms]
+REFRESH_INTERVAL_MS = 500
+STAGE_COLUMNS = ["Etap", "Wywołania", "Ostatni [ms]", f"Średnia ({ROLLING_WINDOW}) [ms]",
+                 "Maks. [ms]", "Suma [ms]", "Δ RSS [MB]", "Δ szczytu RSS [MB]", "Rozmiar"]
+MEMORY_COLUMNS = ["Tablica", "Kształt", "Typ", "Rozmiar [MB]", "Własna pamięć [MB]", "Uwagi"]
+MB = 2 ** 20
+
+
+class PerformancePanel(QtWidgets.QDialog):
+    """
+    Niemodalny panel wyświetlający statystyki globalnego profilera (cvcore.profiling).
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Wydajność")
+        self.resize(900, 640)
+        self.init_ui()
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(REFRESH_INTERVAL_MS)
+        self.timer.timeout.connect(self.refresh)
+
+    def init_ui(self):
+        """Tworzy interfejs panelu."""
+        layout = QtWidgets.QVBoxLayout(self)
+        controls = QtWidgets.QHBoxLayout()
+        self.enabled_check = QtWidgets.QCheckBox("Pomiar włączony")
+        self.enabled_check.setChecked(profiler.enabled)
+        self.enabled_check.setToolTip(f"Pomiar można też włączyć przy starcie zmienną środowiskową {PROFILE_ENV}=1.")
+        self.enabled_check.toggled.connect(self.set_enabled)
+        controls.addWidget(self.enabled_check)
+        self.memory_check = QtWidgets.QCheckBox("Pamięć (RSS) etapów")
+        self.memory_check.setChecked(profiler.track_memory)
+        self.memory_check.setToolTip(f"Przy starcie: zmienna środowiskowa {PROFILE_MEMORY_ENV}=1.")
+        self.memory_check.toggled.connect(self.set_track_memory)
+        controls.addWidget(self.memory_check)
+        controls.addStretch()
+        btn_reset = QtWidgets.QPushButton("Wyczyść")
+        btn_reset.clicked.connect(self.reset)
+        controls.addWidget(btn_reset)
+        btn_export = QtWidgets.QPushButton("Eksport śladu (Chrome/JSON)")
+        btn_export.clicked.connect(self.export_trace)
+        controls.addWidget(btn_export)
+        layout.addLayout(controls)
+
+        self.table = QtWidgets.QTableWidget(0, len(STAGE_COLUMNS))
+        self.table.setHorizontalHeaderLabels(STAGE_COLUMNS)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+        self.counters_label = QtWidgets.QLabel("")
+        self.counters_label.setWordWrap(True)
+        layout.addWidget(self.counters_label)
+
+        self.memory_table = QtWidgets.QTableWidget(0, len(MEMORY_COLUMNS))
+        self.memory_table.setHorizontalHeaderLabels(MEMORY_COLUMNS)
+        self.memory_table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.memory_table.verticalHeader().setVisible(False)
+        self.memory_table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
+        self.memory_table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.memory_table)
+        self.memory_label = QtWidgets.QLabel("")
+        self.memory_label.setWordWrap(True)
+        layout.addWidget(self.memory_label)
+
+    def showEvent(self, event):
+        """Włącza odświeżanie tabeli, gdy panel jest widoczny."""
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start()
+
+    def hideEvent(self, event):
+        """Wyłącza odświeżanie po ukryciu panelu."""
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def set_enabled(self, enabled: bool):
+        """Włącza lub wyłącza pomiar czasu etapów."""
+        profiler.enabled = enabled
+        self.refresh()
+
+    def set_track_memory(self, enabled: bool):
+        """Włącza lub wyłącza pomiar zmian RSS w etapach."""
+        profiler.track_memory = enabled
+        self.refresh()
+
+    def reset(self):
+        """Usuwa zebrane statystyki."""
+        profiler.reset()
+        self.refresh()
+
+    def refresh(self):
+        """Odświeża tabelę etapów i liczniki (etapy posortowane według łącznego czasu)."""
+        stats = sorted(profiler.stats().items(), key=lambda item: item[1]['total_ms'], reverse=True)
+        self.table.setRowCount(len(stats))
+        for row, (name, stage) in enumerate(stats):
+            size = ", ".join(f"{key}={value}" for key, value in stage['args'].items())
+            values = [name, str(stage['count']), f"{stage['last_ms']:.3f}", f"{stage['rolling_ms']:.3f}",
+                      f"{stage['max_ms']:.3f}", f"{stage['total_ms']:.1f}",
+                      _format_mb(stage['rss_delta_mb']), _format_mb(stage['peak_delta_mb']), size]
+            for column, value in enumerate(values):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QtWidgets.QTableWidgetItem()
+                    if 0 < column < len(values) - 1:
+                        item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
+                    self.table.setItem(row, column, item)
+                item.setText(value)
+        self.counters_label.setText(self.counters_text(profiler.counters()))
+        self.refresh_memory()
+
+    def refresh_memory(self):
+        """Odświeża raport pamięci zbioru danych okna głównego oraz RSS procesu."""
+        arrays = self.parent().memory_arrays() if hasattr(self.parent(), 'memory_arrays') else {}
+        report = dataset_report(arrays)
+        self.memory_table.setRowCount(len(report))
+        for row, entry in enumerate(report):
+            notes = []
+            if entry['shared_with']:
+                notes.append(f"wspólny bufor z {entry['shared_with']}")
+            elif entry['view']:
+                notes.append("widok")
+            if entry['mapped']:
+                notes.append("odwzorowana z pliku")
+            values = [entry['name'], " x ".join(map(str, entry['shape'])), entry['dtype'],
+                      f"{entry['nbytes'] / MB:.1f}", f"{entry['owned_bytes'] / MB:.1f}", ", ".join(notes)]
+            for column, value in enumerate(values):
+                item = self.memory_table.item(row, column)
+                if item is None:
+                    item = QtWidgets.QTableWidgetItem()
+                    self.memory_table.setItem(row, column, item)
+                item.setText(value)
+        text = self.memory_text(report, getattr(self.parent(), 'rss_before_load', None))
+        workspace = getattr(self.parent(), 'workspace', None)
+        if workspace is not None:
+            total = workspace.total_bytes() + sum(entry['owned_bytes'] for entry in report if not entry['mapped'])
+            text += (f"\nObszar roboczy: {len(workspace.documents)} kart, {total / MB:.1f} MB "
+                     f"z budżetu {workspace.memory_budget / MB:.0f} MB, usunięć LRU: {workspace.evictions}")
+        self.memory_label.setText(text)
+
+    @staticmethod
+    def memory_text(report: list, rss_before_load: int = None) -> str:
+        """
+        Podsumowuje pamięć danych oraz RSS procesu. Przyrost szczytu RSS ponad
+        stan sprzed wczytania danych podawany jest jako wielokrotność rozmiaru
+        danych surowych (cel: około 2x).
+        """
+        raw = sum(entry['nbytes'] for entry in report if entry['name'] in ('x', 'raw_y1', 'raw_y2'))
+        total = sum(entry['owned_bytes'] for entry in report if not entry['mapped'])
+        text = f"Dane: {total / MB:.1f} MB (surowe: {raw / MB:.1f} MB)"
+        rss, peak = current_rss(), peak_rss()
+        if rss is not None:
+            text += f"; RSS: {rss / MB:.1f} MB"
+        if peak is not None:
+            text += f"; szczyt RSS: {peak / MB:.1f} MB"
+            if rss_before_load is not None and raw > 0 and peak > rss_before_load:
+                growth = peak - rss_before_load
+                text += f" (+{growth / MB:.1f} MB od wczytania = {growth / raw:.2f}x danych surowych)"
+        return text
+
+    @staticmethod
+    def counters_text(counters: dict) -> str:
+        """Opisuje liczniki; pary *_hit/*_miss pokazywane są jako skuteczność pamięci podręcznej."""
+        if not counters:
+            return "Liczniki: brak" if profiler.enabled else "Pomiar wyłączony."
+        parts = []
+        names = sorted(counters)
+        for name in names:
+            if name.endswith("_miss") and name[:-5] + "_hit" in counters:
+                continue
+            if name.endswith("_hit"):
+                base = name[:-4]
+                hits, misses = counters[name], counters.get(base + "_miss", 0)
+                parts.append(f"{base}: trafienia {hits}, chybienia {misses} ({100 * hits / max(hits + misses, 1):.0f}%)")
+            else:
+                parts.append(f"{name}: {counters[name]}")
+        return "Liczniki: " + "; ".join(parts)
+
+    def export_trace(self):
+        """Zapisuje ślad zebranych etapów do pliku JSON (chrome://tracing, Perfetto)."""
+        filename, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Eksport śladu", "cvision_trace.json",
+                                                            "Chrome Trace (*.json)")
+        if not filename:
+            return
+        try:
+            profiler.export_trace(filename)
+        except OSError as e:
+            QtWidgets.QMessageBox.critical(self, "Błąd", f"Nie udało się zapisać śladu:\n{e}")
+            return
+        QtWidgets.QMessageBox.information(self, "Sukces", f"Ślad został zapisany do pliku {filename}")
+
+
+def _format_mb(value) -> str:
+    """Formatuje zmianę pamięci w MB (pusty tekst, gdy nie mierzono)."""
+    return "" if value is None else f"{value:+.1f}"
@@ -0,0 +1,92 @@
+"""
+Moduł plot_lod.py
+-----------------
+Zawiera element wykresu pyqtgraph rysujący krzywą z poziomem szczegółowości (LOD).
+Krzywa przekazywana jest do pyqtgraph w postaci zdecymowanej (min/max), z liczbą
+wierzchołków dopasowaną do szerokości widoku, i odświeżana przy każdym
+przybliżeniu lub przesunięciu wykresu.
+"""
+
+import pyqtgraph as pg
+
+from cvcore.profiling import profiler
+from decimation import MinMaxPyramid
+
+# Szerokość widoku przyjmowana, zanim element trafi na wykres
+DEFAULT_VIEW_WIDTH = 2000
+
+
+class LODPlotDataItem(pg.PlotDataItem):
+    """
+    PlotDataItem, który rysuje tylko tyle punktów, ile widok ma pikseli
+    w widocznym zakresie osi x, korzystając z piramidy min/max.
+    """
+
+    def __init__(self, x, y, **kwargs):
+        """
+        Inicjalizacja elementu.
+
+        Parameters:
+            x (ndarray): Wartości osi x (posortowane rosnąco).
+            y (ndarray): Wartości krzywej.
+            **kwargs: Argumenty przekazywane do pg.PlotDataItem (pen, name, ...).
+        """
+        super().__init__(**kwargs)
+        self.pyramid = MinMaxPyramid(x, y)
+        self._lod_key = None
+        self.refresh_lod()
+
+    def viewRangeChanged(self, vb=None, ranges=None, changed=None):
+        """Przelicza dane do narysowania po zmianie zakresu osi x widoku."""
+        super().viewRangeChanged(vb, ranges, changed)
+        if changed is None or changed[0]:
+            self.refresh_lod()
+
+    def refresh_lod(self):
+        """Pobiera z piramidy dane dla widocznego zakresu i aktualizuje krzywą."""
+        if len(self.pyramid) == 0:
+            return
+        view_box = self.getViewBox()
+        if view_box is None:
+            x_min, x_max = self.pyramid.x_bounds
+            width = DEFAULT_VIEW_WIDTH
+        else:
+            (x_min, x_max), _ = view_box.viewRange()
+            width = max(int(view_box.width()), 1)
+        xs, ys, key = self.pyramid.query(x_min, x_max, 2 * width)
+        if key == self._lod_key:
+            profiler.count("lod_cache_hit")
+            return
+        profiler.count("lod_cache_miss")
+        self._lod_key = key
+        with profiler.stage("lod_set_data", n_points=len(xs)):
+            self.setData(xs, ys)
+
+    def dataBounds(self, ax, frac=1.0, orthoRange=None):
+        """
+        Zwraca granice pełnych danych, a nie aktualnie narysowanego wycinka,
+        aby automatyczne skalowanie osi nie zależało od decymacji.
+        """
+        if len(self.pyramid) == 0:
+            return (None, None)
+        if ax == 0:
+            return self.pyramid.x_bounds
+        return self.pyramid.y_bounds
+
+
+def plot_lod(plot_widget, x, y, **kwargs):
+    """
+    Dodaje do wykresu krzywą z poziomem szczegółowości, analogicznie do plot_widget.plot.
+
+    Parameters:
+        plot_widget (pg.PlotWidget): Docelowy wykres.
+        x (ndarray): Wartości osi x.
+        y (ndarray): Wartości krzywej.
+        **kwargs: Argumenty przekazywane do LODPlotDataItem (pen, name, ...).
+
+    Returns:
+        LODPlotDataItem: Dodany element wykresu.
+    """
+    item = LODPlotDataItem(x, y, **kwargs)
+    plot_widget.addItem(item)
+    return item
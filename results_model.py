@@ -0,0 +1,170 @@
+"""
+Moduł results_model.py
+----------------------
+Zawiera typowany magazyn wyników (ResultsStore) przechowujący wartości
+liczbowe w tablicy NumPy oraz model Qt (ResultsTableModel), przez który
+magazyn wyświetlany jest w wirtualizowanym widoku QTableView.
+Magazyn jest jedynym źródłem prawdy - eksport odczytuje z niego liczby
+bezpośrednio, bez formatowania i ponownego parsowania tekstu.
+"""
+
+import numpy as np
+from PyQt6 import QtCore
+
+# Nagłówki kolumn tabeli wyników
+RESULT_COLUMNS = ["Typ", "x_peak", "y_peak", "Baseline", "H/D"]
+
+
+class ResultsStore:
+    """
+    Typowany magazyn wierszy wyników: typ wyniku (tekst) oraz cztery
+    wartości liczbowe (x_peak, y_peak, baseline, H/D); brak wartości to NaN.
+    """
+
+    def __init__(self, capacity: int = 64):
+        """
+        Parameters:
+            capacity (int): Początkowa pojemność tablicy wartości.
+        """
+        self.types: list[str] = []
+        self._values = np.full((capacity, len(RESULT_COLUMNS) - 1), np.nan)
+
+    def __len__(self):
+        return len(self.types)
+
+    @property
+    def values(self) -> np.ndarray:
+        """Widok (bez kopiowania) na wartości liczbowe zapisanych wierszy."""
+        return self._values[:len(self.types)]
+
+    def _reserve(self, size: int):
+        """Powiększa tablicę wartości (podwajając pojemność), aby zmieściła size wierszy."""
+        capacity = len(self._values)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        values = np.full((capacity, self._values.shape[1]), np.nan)
+        values[:len(self.types)] = self.values
+        self._values = values
+
+    def extend(self, types: list, values) -> tuple[int, int]:
+        """
+        Dodaje wiele wierszy jedną operacją.
+
+        Parameters:
+            types (list): Typy kolejnych wierszy.
+            values (array-like): Tablica (k, 4) wartości; NaN oznacza brak wartości.
+
+        Returns:
+            tuple: Zakres indeksów [pierwszy, za ostatnim) dodanych wierszy.
+        """
+        values = np.asarray(values, dtype=float).reshape(len(types), self._values.shape[1])
+        start = len(self.types)
+        self._reserve(start + len(types))
+        self._values[start:start + len(types)] = values
+        self.types.extend(str(t) for t in types)
+        return start, len(self.types)
+
+    def append(self, peak_type: str, x_peak=np.nan, y_peak=np.nan, baseline=np.nan, h_or_d=np.nan) -> int:
+        """Dodaje jeden wiersz i zwraca jego indeks."""
+        start, _ = self.extend([peak_type], [[x_peak, y_peak, baseline, h_or_d]])
+        return start
+
+    def set_row(self, row: int, values):
+        """Zastępuje wartości liczbowe wiersza (np. po zmianie R_u)."""
+        self._values[row] = np.asarray(values, dtype=float)
+
+    def clear(self):
+        """Usuwa wszystkie wiersze."""
+        self.types = []
+        self._values[:] = np.nan
+
+    def find(self, peak_type: str):
+        """Zwraca indeks pierwszego wiersza danego typu lub None."""
+        try:
+            return self.types.index(peak_type)
+        except ValueError:
+            return None
+
+    def value(self, row: int, column: str) -> float:
+        """Zwraca wartość liczbową wiersza w kolumnie o podanej nazwie."""
+        return float(self._values[row, RESULT_COLUMNS.index(column) - 1])
+
+    def export_rows(self) -> list[list]:
+        """
+        Zwraca wiersze do eksportu: typ oraz liczby (float), a w miejscu
+        brakujących wartości pusty tekst.
+        """
+        rows = []
+        for peak_type, values in zip(self.types, self.values.tolist()):
+            rows.append([peak_type] + ["" if np.isnan(v) else v for v in values])
+        return rows
+
+
+class ResultsTableModel(QtCore.QAbstractTableModel):
+    """
+    Model Qt prezentujący ResultsStore. Widok pobiera tylko widoczne komórki,
+    a wiersze dodawane są paczkami z jednym powiadomieniem widoku.
+    """
+
+    def __init__(self, store: ResultsStore, parent=None):
+        """
+        Parameters:
+            store (ResultsStore): Magazyn wyników.
+        """
+        super().__init__(parent)
+        self.store = store
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.store)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(RESULT_COLUMNS)
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        """Zwraca tekst (3 miejsca po przecinku) lub - dla roli UserRole - surową wartość."""
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            if col == 0:
+                return self.store.types[row]
+            value = self.store.values[row, col - 1]
+            return "" if np.isnan(value) else f"{value:.3f}"
+        if role == QtCore.Qt.ItemDataRole.UserRole:
+            return self.store.types[row] if col == 0 else float(self.store.values[row, col - 1])
+        return None
+
+    def headerData(self, section, orientation, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if role != QtCore.Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Orientation.Horizontal:
+            return RESULT_COLUMNS[section]
+        return str(section + 1)
+
+    def append_rows(self, types: list, values):
+        """
+        Dodaje paczkę wierszy do magazynu, powiadamiając widok jeden raz.
+
+        Parameters:
+            types (list): Typy kolejnych wierszy.
+            values (array-like): Tablica (k, 4) wartości; NaN oznacza brak wartości.
+        """
+        if len(types) == 0:
+            return
+        start = len(self.store)
+        self.beginInsertRows(QtCore.QModelIndex(), start, start + len(types) - 1)
+        self.store.extend(types, values)
+        self.endInsertRows()
+
+    def update_row(self, row: int, values):
+        """Zastępuje wartości wiersza i odświeża tylko ten wiersz widoku."""
+        self.store.set_row(row, values)
+        self.dataChanged.emit(self.index(row, 1), self.index(row, len(RESULT_COLUMNS) - 1))
+
+    def clear(self):
+        """Usuwa wszystkie wiersze."""
+        self.beginResetModel()
+        self.store.clear()
+        self.endResetModel()
@@ -0,0 +1,210 @@
+"""
+Moduł sensitivity_window.py
+---------------------------
+Zawiera okno analizy wrażliwości wyników pików na parametry wygładzania:
+mapy cieplne położenia i wysokości/głębokości pików oraz E1/2 na siatce
+(długość okna, stopień wielomianu) filtru Savitzky'ego-Golaya
+(cvcore.sensitivity.sensitivity_sweep) z zaznaczeniem obszarów stabilnych
+i bieżących ustawień okna głównego. Kliknięcie komórki ustawia jej
+parametry w oknie głównym. Przy R_u > 0 piki wyznaczane są, jak w oknie
+głównym, na osi skorygowanej o spadek omowy.
+"""
+
+import time
+
+import numpy as np
+from PyQt6 import QtWidgets, QtGui, QtCore
+import pyqtgraph as pg
+
+from cvcore.sensitivity import (DEFAULT_HEIGHT_TOLERANCE, DEFAULT_POSITION_TOLERANCE, sensitivity_sweep,
+                                stable_mask)
+
+# Mapy cieplne: klucz SensitivityGrid.quantities(), tytuł, czy tolerancja względna, pozycja na siatce wykresów
+HEATMAPS = (
+    ('Ep_ox', "Ep utleniania [mV]", False, (0, 0)),
+    ('H_ox', "Wysokość piku utleniania [μA]", True, (0, 1)),
+    ('E_half', "E1/2 [mV]", False, (0, 2)),
+    ('Ep_red', "Ep redukcji [mV]", False, (1, 0)),
+    ('D_red', "Głębokość piku redukcji [μA]", True, (1, 1)),
+)
+SENSITIVITY_COLOR_MAP = 'viridis'
+
+
+class SensitivityWindow(QtWidgets.QDialog):
+    """
+    Okno map cieplnych wyników pików w funkcji parametrów filtru Savitzky'ego-Golaya.
+    """
+
+    def __init__(self, main_window):
+        """
+        Parameters:
+            main_window (MainWindow): Okno główne (dane, linie bazowe i ustawienia wygładzania).
+        """
+        super().__init__(main_window)
+        self.setWindowTitle("Wrażliwość wyników na wygładzanie")
+        self.resize(1200, 750)
+        self.main_window = main_window
+        self.grid = None
+        self.elapsed = 0.0
+        self.r_u = 0.0
+        self.heatmaps = {}
+        self.init_ui()
+
+    def init_ui(self):
+        """Tworzy interfejs okna: zakres siatki, tolerancje i mapy cieplne."""
+        layout = QtWidgets.QVBoxLayout(self)
+        controls = QtWidgets.QHBoxLayout()
+        # Zakresy jak w polach okna i stopnia okna głównego (kliknięcie komórki ustawia te pola)
+        window_spin = self.main_window.windowSpinBox
+        poly_spin = self.main_window.polySpinBox
+        self.window_min_spin = self._spin(window_spin.minimum(), window_spin.maximum(), 5)
+        self.window_max_spin = self._spin(window_spin.minimum(), window_spin.maximum(), 51)
+        self.window_step_spin = self._spin(2, 100, 2)
+        self.order_min_spin = self._spin(poly_spin.minimum(), poly_spin.maximum(), poly_spin.minimum())
+        self.order_max_spin = self._spin(poly_spin.minimum(), poly_spin.maximum(), poly_spin.maximum())
+        for label, widget in (("Okno od:", self.window_min_spin), ("do:", self.window_max_spin),
+                              ("krok:", self.window_step_spin), ("Stopień od:", self.order_min_spin),
+                              ("do:", self.order_max_spin)):
+            controls.addWidget(QtWidgets.QLabel(label))
+            controls.addWidget(widget)
+        controls.addWidget(QtWidgets.QLabel("Tolerancja Ep [mV]:"))
+        self.position_tolerance_spin = QtWidgets.QDoubleSpinBox()
+        self.position_tolerance_spin.setRange(0.0, 1000.0)
+        self.position_tolerance_spin.setDecimals(3)
+        self.position_tolerance_spin.setValue(DEFAULT_POSITION_TOLERANCE)
+        self.position_tolerance_spin.valueChanged.connect(self.draw_grid)
+        controls.addWidget(self.position_tolerance_spin)
+        controls.addWidget(QtWidgets.QLabel("wysokości [%]:"))
+        self.height_tolerance_spin = QtWidgets.QDoubleSpinBox()
+        self.height_tolerance_spin.setRange(0.0, 100.0)
+        self.height_tolerance_spin.setValue(DEFAULT_HEIGHT_TOLERANCE)
+        self.height_tolerance_spin.valueChanged.connect(self.draw_grid)
+        controls.addWidget(self.height_tolerance_spin)
+        btn_compute = QtWidgets.QPushButton("Oblicz")
+        btn_compute.clicked.connect(self.compute)
+        controls.addWidget(btn_compute)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        self.plots = pg.GraphicsLayoutWidget()
+        for key, title, _, (row, col) in HEATMAPS:
+            plot = self.plots.addPlot(row=row, col=col, title=title)
+            plot.setLabel('bottom', "Długość okna")
+            plot.setLabel('left', "Stopień wielomianu")
+            image = pg.ImageItem()
+            plot.addItem(image)
+            color_bar = pg.ColorBarItem(colorMap=pg.colormap.get(SENSITIVITY_COLOR_MAP), interactive=False)
+            color_bar.setImageItem(image, insert_in=plot)
+            stable = pg.ScatterPlotItem(symbol='s', size=9, pen=pg.mkPen('w', width=1), brush=None)
+            current = pg.ScatterPlotItem(symbol='x', size=14, pen=pg.mkPen('r', width=2), brush=pg.mkBrush('r'))
+            plot.addItem(stable)
+            plot.addItem(current)
+            self.heatmaps[key] = (plot, image, color_bar, stable, current)
+        self.plots.scene().sigMouseClicked.connect(self.on_mouse_click)
+        layout.addWidget(self.plots)
+        self.summary_label = QtWidgets.QLabel(
+            "Białe kwadraty: obszar stabilny (różnica względem sąsiednich komórek w granicach tolerancji), "
+            "czerwony krzyżyk: ustawienia okna głównego. Kliknięcie komórki ustawia jej parametry.")
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+
+    @staticmethod
+    def _spin(minimum: int, maximum: int, value: int) -> QtWidgets.QSpinBox:
+        """Tworzy pole liczby całkowitej."""
+        spin = QtWidgets.QSpinBox()
+        spin.setRange(minimum, maximum)
+        spin.setValue(value)
+        return spin
+
+    def compute(self):
+        """Oblicza wyniki pików dla całej siatki parametrów i rysuje mapy cieplne."""
+        mw = self.main_window
+        if mw.x is None:
+            QtWidgets.QMessageBox.warning(self, "Brak danych", "Najpierw zaimportuj dane.")
+            return
+        windows = range(self.window_min_spin.value(), self.window_max_spin.value() + 1, self.window_step_spin.value())
+        polyorders = range(self.order_min_spin.value(), self.order_max_spin.value() + 1)
+        source_y1, source_y2 = mw.background_corrected()
+        r_u = mw.ruSpinBox.value()
+        QtWidgets.QApplication.setOverrideCursor(QtGui.QCursor(QtCore.Qt.CursorShape.WaitCursor))
+        start = time.perf_counter()
+        try:
+            grid = sensitivity_sweep(mw.x, source_y1, source_y2, mw.baseline_settings, windows, polyorders, r_u)
+        except ValueError as e:
+            QtWidgets.QMessageBox.warning(self, "Błąd", str(e))
+            return
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+        self.elapsed = time.perf_counter() - start
+        if len(grid.windows) == 0 or len(grid.polyorders) == 0:
+            QtWidgets.QMessageBox.warning(self, "Błąd", "Siatka parametrów jest pusta.")
+            return
+        self.grid = grid
+        self.r_u = r_u
+        self.draw_grid()
+
+    def cell_rect(self) -> QtCore.QRectF:
+        """Prostokąt obrazu w jednostkach osi (środki komórek w wartościach okna i stopnia)."""
+        windows, polyorders = self.grid.windows, self.grid.polyorders
+        step = float(windows[1] - windows[0]) if len(windows) > 1 else 2.0
+        return QtCore.QRectF(windows[0] - step / 2, polyorders[0] - 0.5,
+                             step * len(windows), float(len(polyorders)))
+
+    def draw_grid(self):
+        """Rysuje mapy cieplne, obszary stabilne i bieżące ustawienia okna głównego."""
+        grid = self.grid
+        if grid is None:
+            return
+        quantities = grid.quantities()
+        rect = self.cell_rect()
+        mw = self.main_window
+        current = (mw.windowSpinBox.value(), mw.polySpinBox.value())
+        lines = []
+        for key, title, relative, _ in HEATMAPS:
+            plot, image, color_bar, stable, marker = self.heatmaps[key]
+            values = quantities[key]
+            finite = values[np.isfinite(values)]
+            # Kolumny obrazu (oś x) to okna, wiersze (oś y) to stopnie
+            image.setImage(values.T, autoLevels=False)
+            image.setRect(rect)
+            if finite.size:
+                low, high = float(finite.min()), float(finite.max())
+                color_bar.setLevels((low, high if high > low else low + 1e-12))
+            tolerance = self.height_tolerance_spin.value() if relative else self.position_tolerance_spin.value()
+            mask = stable_mask(values, tolerance, relative)
+            rows, columns = np.nonzero(mask)
+            stable.setData(grid.windows[columns], grid.polyorders[rows])
+            marker.setData([current[0]], [current[1]])
+            if finite.size:
+                stable_values = values[mask]
+                text = f"{title}: {finite.min():.4g} … {finite.max():.4g}"
+                if stable_values.size:
+                    text += f" (obszar stabilny: {stable_values.min():.4g} … {stable_values.max():.4g})"
+                lines.append(text)
+        n_pairs = int(np.sum(grid.polyorders[:, None] < grid.windows[None, :]))
+        lines.append(f"{len(grid.windows)} okien × {len(grid.polyorders)} stopni ({n_pairs} par), "
+                     f"obliczenia: {self.elapsed * 1000:.0f} ms.")
+        if self.r_u:
+            lines.append(f"Piki na osi skorygowanej o spadek omowy (R_u = {self.r_u:g} Ω).")
+        if self.r_u != mw.ruSpinBox.value():
+            lines.append("R_u w oknie głównym zmienił się - przelicz mapy.")
+        self.summary_label.setText("\n".join(lines))
+
+    def on_mouse_click(self, event):
+        """Kliknięcie komórki mapy ustawia jej okno i stopień w oknie głównym."""
+        if self.grid is None or event.button() != QtCore.Qt.MouseButton.LeftButton:
+            return
+        pos = event.scenePos()
+        for plot, *_ in self.heatmaps.values():
+            if plot.vb.sceneBoundingRect().contains(pos):
+                point = plot.vb.mapSceneToView(pos)
+                column = int(np.argmin(np.abs(self.grid.windows - point.x())))
+                row = int(np.argmin(np.abs(self.grid.polyorders - point.y())))
+                window, polyorder = int(self.grid.windows[column]), int(self.grid.polyorders[row])
+                if polyorder >= window:
+                    return
+                mw = self.main_window
+                mw.windowSpinBox.setValue(window)
+                mw.polySpinBox.setValue(polyorder)
+                self.draw_grid()
+                return
@@ -0,0 +1,350 @@
+"""
+Moduł service.py
+----------------
+Lokalny serwis HTTP do analizy woltamogramów bez interfejsu graficznego.
+
+Serwer działa na asyncio (bez zewnętrznych zależności): przyjmuje pliki
+pomiarowe, odkłada je do ograniczonej kolejki, a analizę (cvcore.pipeline -
+ta sama co w oknie głównym) wykonuje pula procesów. Gdy kolejka jest pełna,
+serwer odpowiada 503 zamiast przyjmować kolejne zadania.
+
+Punkty końcowe:
+    POST /analyze  - treść: plik tekstowy (E, I_ox, I_red); opcje w parametrach
+                     zapytania: measurement_type, smoothing (0/1), window_length,
+                     polyorder. Alternatywnie JSON {"data": "...", "measurement_type": 0,
+                     "smoothing": {...}, "baseline_settings": {...}}.
+    GET /metrics   - głębokość kolejki, liczniki zadań i opóźnienia (p50/p95/max).
+    GET /health    - stan serwisu.
+
+Uruchomienie:
+    python service.py --host 127.0.0.1 --port 8765 --workers 4 --queue-size 64
+Przykład:
+    curl --data-binary @pomiar.txt "http://127.0.0.1:8765/analyze?smoothing=1&window_length=15"
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_QUEUE_SIZE = 64
+# Maksymalny rozmiar przesyłanego pliku [B]
+MAX_BODY_BYTES = 256 * 1024 * 1024
+# Liczba ostatnich zadań, z których liczone są percentyle opóźnień
+LATENCY_WINDOW = 1000
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            411: "Length Required", 413: "Payload Too Large", 500: "Internal Server Error",
+            503: "Service Unavailable"}
+
+
+class RequestError(Exception):
+    """Błąd żądania HTTP zwracany klientowi z podanym kodem statusu."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def warm_up_worker():
+    """Importuje moduły analizy przy starcie procesu roboczego (pierwsze zadanie nie czeka na SciPy)."""
+    import scipy.signal  # noqa: F401
+    import cvcore.pipeline  # noqa: F401
+
+
+def analyze_text(text: str, options: dict) -> dict:
+    """
+    Analizuje dane pomiarowe przesłane jako tekst (wywoływane w procesie roboczym).
+
+    Parameters:
+        text (str): Zawartość pliku z trzema kolumnami (E, I_ox, I_red).
+        options (dict): measurement_type, smoothing, baseline_settings.
+
+    Returns:
+        dict: Wyniki analizy w postaci JSON (patrz AnalysisResult.summary).
+    """
+    from cvcore.io import load_cv
+    from cvcore.pipeline import analyze
+    x, y1, y2 = load_cv(io.StringIO(text), options.get('measurement_type', 0))
+    result = analyze(x, y1, y2, options.get('smoothing'), options.get('baseline_settings'))
+    summary = result.summary()
+    summary['rows'] = [[value if isinstance(value, str) or not np.isnan(value) else None for value in row]
+                       for row in result.result_rows()]
+    return summary
+
+
+def parse_options(query: dict, content_type: str, body: bytes) -> tuple[str, dict]:
+    """
+    Odczytuje dane i opcje analizy z parametrów zapytania oraz treści żądania.
+
+    Returns:
+        tuple: (tekst danych, opcje analizy).
+    """
+    try:
+        if content_type.startswith("application/json"):
+            payload = json.loads(body.decode("utf-8"))
+            if not isinstance(payload, dict):
+                raise RequestError(400, "Treść JSON musi być obiektem.")
+            text = payload["data"]
+            if not isinstance(text, str):
+                raise RequestError(400, "Pole data musi być tekstem.")
+            options = {
+                'measurement_type': int(payload.get('measurement_type', 0)),
+                'smoothing': payload.get('smoothing'),
+                'baseline_settings': payload.get('baseline_settings'),
+            }
+            for key in ('smoothing', 'baseline_settings'):
+                if not isinstance(options[key], (dict, type(None))):
+                    raise RequestError(400, f"Pole {key} musi być obiektem lub null.")
+        else:
+            text = body.decode("utf-8")
+            first = {key: values[0] for key, values in query.items()}
+            options = {'measurement_type': int(first.get('measurement_type', 0)), 'smoothing': None}
+            if first.get('smoothing', '0') not in ('0', 'false', ''):
+                options['smoothing'] = {
+                    'enabled': True,
+                    'window_length': int(first.get('window_length', 15)),
+                    'polyorder': int(first.get('polyorder', 3)),
+                }
+    except (KeyError, TypeError, ValueError, UnicodeDecodeError) as e:
+        raise RequestError(400, f"Nieprawidłowe żądanie: {e}") from e
+    if options['measurement_type'] not in (0, 1):
+        raise RequestError(400, "measurement_type musi mieć wartość 0 lub 1.")
+    return text, options
+
+
+class AnalysisService:
+    """
+    Serwer HTTP z ograniczoną kolejką zadań i pulą procesów analizy.
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 workers: int = None, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 max_body: int = MAX_BODY_BYTES):
+        """
+        Parameters:
+            host (str): Adres nasłuchu (domyślnie tylko localhost).
+            port (int): Port (0 - dowolny wolny port).
+            workers (int): Liczba procesów analizy (domyślnie liczba rdzeni).
+            queue_size (int): Maksymalna liczba zadań oczekujących w kolejce.
+            max_body (int): Maksymalny rozmiar treści żądania [B].
+        """
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.max_body = max_body
+        self.queue = None
+        self.executor = None
+        self.server = None
+        self._consumers = []
+        self.started_at = None
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.wait_times = deque(maxlen=LATENCY_WINDOW)
+
+    async def start(self):
+        """Uruchamia pulę procesów, konsumentów kolejki oraz nasłuch HTTP."""
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=warm_up_worker)
+        # Uruchomienie procesów roboczych od razu, a nie przy pierwszym żądaniu
+        await asyncio.get_running_loop().run_in_executor(self.executor, time.monotonic)
+        self._consumers = [asyncio.create_task(self.consume()) for _ in range(self.workers)]
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.started_at = time.monotonic()
+
+    async def close(self):
+        """Zatrzymuje nasłuch, konsumentów kolejki i pulę procesów."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for task in self._consumers:
+            task.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+    async def consume(self):
+        """Pobiera zadania z kolejki i wykonuje je w puli procesów."""
+        loop = asyncio.get_running_loop()
+        while True:
+            text, options, future, enqueued = await self.queue.get()
+            started = time.perf_counter()
+            self.in_flight += 1
+            try:
+                result = await loop.run_in_executor(self.executor, analyze_text, text, options)
+            except Exception as e:
+                self.failed += 1
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                self.completed += 1
+                if not future.done():
+                    future.set_result((result, started - enqueued, time.perf_counter() - started))
+            finally:
+                self.in_flight -= 1
+                self.wait_times.append(started - enqueued)
+                self.latencies.append(time.perf_counter() - enqueued)
+                self.queue.task_done()
+
+    def metrics(self) -> dict:
+        """Zwraca bieżące metryki serwisu."""
+        def percentiles(values):
+            if not values:
+                return {'p50_ms': None, 'p95_ms': None, 'max_ms': None}
+            p50, p95 = np.percentile(np.fromiter(values, dtype=float), [50, 95])
+            return {'p50_ms': 1000 * p50, 'p95_ms': 1000 * p95, 'max_ms': 1000 * max(values)}
+        return {
+            'queue_depth': self.queue.qsize() if self.queue is not None else 0,
+            'queue_size': self.queue_size,
+            'workers': self.workers,
+            'in_flight': self.in_flight,
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'latency': percentiles(self.latencies),
+            'queue_wait': percentiles(self.wait_times),
+            'uptime_s': time.monotonic() - self.started_at if self.started_at else 0.0,
+        }
+
+    async def read_request(self, reader) -> tuple[str, str, dict, dict, bytes]:
+        """
+        Odczytuje żądanie HTTP/1.1.
+
+        Returns:
+            tuple: (metoda, ścieżka, parametry zapytania, nagłówki, treść).
+        """
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.LimitOverrunError as e:
+            raise RequestError(400, "Zbyt długi nagłówek żądania.") from e
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError as e:
+            raise RequestError(400, "Nieprawidłowy wiersz żądania.") from e
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        url = urlsplit(target)
+        body = b""
+        if method == "POST":
+            if 'content-length' not in headers:
+                raise RequestError(411, "Wymagany nagłówek Content-Length.")
+            try:
+                length = int(headers['content-length'])
+            except ValueError as e:
+                raise RequestError(400, "Nieprawidłowy nagłówek Content-Length.") from e
+            if length < 0:
+                raise RequestError(400, "Nieprawidłowy nagłówek Content-Length.")
+            if length > self.max_body:
+                raise RequestError(413, f"Plik przekracza limit {self.max_body} B.")
+            body = await reader.readexactly(length)
+        return method, url.path, parse_qs(url.query), headers, body
+
+    async def handle_connection(self, reader, writer):
+        """Obsługuje jedno połączenie (jedno żądanie, potem zamknięcie)."""
+        extra_headers = {}
+        try:
+            method, path, query, headers, body = await self.read_request(reader)
+            if path == "/health":
+                status, payload = 200, {'status': 'ok'}
+            elif path == "/metrics":
+                status, payload = 200, self.metrics()
+            elif path == "/analyze":
+                if method != "POST":
+                    raise RequestError(405, "Dozwolona metoda: POST.")
+                status, payload = await self.submit(query, headers.get('content-type', ''), body)
+            else:
+                raise RequestError(404, f"Nieznana ścieżka: {path}")
+        except RequestError as e:
+            status, payload = e.status, {'status': 'error', 'error': str(e)}
+            if e.status == 503:
+                extra_headers['Retry-After'] = "1"
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        except Exception as e:
+            status, payload = 500, {'status': 'error', 'error': str(e)}
+        await self.send_json(writer, status, payload, extra_headers)
+
+    async def submit(self, query: dict, content_type: str, body: bytes) -> tuple[int, dict]:
+        """Odkłada zadanie analizy do kolejki i czeka na jego wynik."""
+        text, options = parse_options(query, content_type, body)
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((text, options, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise RequestError(503, "Kolejka zadań jest pełna - spróbuj ponownie później.")
+        try:
+            result, waited, processed = await future
+        except (IndexError, KeyError, TypeError, ValueError) as e:
+            raise RequestError(400, f"Nie udało się przeanalizować danych: {e}") from e
+        return 200, {
+            'status': 'ok',
+            'result': result,
+            'timing': {'queue_ms': 1000 * waited, 'processing_ms': 1000 * processed},
+        }
+
+    async def send_json(self, writer, status: int, payload: dict, extra_headers: dict = None):
+        """Wysyła odpowiedź JSON i zamyka połączenie."""
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+                "Content-Type: application/json; charset=utf-8",
+                f"Content-Length: {len(body)}",
+                "Connection: close"]
+        head += [f"{name}: {value}" for name, value in (extra_headers or {}).items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def run_service(host: str, port: int, workers: int, queue_size: int):
+    """Uruchamia serwis i obsługuje żądania do czasu przerwania."""
+    service = AnalysisService(host, port, workers, queue_size)
+    await service.start()
+    print(f"Serwis CVision nasłuchuje na http://{service.host}:{service.port} "
+          f"(procesy: {service.workers}, kolejka: {service.queue_size})")
+    try:
+        await service.server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main():
+    """Punkt wejścia serwisu uruchamianego z wiersza poleceń."""
+    parser = argparse.ArgumentParser(description="Lokalny serwis HTTP analizy woltamogramów CVision.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="Liczba procesów analizy.")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="Maksymalna liczba zadań oczekujących w kolejce.")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run_service(args.host, args.port, args.workers, args.queue_size))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Moduł session.py
+----------------
+Zawiera zapis i odczyt plików sesji CVision (.cvsession). Plik sesji to
+archiwum zip z małym manifestem JSON (ustawienia, wyniki, miejsca zerowe)
+oraz tablicami NumPy zapisanymi jako osobne bloki .npy.
+
+Bloki zapisywane są domyślnie bez kompresji, dzięki czemu przy odczycie
+mogą zostać zmapowane w pamięć (np.memmap) bezpośrednio z archiwum -
+wczytanie sesji nie wymaga ani parsowania tekstu, ani przeliczeń.
+Opcjonalnie bloki mogą być kompresowane (mniejszy plik, odczyt z dekompresją).
+"""
+
+import json
+import os
+import struct
+import zipfile
+
+import numpy as np
+
+SESSION_VERSION = 1
+SESSION_EXTENSION = ".cvsession"
+MANIFEST_NAME = "manifest.json"
+
+# Rozmiar stałej części nagłówka lokalnego pliku w archiwum zip
+_ZIP_LOCAL_HEADER_SIZE = 30
+
+
+def save_session(filename: str, arrays: dict, manifest: dict, compress: bool = False):
+    """
+    Zapisuje sesję do pliku.
+
+    Parameters:
+        filename (str): Ścieżka pliku sesji.
+        arrays (dict): Słownik nazwa -> tablica (wartości None są pomijane).
+        manifest (dict): Dane sesji możliwe do zapisania jako JSON.
+        compress (bool): Czy kompresować bloki tablic (wyłącza mapowanie w pamięć).
+    """
+    manifest = dict(manifest)
+    manifest['version'] = SESSION_VERSION
+    manifest['arrays'] = {}
+    compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    # Zapis do pliku tymczasowego chroni poprzednią sesję przed uszkodzeniem
+    tmp_name = filename + ".tmp"
+    with zipfile.ZipFile(tmp_name, 'w') as zf:
+        for name, values in arrays.items():
+            if values is None:
+                continue
+            values = np.ascontiguousarray(values)
+            member = f"arrays/{name}.npy"
+            info = zipfile.ZipInfo(member)
+            info.compress_type = compress_type
+            with zf.open(info, 'w', force_zip64=True) as f:
+                np.lib.format.write_array(f, values, allow_pickle=False)
+            manifest['arrays'][name] = {'member': member, 'dtype': values.dtype.str, 'shape': list(values.shape)}
+        zf.writestr(MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=1),
+                    compress_type=zipfile.ZIP_DEFLATED)
+    os.replace(tmp_name, filename)
+
+
+def _member_data_offset(file, info: zipfile.ZipInfo) -> int:
+    """Zwraca położenie danych członu archiwum w pliku (za nagłówkiem lokalnym)."""
+    file.seek(info.header_offset)
+    header = file.read(_ZIP_LOCAL_HEADER_SIZE)
+    name_length, extra_length = struct.unpack('<HH', header[26:30])
+    return info.header_offset + _ZIP_LOCAL_HEADER_SIZE + name_length + extra_length
+
+
+def _memmap_member(filename: str, info: zipfile.ZipInfo) -> np.ndarray:
+    """Mapuje w pamięć nieskompresowany blok .npy z archiwum (tryb kopiowania przy zapisie)."""
+    with open(filename, 'rb') as file:
+        file.seek(_member_data_offset(file, info))
+        version = np.lib.format.read_magic(file)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+        offset = file.tell()
+    if int(np.prod(shape)) == 0:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(filename, dtype=dtype, mode='c', shape=shape, offset=offset,
+                     order='F' if fortran_order else 'C')
+
+
+def load_session(filename: str, mmap: bool = True) -> tuple[dict, dict]:
+    """
+    Wczytuje sesję z pliku.
+
+    Parameters:
+        filename (str): Ścieżka pliku sesji.
+        mmap (bool): Czy mapować nieskompresowane tablice w pamięć.
+
+    Returns:
+        tuple: (manifest, tablice) - manifest sesji oraz słownik nazwa -> tablica.
+    """
+    arrays = {}
+    with zipfile.ZipFile(filename, 'r') as zf:
+        manifest = json.loads(zf.read(MANIFEST_NAME).decode('utf-8'))
+        if manifest.get('version', 0) > SESSION_VERSION:
+            raise ValueError("Plik sesji pochodzi z nowszej wersji programu.")
+        for name, entry in manifest.get('arrays', {}).items():
+            info = zf.getinfo(entry['member'])
+            if mmap and info.compress_type == zipfile.ZIP_STORED:
+                arrays[name] = _memmap_member(filename, info)
+            else:
+                with zf.open(info) as f:
+                    arrays[name] = np.lib.format.read_array(f, allow_pickle=False)
+    return manifest, arrays
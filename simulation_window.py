@@ -0,0 +1,181 @@
+"""
+Moduł simulation_window.py
+--------------------------
+Zawiera okno symulacji teoretycznych woltamogramów (mechanizm nernstowski,
+quasi-odwracalny Butlera-Volmera, EC). Symulowane krzywe nakładane są
+przerywaną linią na wykres okna głównego, a parametry kinetyczne k0 i alfa
+można dopasować do zmierzonych danych (cvcore.simulation.fit_kinetics).
+"""
+
+import time
+
+import numpy as np
+from PyQt6 import QtWidgets, QtGui, QtCore
+import pyqtgraph as pg
+
+from cvcore.simulation import MECHANISMS, SimulationParameters, fit_kinetics, simulate_on
+
+MECHANISM_LABELS = {
+    'nernst': "Nernstowski (odwracalny)",
+    'bv': "Butler-Volmer (quasi-odwracalny)",
+    'ec': "EC (reakcja następcza)",
+}
+# Zakres potencjału symulacji bez wczytanych danych: E0 ± SIM_HALF_RANGE [mV]
+SIM_HALF_RANGE = 400.0
+SIM_DEFAULT_POINTS = 1000
+
+
+class SimulationWindow(QtWidgets.QDialog):
+    """
+    Okno parametrów symulacji woltamogramu i dopasowania kinetyki.
+    """
+
+    def __init__(self, main_window):
+        """
+        Parameters:
+            main_window (MainWindow): Okno główne (dane pomiarowe i wykres).
+        """
+        super().__init__(main_window)
+        self.setWindowTitle("Symulacja CV")
+        self.main_window = main_window
+        self.curves = []
+        self.init_ui()
+
+    @staticmethod
+    def number_edit(value: float) -> QtWidgets.QLineEdit:
+        """Pole liczbowe przyjmujące również zapis wykładniczy (np. 1e-5)."""
+        edit = QtWidgets.QLineEdit(f"{value:g}")
+        validator = QtGui.QDoubleValidator()
+        validator.setNotation(QtGui.QDoubleValidator.Notation.ScientificNotation)
+        edit.setValidator(validator)
+        return edit
+
+    def init_ui(self):
+        """Tworzy interfejs okna z polami parametrów symulacji."""
+        defaults = SimulationParameters()
+        layout = QtWidgets.QFormLayout(self)
+        self.mechanism_combo = QtWidgets.QComboBox()
+        for mechanism in MECHANISMS:
+            self.mechanism_combo.addItem(MECHANISM_LABELS[mechanism], mechanism)
+        self.mechanism_combo.setCurrentIndex(MECHANISMS.index(defaults.mechanism))
+        layout.addRow("Mechanizm:", self.mechanism_combo)
+        self.edits = {}
+        for name, label in (('E0', "E0 [mV]:"), ('k0', "k0 [cm/s]:"), ('alpha', "Alfa:"),
+                            ('D', "D [cm²/s]:"), ('scan_rate', "Szybkość skanu [mV/s]:"),
+                            ('n', "Liczba elektronów n:"), ('concentration', "Stężenie [mM]:"),
+                            ('area', "Powierzchnia elektrody [cm²]:"), ('kc', "kc (EC) [1/s]:"),
+                            ('temperature', "Temperatura [K]:")):
+            self.edits[name] = self.number_edit(getattr(defaults, name))
+            layout.addRow(label, self.edits[name])
+        self.oxidation_first_check = QtWidgets.QCheckBox("Skan zaczyna się od utleniania (forma zredukowana w roztworze)")
+        self.oxidation_first_check.setChecked(defaults.oxidation_first)
+        layout.addRow(self.oxidation_first_check)
+        self.fit_e0_check = QtWidgets.QCheckBox("Dopasuj również E0")
+        layout.addRow(self.fit_e0_check)
+
+        buttons = QtWidgets.QHBoxLayout()
+        btn_simulate = QtWidgets.QPushButton("Symuluj")
+        btn_simulate.clicked.connect(self.simulate)
+        buttons.addWidget(btn_simulate)
+        btn_fit = QtWidgets.QPushButton("Dopasuj k0/α")
+        btn_fit.clicked.connect(self.fit)
+        buttons.addWidget(btn_fit)
+        btn_remove = QtWidgets.QPushButton("Usuń symulację z wykresu")
+        btn_remove.clicked.connect(self.remove_curves)
+        buttons.addWidget(btn_remove)
+        layout.addRow(buttons)
+        self.result_label = QtWidgets.QLabel("")
+        self.result_label.setWordWrap(True)
+        layout.addRow(self.result_label)
+
+    def parameters(self) -> SimulationParameters:
+        """Zwraca parametry symulacji z pól okna."""
+        values = {}
+        for name, edit in self.edits.items():
+            text = edit.text().replace(',', '.')
+            try:
+                values[name] = float(text)
+            except ValueError:
+                raise ValueError(f"Niepoprawna wartość parametru {name}: '{edit.text()}'")
+        values['n'] = int(round(values['n']))
+        return SimulationParameters(mechanism=self.mechanism_combo.currentData(),
+                                    oxidation_first=self.oxidation_first_check.isChecked(), **values)
+
+    def set_parameters(self, params: SimulationParameters):
+        """Wpisuje parametry do pól okna."""
+        for name, edit in self.edits.items():
+            edit.setText(f"{getattr(params, name):.6g}")
+
+    def potential_grid(self, params: SimulationParameters) -> np.ndarray:
+        """Zwraca siatkę potencjału: dane okna głównego lub zakres wokół E0."""
+        if self.main_window.x is not None and len(self.main_window.x) > 1:
+            return self.main_window.x
+        return np.linspace(params.E0 - SIM_HALF_RANGE, params.E0 + SIM_HALF_RANGE, SIM_DEFAULT_POINTS)
+
+    def remove_curves(self):
+        """Usuwa symulowane krzywe z wykresu okna głównego."""
+        for item in self.curves:
+            self.main_window.plot_widget.removeItem(item)
+        self.curves = []
+
+    def draw(self, x: np.ndarray, i_ox: np.ndarray, i_red: np.ndarray):
+        """Nakłada symulowane gałęzie (linią przerywaną) na wykres okna głównego."""
+        self.remove_curves()
+        style = QtCore.Qt.PenStyle.DashLine
+        self.curves = [
+            self.main_window.plot_widget.plot(x, i_ox, pen=pg.mkPen(color=(0, 170, 255), width=2, style=style),
+                                              name='Symulacja (utlenianie)'),
+            self.main_window.plot_widget.plot(x, i_red, pen=pg.mkPen(color=(255, 140, 0), width=2, style=style),
+                                              name='Symulacja (redukcja)'),
+        ]
+
+    def simulate(self):
+        """Symuluje woltamogram z bieżącymi parametrami i nakłada go na wykres."""
+        try:
+            params = self.parameters()
+            x = self.potential_grid(params)
+            start = time.perf_counter()
+            i_ox, i_red = simulate_on(x, params)
+            elapsed = time.perf_counter() - start
+        except ValueError as e:
+            QtWidgets.QMessageBox.warning(self, "Błąd", str(e))
+            return
+        self.draw(x, i_ox[:, 0], i_red[:, 0])
+        self.result_label.setText(f"Symulacja: {elapsed * 1000:.1f} ms "
+                                  f"(Ipa = {i_ox.max():.4g} μA, Ipc = {i_red.min():.4g} μA)")
+
+    def fit(self):
+        """Dopasowuje k0 i alfa (opcjonalnie E0) do danych okna głównego."""
+        mw = self.main_window
+        if mw.x is None or mw.y1 is None or mw.y2 is None:
+            QtWidgets.QMessageBox.warning(self, "Brak danych", "Najpierw zaimportuj dane.")
+            return
+        try:
+            params = self.parameters()
+        except ValueError as e:
+            QtWidgets.QMessageBox.warning(self, "Błąd", str(e))
+            return
+        if params.mechanism == 'nernst':
+            QtWidgets.QMessageBox.warning(self, "Dopasowanie",
+                                          "Mechanizm nernstowski nie zależy od k0 i alfa - wybierz Butler-Volmer lub EC.")
+            return
+        fit = ('k0', 'alpha', 'E0') if self.fit_e0_check.isChecked() else ('k0', 'alpha')
+        QtWidgets.QApplication.setOverrideCursor(QtGui.QCursor(QtCore.Qt.CursorShape.WaitCursor))
+        try:
+            start = time.perf_counter()
+            fitted, result = fit_kinetics(mw.x, mw.y1, mw.y2, params, fit=fit)
+            elapsed = time.perf_counter() - start
+            i_ox, i_red = simulate_on(mw.x, fitted)
+        except ValueError as e:
+            QtWidgets.QMessageBox.warning(self, "Błąd", str(e))
+            return
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+        self.set_parameters(fitted)
+        self.draw(mw.x, i_ox[:, 0], i_red[:, 0])
+        rms = float(np.sqrt(np.mean(result.fun ** 2)))
+        text = (f"k0 = {fitted.k0:.4g} cm/s, α = {fitted.alpha:.3f}"
+                + (f", E0 = {fitted.E0:.2f} mV" if 'E0' in fit else "")
+                + f"\nRMS reszt: {rms:.4g} μA, iteracji: {result.nfev}, czas: {elapsed:.2f} s")
+        self.result_label.setText(text)
+        mw.statusBar().showMessage(text.replace("\n", "; "))
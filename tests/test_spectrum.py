@@ -0,0 +1,28 @@
+"""
+Testy filtrowania w dziedzinie częstotliwości (cvcore/spectrum.py).
+"""
+
+import numpy as np
+
+from cvcore.spectrum import fourier_filter
+
+
+def test_fourier_filter_smooths_noisy_edges():
+    rng = np.random.default_rng(0)
+    x = np.arange(2000.0)
+    truth = np.sin(2 * np.pi * x / 400 + 0.7) + 0.3 * x / 2000
+    errors = np.array([fourier_filter(x, truth + 0.1 * rng.standard_normal(len(x)), lowpass=0.05) - truth
+                       for _ in range(100)])
+    rms = np.sqrt(np.mean(errors ** 2, axis=0))
+    interior = rms[500:1500].mean()
+    # Końce nie są przypięte do zaszumionych próbek (σ = 0.1): błąd rzędu błędu wewnątrz krzywej
+    assert max(rms[0], rms[-1]) < 2.0 * interior
+    assert max(rms[50], rms[-51]) < 1.2 * interior
+
+
+def test_fourier_filter_keeps_noiseless_edges():
+    x = np.arange(2000.0)
+    y = np.sin(2 * np.pi * x / 400 + 0.7) + 0.3 * x / 2000
+    filtered = fourier_filter(x, y, lowpass=0.05)
+    assert np.max(np.abs(filtered - y)) < 1e-2
+    assert np.max(np.abs(filtered - y)[50:-50]) < 1e-3
@@ -0,0 +1,40 @@
+"""
+Testy obszaru roboczego (workspace.py): usuwanie tablic pochodnych przez
+budżet pamięci i ich przeliczanie przy powrocie na kartę.
+"""
+
+import numpy as np
+
+from cvcore import first_derivative, second_derivative
+from workspace import Document, Workspace
+
+
+def unsmoothed_document(n: int = 2000) -> Document:
+    """Dokument bez wygładzania w postaci z MainWindow.session_state (bez y1/y2)."""
+    x = np.linspace(-0.5, 0.5, n)
+    raw_y1 = np.exp(-((x - 0.1) / 0.05) ** 2)
+    raw_y2 = -np.exp(-((x + 0.1) / 0.05) ** 2)
+    arrays = {'x': x, 'raw_y1': raw_y1, 'raw_y2': raw_y2,
+              'deriv_y1': first_derivative(x, raw_y1), 'deriv_y2': first_derivative(x, raw_y2),
+              'second_deriv_y1': second_derivative(x, raw_y1),
+              'second_deriv_y2': second_derivative(x, raw_y2)}
+    manifest = {'settings': {'smoothing': {'enabled': False}, 'blank': None}}
+    return Document(manifest, arrays, title="data.txt")
+
+
+def test_ensure_derived_after_eviction_of_unsmoothed_document():
+    workspace = Workspace(executor=None, memory_budget=0)
+    document = unsmoothed_document()
+    expected = {name: document.arrays[name].copy() for name in
+                ('deriv_y1', 'deriv_y2', 'second_deriv_y1', 'second_deriv_y2')}
+    workspace.documents = [document, Document()]
+    workspace.active = 1
+
+    assert workspace.enforce_budget() == [document]
+    assert 'y1' not in document.evicted and 'deriv_y1' in document.evicted
+
+    workspace.ensure_derived(document)
+
+    assert not document.evicted
+    for name, values in expected.items():
+        np.testing.assert_allclose(document.arrays[name], values)
@@ -0,0 +1,299 @@
+"""
+Moduł watch_folder.py
+---------------------
+Tryb obserwacji folderu: nowe pliki pomiarowe zapisywane przez potencjostat
+są wykrywane, analizowane w puli procesów według zapisanej receptury
+(wygładzanie, linie bazowe) i dopisywane do zbiorczego pliku CSV.
+
+- Plik trafia do analizy dopiero, gdy jego rozmiar i czas modyfikacji nie
+  zmieniają się przez `settle` sekund (plik nie jest już zapisywany).
+- Przetworzone pliki rozpoznawane są po skrócie SHA-256 zawartości,
+  zapisywanym w pliku stanu - po ponownym uruchomieniu nic nie jest
+  analizowane drugi raz (również po zmianie nazwy pliku).
+
+Uruchomienie:
+    python watch_folder.py FOLDER --recipe receptura.json --summary wyniki.csv
+Recepturę można zapisać w oknie głównym przyciskiem "Zapisz recepturę".
+"""
+
+import argparse
+import csv
+import fnmatch
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+RECIPE_EXTENSION = ".cvrecipe.json"
+STATE_NAME = ".cvision_watch_state.json"
+SUMMARY_NAME = "cvision_summary.csv"
+SUMMARY_COLUMNS = [
+    "processed_at", "file", "sha256", "status", "n_points",
+    "ox_x_peak", "ox_y_peak", "ox_baseline", "ox_height",
+    "red_x_peak", "red_y_peak", "red_baseline", "red_depth",
+    "e_half", "error",
+]
+# Rozmiar bloku odczytu przy liczeniu skrótu pliku [B]
+HASH_BLOCK_BYTES = 1 << 20
+
+
+def save_recipe(filename: str, settings: dict):
+    """
+    Zapisuje recepturę analizy (typ pomiaru, wygładzanie, linie bazowe, R_u) do pliku JSON.
+
+    Parameters:
+        filename (str): Ścieżka pliku receptury.
+        settings (dict): Ustawienia analizy (np. MainWindow.analysis_settings()).
+    """
+    recipe = {
+        'measurement_type': int(settings.get('measurement_type', 0)),
+        'smoothing': settings.get('smoothing'),
+        'baseline_settings': settings.get('baseline_settings'),
+        'r_u': float(settings.get('r_u') or 0.0),
+    }
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(recipe, f, ensure_ascii=False, indent=2)
+
+
+def load_recipe(filename: str) -> dict:
+    """
+    Wczytuje recepturę analizy. Brak pliku (None) oznacza ustawienia domyślne:
+    bez wygładzania i z domyślnymi liniami bazowymi.
+    """
+    if filename is None:
+        return {'measurement_type': 0, 'smoothing': None, 'baseline_settings': None, 'r_u': 0.0}
+    with open(filename, 'r', encoding='utf-8') as f:
+        recipe = json.load(f)
+    return {
+        'measurement_type': int(recipe.get('measurement_type', 0)),
+        'smoothing': recipe.get('smoothing'),
+        'baseline_settings': recipe.get('baseline_settings'),
+        'r_u': float(recipe.get('r_u') or 0.0),
+    }
+
+
+def file_sha256(path: str) -> str:
+    """Zwraca skrót SHA-256 zawartości pliku (odczyt blokami)."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def analyze_path(path: str, recipe: dict) -> dict:
+    """
+    Analizuje jeden plik według receptury (wywoływane w procesie roboczym).
+
+    Returns:
+        dict: Wyniki analizy (patrz AnalysisResult.summary).
+    """
+    from cvcore.pipeline import analyze_file
+    return analyze_file(path, recipe['measurement_type'], recipe['smoothing'],
+                        recipe['baseline_settings'], r_u=recipe.get('r_u', 0.0)).summary()
+
+
+def summary_row(path: str, sha256: str, summary: dict = None, error: str = "") -> dict:
+    """Buduje wiersz zbiorczego pliku CSV z wyników analizy jednego pliku."""
+    row = dict.fromkeys(SUMMARY_COLUMNS, "")
+    row.update(processed_at=datetime.now().isoformat(timespec='seconds'), file=path, sha256=sha256,
+               status="ok" if error == "" else "error", error=error)
+    if summary is not None:
+        row['n_points'] = summary['n_points']
+        for prefix, key, height_name in (("ox", "oxidation", "ox_height"), ("red", "reduction", "red_depth")):
+            peak = summary.get(key)
+            if peak is not None:
+                row[f"{prefix}_x_peak"] = peak['x_peak']
+                row[f"{prefix}_y_peak"] = peak['y_peak']
+                row[f"{prefix}_baseline"] = peak['baseline']
+                row[height_name] = peak['height']
+        if summary.get('e_half') is not None:
+            row['e_half'] = summary['e_half']
+    return row
+
+
+class FolderWatcher:
+    """
+    Obserwator folderu: wykrywa ustabilizowane nowe pliki, analizuje je w puli
+    procesów i dopisuje wyniki do pliku zbiorczego.
+    """
+
+    def __init__(self, folder: str, recipe: dict, summary_path: str = None, state_path: str = None,
+                 pattern: str = "*.txt", interval: float = 2.0, settle: float = 5.0, workers: int = None):
+        """
+        Parameters:
+            folder (str): Obserwowany folder.
+            recipe (dict): Receptura analizy (patrz load_recipe).
+            summary_path (str): Zbiorczy plik CSV (domyślnie w obserwowanym folderze).
+            state_path (str): Plik stanu ze skrótami przetworzonych plików.
+            pattern (str): Wzorzec nazw plików pomiarowych.
+            interval (float): Odstęp między przeglądami folderu [s].
+            settle (float): Czas bez zmian rozmiaru i daty modyfikacji, po którym plik uznaje się za kompletny [s].
+            workers (int): Liczba procesów analizy (domyślnie liczba rdzeni).
+        """
+        self.folder = folder
+        self.recipe = recipe
+        self.summary_path = summary_path or os.path.join(folder, SUMMARY_NAME)
+        self.state_path = state_path or os.path.join(folder, STATE_NAME)
+        self.pattern = pattern
+        self.interval = interval
+        self.settle = settle
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = None
+        # Skrót -> opis przetworzonego pliku (trwały stan)
+        self.processed = self.load_state()
+        # Ścieżka -> (rozmiar, mtime, czas od którego plik się nie zmienia)
+        self._candidates = {}
+        # Ścieżka -> (rozmiar, mtime) plików już obsłużonych w tej sesji
+        self._seen = {}
+        # Zadanie -> (ścieżka, skrót, (rozmiar, mtime))
+        self._running = {}
+
+    def load_state(self) -> dict:
+        """Wczytuje skróty przetworzonych plików z pliku stanu."""
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('processed', {})
+
+    def save_state(self):
+        """Zapisuje stan atomowo (plik tymczasowy + zamiana)."""
+        tmp_name = self.state_path + ".tmp"
+        with open(tmp_name, 'w', encoding='utf-8') as f:
+            json.dump({'processed': self.processed}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_name, self.state_path)
+
+    def append_summary(self, row: dict):
+        """Dopisuje wiersz do zbiorczego pliku CSV (nagłówek przy tworzeniu pliku)."""
+        new_file = not os.path.exists(self.summary_path)
+        with open(self.summary_path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+            if new_file:
+                writer.writeheader()
+            writer.writerow(row)
+
+    def scan(self, now: float) -> list[tuple[str, tuple]]:
+        """
+        Przegląda folder i zwraca pliki, które przestały się zmieniać.
+
+        Returns:
+            list: Lista krotek (ścieżka, (rozmiar, mtime)).
+        """
+        ready = []
+        present = set()
+        own_files = {os.path.abspath(self.summary_path), os.path.abspath(self.state_path)}
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                if not entry.is_file() or not fnmatch.fnmatch(entry.name, self.pattern):
+                    continue
+                path = entry.path
+                if os.path.abspath(path) in own_files:
+                    continue
+                present.add(path)
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                key = (stat.st_size, stat.st_mtime_ns)
+                if self._seen.get(path) == key:
+                    continue
+                candidate = self._candidates.get(path)
+                if candidate is None or candidate[:2] != key:
+                    # Nowy plik lub plik wciąż zapisywany - odliczanie od nowa
+                    self._candidates[path] = (*key, now)
+                elif now - candidate[2] >= self.settle:
+                    if stat.st_size > 0:
+                        ready.append((path, key))
+                    else:
+                        # Pusty plik po czasie stabilizacji jest pomijany (wróci, gdy zostanie zapisany)
+                        del self._candidates[path]
+                        self._seen[path] = key
+        for path in list(self._candidates):
+            if path not in present:
+                del self._candidates[path]
+        return ready
+
+    def submit(self, path: str, key: tuple):
+        """Liczy skrót pliku i - jeśli nie był przetworzony - zleca analizę."""
+        del self._candidates[path]
+        try:
+            sha256 = file_sha256(path)
+        except OSError:
+            return
+        if sha256 in self.processed or any(job[1] == sha256 for job in self._running.values()):
+            self._seen[path] = key
+            return
+        future = self.executor.submit(analyze_path, path, self.recipe)
+        self._running[future] = (path, sha256, key)
+
+    def collect(self, timeout: float = 0):
+        """Odbiera zakończone analizy, zapisuje wyniki i stan."""
+        if not self._running:
+            return
+        done, _ = wait(list(self._running), timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            path, sha256, key = self._running.pop(future)
+            if future.cancelled():
+                # Przerwane przy zamykaniu - plik zostanie przetworzony po ponownym uruchomieniu
+                continue
+            try:
+                row = summary_row(path, sha256, future.result())
+            except Exception as e:
+                row = summary_row(path, sha256, error=str(e))
+            self.append_summary(row)
+            self.processed[sha256] = {'file': path, 'processed_at': row['processed_at'], 'status': row['status']}
+            self._seen[path] = key
+            print(f"[{row['processed_at']}] {row['status']}: {path}")
+        if done:
+            self.save_state()
+
+    def run(self, once: bool = False):
+        """
+        Obserwuje folder do przerwania (Ctrl+C).
+
+        Parameters:
+            once (bool): Przetwarza bieżącą zawartość folderu (z uwzględnieniem czasu
+                stabilizacji) i kończy działanie.
+        """
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            while True:
+                for path, key in self.scan(time.monotonic()):
+                    self.submit(path, key)
+                if once and not self._candidates and not self._running:
+                    break
+                self.collect(timeout=self.interval)
+                if not self._running:
+                    time.sleep(self.interval)
+        finally:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.collect(timeout=0)
+
+
+def main():
+    """Punkt wejścia trybu obserwacji folderu uruchamianego z wiersza poleceń."""
+    parser = argparse.ArgumentParser(description="Automatyczna analiza nowych plików pomiarowych w folderze.")
+    parser.add_argument("folder", help="Obserwowany folder.")
+    parser.add_argument("--recipe", default=None, help="Plik receptury (JSON) zapisany w oknie głównym.")
+    parser.add_argument("--summary", default=None, help="Zbiorczy plik CSV z wynikami.")
+    parser.add_argument("--state", default=None, help="Plik stanu ze skrótami przetworzonych plików.")
+    parser.add_argument("--pattern", default="*.txt", help="Wzorzec nazw plików pomiarowych.")
+    parser.add_argument("--interval", type=float, default=2.0, help="Odstęp między przeglądami folderu [s].")
+    parser.add_argument("--settle", type=float, default=5.0,
+                        help="Czas bez zmian pliku, po którym uznaje się go za kompletny [s].")
+    parser.add_argument("--workers", type=int, default=None, help="Liczba procesów analizy.")
+    parser.add_argument("--once", action="store_true", help="Przetwórz bieżącą zawartość folderu i zakończ.")
+    args = parser.parse_args()
+    watcher = FolderWatcher(args.folder, load_recipe(args.recipe), args.summary, args.state,
+                            args.pattern, args.interval, args.settle, args.workers)
+    print(f"Obserwacja folderu {args.folder} (wzorzec {args.pattern}, procesy: {watcher.workers})")
+    try:
+        watcher.run(once=args.once)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
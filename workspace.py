@@ -0,0 +1,200 @@
+"""
+Moduł workspace.py
+------------------
+Zawiera obszar roboczy z wieloma dokumentami (woltamogramami otwartymi na
+osobnych kartach). Każdy dokument przechowuje własne tablice, ustawienia
+i wyniki w tej samej postaci co plik sesji (manifest + tablice), więc
+przełączanie kart korzysta z MainWindow.session_state / restore_session.
+
+Wszystkie dokumenty dzielą jedną pulę wątków (tę samą co eksport) i jeden
+budżet pamięci. Po przekroczeniu budżetu tablice pochodne nieaktywnych
+dokumentów (krzywe wygładzone, pochodne) są usuwane od najdawniej używanego
+dokumentu i przeliczane przy ponownym otwarciu karty. Dane surowe nie są
+usuwane - są źródłem, z którego odtwarza się resztę.
+"""
+
+import itertools
+import os
+
+from cvcore import apply_smoothing_pair, first_derivative, second_derivative
+from cvcore.memory import dataset_report, readonly
+from cvcore.profiling import profiler
+
+MEMORY_BUDGET_ENV = "CVISION_MEMORY_BUDGET_MB"
+DEFAULT_MEMORY_BUDGET_MB = 2048
+# Tablice pochodne, które można usunąć i przeliczyć z danych surowych
+DERIVED_ARRAYS = ('y1', 'y2', 'deriv_y1', 'deriv_y2', 'second_deriv_y1', 'second_deriv_y2')
+MB = 2 ** 20
+
+
+def default_memory_budget() -> int:
+    """Zwraca budżet pamięci w bajtach (zmienna CVISION_MEMORY_BUDGET_MB lub wartość domyślna)."""
+    try:
+        budget_mb = float(os.environ.get(MEMORY_BUDGET_ENV, DEFAULT_MEMORY_BUDGET_MB))
+    except ValueError:
+        budget_mb = DEFAULT_MEMORY_BUDGET_MB
+    return int(budget_mb * MB)
+
+
+class Document:
+    """
+    Stan jednego woltamogramu: manifest sesji (ustawienia, wyniki, osie)
+    oraz tablice danych. Dokument bez danych (nowa karta) ma manifest None.
+    """
+    _ids = itertools.count(1)
+
+    def __init__(self, manifest: dict = None, arrays: dict = None, title: str = "Nowy"):
+        self.id = next(self._ids)
+        self.manifest = manifest
+        self.arrays = dict(arrays or {})
+        self.title = title
+        # Nazwy tablic usuniętych przez budżet pamięci (do przeliczenia)
+        self.evicted = set()
+        self.last_used = 0
+
+    @property
+    def empty(self) -> bool:
+        """Czy dokument nie zawiera danych."""
+        return self.manifest is None or self.arrays.get('x') is None
+
+    def nbytes(self) -> int:
+        """Pamięć zajmowana przez tablice dokumentu (bufory wspólne liczone raz, bez danych z mmap)."""
+        return sum(row['owned_bytes'] for row in dataset_report(self.arrays) if not row['mapped'])
+
+    def evictable_bytes(self) -> int:
+        """Pamięć, którą zwolni usunięcie tablic pochodnych (tylko bufory niewspółdzielone z danymi surowymi)."""
+        report = dataset_report(self.arrays)
+        return sum(row['owned_bytes'] for row in report
+                   if row['name'] in DERIVED_ARRAYS and not row['mapped'])
+
+    def evict(self) -> int:
+        """
+        Usuwa tablice pochodne dokumentu.
+
+        Returns:
+            int: Liczba zwolnionych bajtów.
+        """
+        freed = self.evictable_bytes()
+        for name in DERIVED_ARRAYS:
+            if self.arrays.get(name) is not None:
+                self.arrays[name] = None
+                self.evicted.add(name)
+        return freed
+
+
+class Workspace:
+    """
+    Lista dokumentów z aktywnym dokumentem, wspólną pulą wątków
+    i globalnym budżetem pamięci (usuwanie LRU).
+    """
+
+    def __init__(self, executor, memory_budget: int = None, blank_library=None):
+        """
+        Parameters:
+            executor (Executor): Wspólna pula wątków okna (eksport); wygładzanie korzysta z puli cvcore.smoothing.
+            memory_budget (int): Budżet pamięci danych wszystkich dokumentów [B].
+            blank_library (BlankLibrary): Biblioteka ślepych prób odejmowanych przed wygładzaniem.
+        """
+        self.executor = executor
+        self.blank_library = blank_library
+        self.memory_budget = memory_budget if memory_budget is not None else default_memory_budget()
+        self.documents = [Document()]
+        self.active = 0
+        self.evictions = 0
+        self._clock = itertools.count(1)
+
+    @property
+    def current(self) -> Document:
+        """Aktywny dokument."""
+        return self.documents[self.active]
+
+    def touch(self, document: Document):
+        """Oznacza dokument jako właśnie używany (kolejność LRU)."""
+        document.last_used = next(self._clock)
+
+    def add(self, document: Document = None) -> int:
+        """Dodaje dokument i zwraca jego indeks."""
+        document = document or Document()
+        self.documents.append(document)
+        return len(self.documents) - 1
+
+    def remove(self, index: int):
+        """Usuwa dokument; zawsze pozostaje co najmniej jeden (pusty) dokument."""
+        del self.documents[index]
+        if not self.documents:
+            self.documents.append(Document())
+        if self.active >= len(self.documents) or self.active > index:
+            self.active = max(self.active - 1, 0)
+
+    def total_bytes(self) -> int:
+        """Łączna pamięć danych wszystkich dokumentów."""
+        return sum(document.nbytes() for document in self.documents)
+
+    def enforce_budget(self, active_bytes: int = 0) -> list[Document]:
+        """
+        Usuwa tablice pochodne nieaktywnych dokumentów, od najdawniej
+        używanego, aż łączna pamięć zmieści się w budżecie.
+
+        Parameters:
+            active_bytes (int): Pamięć danych aktywnego dokumentu, jeśli jego tablice
+                są trzymane poza obszarem roboczym (w oknie głównym).
+
+        Returns:
+            list: Dokumenty, których tablice zostały usunięte.
+        """
+        total = self.total_bytes() + active_bytes
+        evicted = []
+        candidates = sorted((d for i, d in enumerate(self.documents) if i != self.active),
+                            key=lambda d: d.last_used)
+        for document in candidates:
+            if total <= self.memory_budget:
+                break
+            freed = document.evict()
+            if freed:
+                total -= freed
+                evicted.append(document)
+                self.evictions += 1
+                profiler.count("workspace_eviction")
+        return evicted
+
+    def ensure_derived(self, document: Document):
+        """
+        Przelicza usunięte tablice pochodne dokumentu (wygładzanie obu gałęzi
+        równolegle we wspólnej puli, następnie pochodne).
+        """
+        if not document.evicted:
+            profiler.count("workspace_cache_hit")
+            return
+        profiler.count("workspace_cache_miss")
+        arrays = document.arrays
+        x, raw_y1, raw_y2 = arrays['x'], arrays['raw_y1'], arrays['raw_y2']
+        with profiler.stage("workspace_recompute", n_points=len(x)):
+            if 'y1' in document.evicted or 'y2' in document.evicted:
+                settings = document.manifest.get('settings') or {}
+                smoothing = settings.get('smoothing') or {}
+                try:
+                    source_y1, source_y2 = self.background_corrected(settings.get('blank'), x, raw_y1, raw_y2)
+                except (OSError, KeyError, ValueError):
+                    # Ślepa próba usunięta z biblioteki - dokument wraca do danych bez odejmowania
+                    settings['blank'] = None
+                    source_y1, source_y2 = raw_y1, raw_y2
+                if smoothing.get('enabled'):
+                    arrays['y1'], arrays['y2'] = readonly(*apply_smoothing_pair(x, source_y1, source_y2, smoothing))
+                else:
+                    arrays['y1'], arrays['y2'] = source_y1, source_y2
+            # Pochodne liczone są z bieżących krzywych, tak jak w oknie głównym
+            # (bez wygładzania sesja nie zawiera y1/y2 - krzywymi są dane surowe)
+            for suffix, y in (('y1', arrays.get('y1', raw_y1)), ('y2', arrays.get('y2', raw_y2))):
+                first = None
+                if f'deriv_{suffix}' in document.evicted:
+                    first = first_derivative(x, y)
+                    arrays[f'deriv_{suffix}'] = first
+                if f'second_deriv_{suffix}' in document.evicted:
+                    arrays[f'second_deriv_{suffix}'] = second_derivative(x, y, first)
+        document.evicted.clear()
+
+    def background_corrected(self, blank: dict, x, raw_y1, raw_y2) -> tuple:
+        """Zwraca dane surowe po odjęciu ślepej próby ({'name', 'scale'}) lub dane surowe bez niej."""
+        if not blank or self.blank_library is None:
+            return raw_y1, raw_y2
+        return self.blank_library.subtract(blank['name'], x, raw_y1, raw_y2, blank.get('scale', 1.0))